@@ -0,0 +1,119 @@
+"""Backtesting engines and tools for evaluating trading strategies.
+
+Like ``trading_strategy_development.data``, the names below are imported from
+their submodules on first access, so importing the package does not load NumPy
+or pandas.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    from trading_strategy_development.backtest.analyzers import PerformanceAnalyzer
+    from trading_strategy_development.backtest.bootstrap import BootstrapResult, bootstrap_metrics
+    from trading_strategy_development.backtest.events import (
+        EventBacktestEngine,
+        EventBacktestResult,
+        EventStrategy,
+        Fill,
+        Order,
+        OrderType,
+        Position,
+        bars_from_panel,
+    )
+    from trading_strategy_development.backtest.results import ResultsStore
+    from trading_strategy_development.backtest.sweep import (
+        SharedPanel,
+        SweepCheckpoint,
+        SweepResult,
+        param_grid,
+        run_sweep,
+    )
+    from trading_strategy_development.backtest.vectorized import (
+        BacktestResult,
+        VectorBacktestEngine,
+        weights_from_signals,
+    )
+    from trading_strategy_development.backtest.walk_forward import (
+        WalkForwardResult,
+        WalkForwardWindow,
+        feature_panel,
+        run_walk_forward,
+        walk_forward_windows,
+    )
+
+# Public name -> submodule defining it
+_EXPORTS: Final[dict[str, str]] = {
+    "BacktestResult": "vectorized",
+    "BootstrapResult": "bootstrap",
+    "EventBacktestEngine": "events",
+    "EventBacktestResult": "events",
+    "EventStrategy": "events",
+    "Fill": "events",
+    "Order": "events",
+    "OrderType": "events",
+    "PerformanceAnalyzer": "analyzers",
+    "Position": "events",
+    "ResultsStore": "results",
+    "SharedPanel": "sweep",
+    "SweepCheckpoint": "sweep",
+    "SweepResult": "sweep",
+    "VectorBacktestEngine": "vectorized",
+    "WalkForwardResult": "walk_forward",
+    "WalkForwardWindow": "walk_forward",
+    "bars_from_panel": "events",
+    "bootstrap_metrics": "bootstrap",
+    "feature_panel": "walk_forward",
+    "param_grid": "sweep",
+    "run_sweep": "sweep",
+    "run_walk_forward": "walk_forward",
+    "walk_forward_windows": "walk_forward",
+    "weights_from_signals": "vectorized",
+}
+
+__all__ = [
+    "BacktestResult",
+    "BootstrapResult",
+    "EventBacktestEngine",
+    "EventBacktestResult",
+    "EventStrategy",
+    "Fill",
+    "Order",
+    "OrderType",
+    "PerformanceAnalyzer",
+    "Position",
+    "ResultsStore",
+    "SharedPanel",
+    "SweepCheckpoint",
+    "SweepResult",
+    "VectorBacktestEngine",
+    "WalkForwardResult",
+    "WalkForwardWindow",
+    "bars_from_panel",
+    "bootstrap_metrics",
+    "feature_panel",
+    "param_grid",
+    "run_sweep",
+    "run_walk_forward",
+    "walk_forward_windows",
+    "weights_from_signals",
+]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the submodule defining ``name`` on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the module's attributes including the lazily imported names."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,244 @@
+"""Streaming performance metrics with constant-time updates.
+
+``PerformanceAnalyzer`` keeps a handful of running sums instead of the
+return series: a Welford mean and variance for the Sharpe ratio, the sum of
+squared losses for the Sortino ratio, the running peak and trough of the
+compounded equity for the maximum drawdown, and counters for win rate and
+exposure. Each update costs O(1) time and memory, so metrics can be logged
+live during a long run and sweeps never need to keep an equity curve.
+
+The state may be scalar or an array with one element per run, in which case
+one update advances every run at once. Analyzers of consecutive chunks of
+the same runs, or of different runs computed in separate workers, combine
+exactly with ``merge`` and ``concat``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+from trading_strategy_development.constants import TRADING_DAYS_PER_YEAR
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+Value = float | npt.NDArray[np.float64]
+
+
+class PerformanceAnalyzer:
+    """Online accumulator of portfolio return statistics.
+
+    Example:
+        >>> analyzer = PerformanceAnalyzer()
+        >>> for daily_return in returns:
+        ...     analyzer.update(daily_return)
+        >>> analyzer.summary()["sharpe"]
+
+    Attributes:
+        count: Number of bars seen.
+        mean: Mean return.
+        m2: Sum of squared deviations from the mean (Welford).
+        downside: Sum of squared negative returns.
+        wins: Number of bars with a positive return.
+        active: Number of bars with a non-zero return.
+        exposure: Sum of the gross exposure of every bar.
+        growth: Compounded growth of one unit of capital.
+        peak: Highest compounded growth, starting from 1.
+        trough: Lowest compounded growth, starting from 1.
+        max_drawdown: Largest fall from a peak, as a non-positive fraction.
+    """
+
+    __slots__ = (
+        "active",
+        "count",
+        "downside",
+        "exposure",
+        "growth",
+        "m2",
+        "max_drawdown",
+        "mean",
+        "peak",
+        "trough",
+        "wins",
+    )
+
+    def __init__(self, shape: int | tuple[int, ...] = ()) -> None:
+        def zeros() -> Value:
+            return np.zeros(shape) if shape else 0.0
+
+        def ones() -> Value:
+            return np.ones(shape) if shape else 1.0
+
+        self.count = 0
+        self.mean = zeros()
+        self.m2 = zeros()
+        self.downside = zeros()
+        self.wins = zeros()
+        self.active = zeros()
+        self.exposure = zeros()
+        self.growth = ones()
+        self.peak = ones()
+        self.trough = ones()
+        self.max_drawdown = zeros()
+
+    def __repr__(self) -> str:
+        """Summarize the analyzer's progress."""
+        return f"PerformanceAnalyzer(count={self.count}, shape={np.shape(self.mean)})"
+
+    def update(self, returns: Value, exposure: Value | None = None) -> None:
+        """Add one bar.
+
+        Args:
+            returns: Return of the bar, one per run for an array analyzer.
+            exposure: Gross exposure during the bar as a fraction of equity. Defaults to 1 if the return is
+                non-zero, else 0.
+        """
+        self.count += 1
+        delta = returns - self.mean
+        self.mean = self.mean + delta / self.count
+        self.m2 = self.m2 + delta * (returns - self.mean)
+        self.wins = self.wins + (returns > 0)
+        self.active = self.active + (returns != 0)
+        self.exposure = self.exposure + (exposure if exposure is not None else returns != 0)
+        self.growth = self.growth * (1.0 + returns)
+        if isinstance(self.peak, float):
+            # Builtins are several times faster than NumPy ufuncs on Python floats, which matters per bar
+            self.downside += min(returns, 0.0) ** 2
+            self.peak = max(self.peak, self.growth)
+            self.trough = min(self.trough, self.growth)
+            self.max_drawdown = min(self.max_drawdown, self.growth / self.peak - 1.0)
+            return
+        self.downside = self.downside + np.minimum(returns, 0.0) ** 2
+        self.peak = np.maximum(self.peak, self.growth)
+        self.trough = np.minimum(self.trough, self.growth)
+        self.max_drawdown = np.minimum(self.max_drawdown, self.growth / self.peak - 1.0)
+
+    @classmethod
+    def from_returns(cls, returns: npt.ArrayLike, exposure: npt.ArrayLike | None = None) -> PerformanceAnalyzer:
+        """Accumulate a chunk of bars with whole-array operations.
+
+        Args:
+            returns: Array of shape ``(..., n_bars)``.
+            exposure: Gross exposure per bar, broadcastable to ``returns``.
+
+        Returns:
+            Analyzer with the leading shape of ``returns``, equal to updating bar by bar.
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        analyzer = cls(returns.shape[:-1])
+        n_bars = returns.shape[-1]
+        if n_bars == 0:
+            return analyzer
+        analyzer.count = n_bars
+        analyzer.mean = returns.mean(axis=-1)
+        deviation = returns - analyzer.mean[..., None]
+        analyzer.m2 = np.einsum("...i,...i->...", deviation, deviation)
+        losses = np.minimum(returns, 0.0, out=deviation)
+        analyzer.downside = np.einsum("...i,...i->...", losses, losses)
+        analyzer.wins = np.count_nonzero(returns > 0, axis=-1).astype(np.float64)
+        analyzer.active = np.count_nonzero(returns, axis=-1).astype(np.float64)
+        exposure = returns != 0 if exposure is None else np.broadcast_to(exposure, returns.shape)
+        analyzer.exposure = np.sum(exposure, axis=-1, dtype=np.float64)
+        # Curves as large as the returns are built in place; this dominates the cost for long series
+        growth = np.add(returns, 1.0)
+        np.cumprod(growth, axis=-1, out=growth)
+        peak = np.maximum(growth, 1.0)
+        np.maximum.accumulate(peak, axis=-1, out=peak)
+        analyzer.growth = growth[..., -1].copy()
+        analyzer.peak = peak[..., -1].copy()
+        analyzer.trough = np.minimum(growth.min(axis=-1), 1.0)
+        drawdown = np.divide(growth, peak, out=peak)
+        analyzer.max_drawdown = np.minimum(drawdown.min(axis=-1) - 1.0, 0.0)
+        if not returns.shape[:-1]:
+            for name in cls.__slots__:
+                if name != "count":
+                    setattr(analyzer, name, float(getattr(analyzer, name)))
+        return analyzer
+
+    def merge(self, later: PerformanceAnalyzer) -> PerformanceAnalyzer:
+        """Combine with the analyzer of the bars that follow this one's.
+
+        Return moments and counters combine in any order. The drawdown needs
+        the order: a trough in ``later`` is measured against the highest peak
+        seen so far, which is ``later``'s own peak or this analyzer's.
+
+        Args:
+            later: Analyzer of the next chunk of the same runs.
+
+        Returns:
+            New analyzer equal to having seen both chunks in sequence.
+        """
+        merged = PerformanceAnalyzer.__new__(PerformanceAnalyzer)
+        count = self.count + later.count
+        merged.count = count
+        if count == 0:
+            merged.mean, merged.m2 = self.mean, self.m2
+        else:
+            delta = later.mean - self.mean
+            merged.mean = self.mean + delta * later.count / count
+            merged.m2 = self.m2 + later.m2 + delta**2 * self.count * later.count / count
+        merged.downside = self.downside + later.downside
+        merged.wins = self.wins + later.wins
+        merged.active = self.active + later.active
+        merged.exposure = self.exposure + later.exposure
+        merged.growth = self.growth * later.growth
+        merged.peak = np.maximum(self.peak, self.growth * later.peak)
+        merged.trough = np.minimum(self.trough, self.growth * later.trough)
+        # Later drawdowns are either below later's own peak or below this peak, whichever is higher
+        merged.max_drawdown = np.minimum(
+            np.minimum(self.max_drawdown, later.max_drawdown), self.growth * later.trough / self.peak - 1.0
+        )
+        return merged
+
+    @classmethod
+    def concat(cls, analyzers: Sequence[PerformanceAnalyzer]) -> PerformanceAnalyzer:
+        """Stack analyzers of different runs over the same bars into one array analyzer.
+
+        Args:
+            analyzers: Analyzers with equal bar counts, e.g. from sweep workers.
+
+        Returns:
+            Analyzer whose state has one element per run along the first axis.
+
+        Raises:
+            ValueError: If the analyzers saw different numbers of bars.
+        """
+        counts = {analyzer.count for analyzer in analyzers}
+        if len(counts) > 1:
+            raise ValueError(f"Cannot concatenate analyzers over different numbers of bars: {sorted(counts)}.")
+        stacked = cls.__new__(cls)
+        stacked.count = counts.pop() if counts else 0
+        for name in cls.__slots__:
+            if name != "count":
+                setattr(stacked, name, np.concatenate([np.atleast_1d(getattr(a, name)) for a in analyzers]))
+        return stacked
+
+    def summary(self, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> dict[str, npt.NDArray[np.float64]]:
+        """Metrics of the bars seen so far.
+
+        Args:
+            periods_per_year: Bars per year, used to annualise.
+
+        Returns:
+            Mapping of metric name to an array of the analyzer's shape (0-d for a scalar analyzer), as in
+            ``BacktestResult.summary``. Ratios are NaN until they are defined.
+        """
+        mean = np.asarray(self.mean)
+        count = float(self.count)
+        annualise = np.sqrt(periods_per_year)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volatility = np.sqrt(np.divide(self.m2, count - 1)) if count > 1 else np.full_like(mean, np.nan)
+            downside = np.sqrt(np.divide(self.downside, count))
+            return {
+                "total_return": np.asarray(self.growth) - 1.0,
+                "annual_return": np.power(self.growth, np.divide(periods_per_year, count)) - 1.0,
+                "annual_volatility": volatility * annualise,
+                "sharpe": mean / volatility * annualise,
+                "sortino": mean / downside * annualise,
+                "max_drawdown": np.asarray(self.max_drawdown),
+                "win_rate": np.divide(self.wins, self.active),
+                "exposure": np.divide(self.exposure, count),
+            }
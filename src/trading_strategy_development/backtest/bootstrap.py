@@ -0,0 +1,167 @@
+"""Confidence intervals for backtest metrics by stationary block bootstrap.
+
+The stationary bootstrap (Politis and Romano, 1994) resamples a return
+series in blocks of random, geometrically distributed length, which keeps
+the short-range dependence of returns that resampling single days would
+destroy. The resample indices of a whole batch of paths are generated as one
+``(n_paths, n_obs)`` matrix with a few array operations, the resampled
+returns are scored with ``PerformanceAnalyzer.from_returns``, and batches
+are spread over worker processes.
+
+Each batch draws from its own child of one ``SeedSequence``, so the paths
+only depend on the seed and the batch size, not on the number of workers.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+from trading_strategy_development.backtest.analyzers import PerformanceAnalyzer
+from trading_strategy_development.utils.custom_logging import get_logger, logging_pool_kwargs
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+DEFAULT_N_PATHS: Final[int] = 10_000
+DEFAULT_BATCH_SIZE: Final[int] = 250
+
+
+def stationary_bootstrap_indices(
+    n_obs: int, n_paths: int, mean_block: float, rng: np.random.Generator
+) -> npt.NDArray[np.intp]:
+    """Draw resample indices of the stationary bootstrap for many paths at once.
+
+    Each position starts a new block with probability ``1 / mean_block``,
+    at a uniformly drawn observation; otherwise it continues the current
+    block with the next observation, wrapping around at the end.
+
+    Args:
+        n_obs: Length of the series and of each path.
+        n_paths: Number of paths.
+        mean_block: Mean block length, at least 1.
+        rng: Random generator.
+
+    Returns:
+        Array of shape ``(n_paths, n_obs)`` indexing into the series.
+    """
+    positions = np.arange(n_obs)
+    starts = rng.integers(0, n_obs, size=(n_paths, n_obs))
+    new_block = rng.random((n_paths, n_obs), dtype=np.float32) < 1.0 / mean_block
+    new_block[:, 0] = True
+    # Position at which the block covering each position started
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+    first = np.take_along_axis(starts, block_start, axis=1)
+    return (first + positions - block_start) % n_obs
+
+
+def _bootstrap_batch(
+    returns: npt.NDArray[np.float64], n_paths: int, mean_block: float, seed: np.random.SeedSequence
+) -> dict[str, npt.NDArray[np.float64]]:
+    """Score one batch of resampled paths."""
+    indices = stationary_bootstrap_indices(len(returns), n_paths, mean_block, np.random.default_rng(seed))
+    return PerformanceAnalyzer.from_returns(returns[indices]).summary()
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """Bootstrap distribution of performance metrics.
+
+    Attributes:
+        observed: Metrics of the original return series.
+        samples: Metrics of every resampled path, one array of length ``n_paths`` per metric.
+        mean_block: Mean block length used.
+        paths_per_second: Throughput, counted as paths resampled and scored per second of wall time.
+    """
+
+    observed: dict[str, float]
+    samples: dict[str, npt.NDArray[np.float64]]
+    mean_block: float
+    paths_per_second: float
+
+    def confidence_interval(self, metric: str, level: float = 0.95) -> tuple[float, float]:
+        """Percentile confidence interval of a metric.
+
+        Args:
+            metric: Metric name, e.g. ``"sharpe"``.
+            level: Coverage of the interval.
+
+        Returns:
+            Lower and upper bounds. Paths where the metric is undefined are ignored.
+        """
+        tail = (1 - level) / 2 * 100
+        low, high = np.nanpercentile(self.samples[metric], [tail, 100 - tail])
+        return float(low), float(high)
+
+
+def bootstrap_metrics(
+    returns: npt.ArrayLike,
+    n_paths: int = DEFAULT_N_PATHS,
+    *,
+    mean_block: float | None = None,
+    seed: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int | None = None,
+) -> BootstrapResult:
+    """Bootstrap the distribution of a strategy's performance metrics.
+
+    Args:
+        returns: One-dimensional series of periodic strategy returns.
+        n_paths: Number of resampled paths.
+        mean_block: Mean block length. Defaults to the cube root of the series length.
+        seed: Seed for reproducible paths.
+        batch_size: Paths resampled together in one index matrix.
+        max_workers: Number of worker processes. Defaults to the number of CPUs; 1 runs in this process.
+
+    Returns:
+        BootstrapResult with the metrics of ``PerformanceAnalyzer`` for every path.
+
+    Raises:
+        ValueError: If ``returns`` is not a non-empty one-dimensional series, ``n_paths``, ``batch_size`` or
+            ``max_workers`` is not positive, or ``mean_block`` is below 1.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.ndim != 1 or returns.size == 0:
+        raise ValueError(f"returns must be a non-empty 1-D series, got shape {returns.shape}.")
+    if n_paths <= 0:
+        raise ValueError(f"n_paths must be positive, got {n_paths}.")
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}.")
+    if max_workers is not None and max_workers <= 0:
+        raise ValueError(f"max_workers must be positive, got {max_workers}.")
+    if mean_block is not None and mean_block < 1:
+        raise ValueError(f"mean_block must be at least 1, got {mean_block}.")
+    mean_block = mean_block or max(1.0, round(len(returns) ** (1 / 3)))
+    sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    max_workers = min(max_workers or os.cpu_count() or 1, len(sizes))
+
+    started = time.perf_counter()
+    if max_workers <= 1:
+        batches = [_bootstrap_batch(returns, size, mean_block, child) for size, child in zip(sizes, seeds, strict=True)]
+    else:
+        try:
+            pool_kwargs = logging_pool_kwargs()
+        except RuntimeError:
+            pool_kwargs = {}
+        with ProcessPoolExecutor(max_workers=max_workers, **pool_kwargs) as pool:
+            batches = list(pool.map(_bootstrap_batch, [returns] * len(sizes), sizes, [mean_block] * len(sizes), seeds))
+    elapsed = time.perf_counter() - started
+
+    paths_per_second = n_paths / elapsed if elapsed > 0 else float("inf")
+    logger.info("Bootstrapped %d paths of %d returns at %.0f paths/s", n_paths, len(returns), paths_per_second)
+    observed = PerformanceAnalyzer.from_returns(returns).summary()
+    return BootstrapResult(
+        observed={name: float(value) for name, value in observed.items()},
+        samples={name: np.concatenate([batch[name] for batch in batches]) for name in observed},
+        mean_block=mean_block,
+        paths_per_second=paths_per_second,
+    )
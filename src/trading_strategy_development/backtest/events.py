@@ -0,0 +1,492 @@
+"""Event-driven backtesting for path-dependent strategies.
+
+The vectorised engine cannot express logic whose decisions depend on earlier
+fills, such as stop losses and trailing exits. This engine steps through
+dates instead, but keeps the per-bar work small:
+
+- Bars are a structured NumPy array laid out date-major, so ``bars[t]`` is
+  one contiguous row holding every ticker's OHLCV for date ``t`` and no
+  DataFrame is touched inside the loop.
+- Orders, fills and positions are ``__slots__`` classes.
+- Submitted orders and fills travel through a preallocated ring buffer.
+- Marking to market is a single dot product per date.
+
+Orders submitted while handling date ``t`` can fill from date ``t + 1``.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from trading_strategy_development.backtest.analyzers import PerformanceAnalyzer
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.utils.custom_logging import get_logger
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+BAR_DTYPE: Final[np.dtype] = np.dtype(
+    [("open", np.float64), ("high", np.float64), ("low", np.float64), ("close", np.float64), ("volume", np.float64)]
+)
+DEFAULT_RING_CAPACITY: Final[int] = 1024
+
+
+class OrderType(IntEnum):
+    """How an order is triggered and priced."""
+
+    MARKET = 0
+    LIMIT = 1
+    STOP = 2
+    TRAILING_STOP = 3
+
+
+class OrderStatus(IntEnum):
+    """Lifecycle state of an order."""
+
+    PENDING = 0
+    FILLED = 1
+    CANCELLED = 2
+
+
+class Order:
+    """Instruction to trade ``quantity`` shares of one ticker; negative quantities sell.
+
+    Orders stay active until filled or cancelled. A trailing stop ratchets
+    its stop price ``trail`` (a fraction) behind the best price seen since it
+    was submitted.
+    """
+
+    __slots__ = (
+        "extreme",
+        "id",
+        "limit_price",
+        "order_type",
+        "quantity",
+        "status",
+        "stop_price",
+        "submitted",
+        "ticker",
+        "trail",
+    )
+
+    def __init__(
+        self,
+        ticker: int,
+        quantity: float,
+        order_type: OrderType = OrderType.MARKET,
+        *,
+        limit_price: float = math.nan,
+        stop_price: float = math.nan,
+        trail: float = math.nan,
+    ) -> None:
+        self.id = -1
+        self.ticker = ticker
+        self.quantity = quantity
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.stop_price = stop_price
+        self.trail = trail
+        self.extreme = math.nan
+        self.submitted = -1
+        self.status = OrderStatus.PENDING
+
+    def __repr__(self) -> str:
+        """Summarize the order."""
+        return (
+            f"Order(id={self.id}, ticker={self.ticker}, quantity={self.quantity}, type={self.order_type.name}, "
+            f"status={self.status.name})"
+        )
+
+
+class Fill:
+    """Execution of an order at one price."""
+
+    __slots__ = ("commission", "date", "order_id", "price", "quantity", "ticker")
+
+    def __init__(
+        self, order_id: int, ticker: int, quantity: float, price: float, *, commission: float, date: int
+    ) -> None:
+        self.order_id = order_id
+        self.ticker = ticker
+        self.quantity = quantity
+        self.price = price
+        self.commission = commission
+        self.date = date
+
+    def __repr__(self) -> str:
+        """Summarize the fill."""
+        return f"Fill(order_id={self.order_id}, ticker={self.ticker}, quantity={self.quantity}, price={self.price:.4f})"
+
+
+class Position:
+    """Shares held in one ticker with their average cost and realised profit."""
+
+    __slots__ = ("average_price", "quantity", "realized_pnl", "ticker")
+
+    def __init__(self, ticker: int) -> None:
+        self.ticker = ticker
+        self.quantity = 0.0
+        self.average_price = 0.0
+        self.realized_pnl = 0.0
+
+    def apply(self, fill: Fill) -> None:
+        """Update the position with a fill.
+
+        Args:
+            fill: Fill in this position's ticker.
+        """
+        quantity = self.quantity
+        traded = fill.quantity
+        if traded == 0:
+            return
+        if quantity == 0 or (quantity > 0) == (traded > 0):
+            total = quantity + traded
+            self.average_price = (self.average_price * quantity + fill.price * traded) / total
+            self.quantity = total
+            return
+        closed = min(abs(traded), abs(quantity))
+        direction = 1.0 if quantity > 0 else -1.0
+        self.realized_pnl += closed * direction * (fill.price - self.average_price)
+        self.quantity = quantity + traded
+        if self.quantity == 0:
+            self.average_price = 0.0
+        elif (self.quantity > 0) != (quantity > 0):
+            # Flipped from long to short or back: the remainder opened at the fill price
+            self.average_price = fill.price
+
+    def __repr__(self) -> str:
+        """Summarize the position."""
+        return f"Position(ticker={self.ticker}, quantity={self.quantity}, average_price={self.average_price:.4f})"
+
+
+class EventRing:
+    """Preallocated FIFO ring buffer of events that doubles its capacity when full."""
+
+    __slots__ = ("_buffer", "_head", "_size")
+
+    def __init__(self, capacity: int = DEFAULT_RING_CAPACITY) -> None:
+        self._buffer: list[Order | Fill | None] = [None] * capacity
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of queued events."""
+        return self._size
+
+    def push(self, event: Order | Fill) -> None:
+        """Queue an event.
+
+        Args:
+            event: Order or fill.
+        """
+        capacity = len(self._buffer)
+        if self._size == capacity:
+            self._buffer = self._buffer[self._head :] + self._buffer[: self._head] + [None] * capacity
+            self._head = 0
+            capacity *= 2
+        self._buffer[(self._head + self._size) % capacity] = event
+        self._size += 1
+
+    def pop(self) -> Order | Fill:
+        """Take the oldest event.
+
+        Returns:
+            Oldest queued event.
+
+        Raises:
+            IndexError: If the ring is empty.
+        """
+        if self._size == 0:
+            raise IndexError("pop from an empty EventRing")
+        event = self._buffer[self._head]
+        self._buffer[self._head] = None
+        self._head = (self._head + 1) % len(self._buffer)
+        self._size -= 1
+        return event  # type: ignore[return-value]
+
+
+class EventStrategy:
+    """Base class for strategies run by the EventBacktestEngine. Override the hooks you need."""
+
+    def on_start(self, engine: EventBacktestEngine) -> None:
+        """Called once before the first date."""
+
+    def on_bar(self, engine: EventBacktestEngine, t: int, bars: npt.NDArray[np.void]) -> None:
+        """Called after the fills of date ``t`` with every ticker's bar for that date.
+
+        Args:
+            engine: Engine running the strategy; use it to submit orders and read positions.
+            t: Date position.
+            bars: Structured row of ``BAR_DTYPE`` with one element per ticker.
+        """
+
+    def on_fill(self, engine: EventBacktestEngine, fill: Fill) -> None:
+        """Called for each fill, before ``on_bar`` of the same date."""
+
+
+@dataclass(frozen=True)
+class EventBacktestResult:
+    """Outputs of an event-driven backtest.
+
+    Attributes:
+        dates: Dates of the backtest.
+        tickers: Tickers of the backtest.
+        equity: Portfolio value after each date's close.
+        returns: Daily portfolio returns.
+        fills: Every fill in order of execution.
+        positions: Final position per ticker.
+        bars_per_second: Throughput, counted as tickers x dates processed per second of wall time.
+        ruined_at: Index of the date on which equity fell to zero or below, after which the run stopped and the
+            equity curve is held flat, or None if it never did.
+    """
+
+    dates: pd.Index
+    tickers: pd.Index
+    equity: npt.NDArray[np.float64]
+    returns: npt.NDArray[np.float64]
+    fills: list[Fill]
+    positions: list[Position]
+    bars_per_second: float
+    ruined_at: int | None = None
+
+
+def bars_from_panel(panel: PricePanel) -> npt.NDArray[np.void]:
+    """Lay out a panel's OHLCV fields as a date-major structured array.
+
+    Args:
+        panel: Panel with Open, High, Low and Close fields. Volume is optional.
+
+    Returns:
+        Array of ``BAR_DTYPE`` with shape ``(n_dates, n_tickers)``.
+    """
+    bars = np.empty((len(panel.dates), len(panel.tickers)), dtype=BAR_DTYPE)
+    for name in BAR_DTYPE.names or ():
+        field = name.capitalize()
+        bars[name] = panel.field(field).T if field in panel.fields else np.nan
+    return bars
+
+
+class EventBacktestEngine:
+    """Step through dates, matching orders against each bar and calling the strategy.
+
+    For every date the engine matches active orders against the bar, applies
+    the fills and reports them to the strategy, calls ``on_bar`` and finally
+    marks the portfolio to market at the close. Market orders fill at the
+    open; limit and stop orders fill at their price, or at the open if the
+    bar gaps through it. Slippage moves every fill price against the trader.
+
+    ``analyzer`` holds the performance metrics of the dates processed so
+    far, so strategies can report them while a long run is in progress.
+    """
+
+    def __init__(
+        self,
+        bars: npt.NDArray[np.void],
+        *,
+        dates: pd.Index | None = None,
+        tickers: pd.Index | None = None,
+        initial_capital: float = 1_000_000.0,
+        commission_bps: float = 1.0,
+        slippage_bps: float = 2.0,
+        ring_capacity: int = DEFAULT_RING_CAPACITY,
+    ) -> None:
+        if bars.dtype != BAR_DTYPE or bars.ndim != 2:
+            raise ValueError("bars must be a (n_dates, n_tickers) array of BAR_DTYPE; see bars_from_panel().")
+        n_dates, n_tickers = bars.shape
+        self.bars = bars
+        self.dates = pd.Index(dates if dates is not None else range(n_dates), name="Date")
+        self.tickers = pd.Index(tickers if tickers is not None else range(n_tickers), name="Ticker")
+        self.initial_capital = initial_capital
+        self.commission_rate = commission_bps / 10_000
+        self.slippage_rate = slippage_bps / 10_000
+        self._ring_capacity = ring_capacity
+        self._reset()
+
+    @classmethod
+    def from_panel(cls, panel: PricePanel, **kwargs: float) -> EventBacktestEngine:
+        """Create an engine over a price panel.
+
+        Args:
+            panel: Price panel.
+            **kwargs: ``initial_capital``, ``commission_bps``, ``slippage_bps`` or ``ring_capacity``.
+
+        Returns:
+            New EventBacktestEngine.
+        """
+        return cls(bars_from_panel(panel), dates=panel.dates, tickers=panel.tickers, **kwargs)
+
+    def _reset(self) -> None:
+        n_tickers = self.bars.shape[1]
+        self.cash = self.initial_capital
+        self.positions = [Position(ticker) for ticker in range(n_tickers)]
+        self.quantities = np.zeros(n_tickers)
+        self.fills: list[Fill] = []
+        self.t = -1
+        self._orders: list[Order] = []
+        self._events = EventRing(self._ring_capacity)
+        self._next_order_id = 0
+        self._last_close = np.zeros(n_tickers)
+        self.analyzer = PerformanceAnalyzer()
+
+    def submit(self, order: Order) -> Order:
+        """Submit an order; it can fill from the next date.
+
+        Args:
+            order: Order to submit.
+
+        Returns:
+            The order, with its id assigned.
+        """
+        order.id = self._next_order_id
+        order.submitted = self.t
+        self._next_order_id += 1
+        self._events.push(order)
+        return order
+
+    def cancel(self, order: Order) -> None:
+        """Cancel an order that has not filled yet.
+
+        Args:
+            order: Order to cancel.
+        """
+        if order.status == OrderStatus.PENDING:
+            order.status = OrderStatus.CANCELLED
+
+    def equity(self) -> float:
+        """Portfolio value at the latest close."""
+        return self.cash + float(self.quantities @ self._last_close)
+
+    def _fill_price(self, order: Order, open_: float, high: float, low: float) -> float | None:
+        """Price at which ``order`` executes on a bar, or None if it does not trigger."""
+        buy = order.quantity > 0
+        order_type = order.order_type
+        if order_type == OrderType.MARKET:
+            return open_
+        if order_type == OrderType.LIMIT:
+            limit = order.limit_price
+            if buy:
+                return min(open_, limit) if low <= limit else None
+            return max(open_, limit) if high >= limit else None
+
+        if order_type == OrderType.TRAILING_STOP and math.isnan(order.stop_price):
+            order.extreme = float(self._last_close[order.ticker])
+            order.stop_price = order.extreme * (1 + order.trail if buy else 1 - order.trail)
+        stop = order.stop_price
+        if buy and high >= stop:
+            return max(open_, stop)
+        if not buy and low <= stop:
+            return min(open_, stop)
+        if order_type == OrderType.TRAILING_STOP:
+            # Not triggered: ratchet the stop behind the best price of this bar for the next one
+            if buy:
+                order.extreme = min(order.extreme, low)
+                order.stop_price = min(stop, order.extreme * (1 + order.trail))
+            else:
+                order.extreme = max(order.extreme, high)
+                order.stop_price = max(stop, order.extreme * (1 - order.trail))
+        return None
+
+    def _match(self, t: int, bars: npt.NDArray[np.void]) -> None:
+        # One conversion per date to Python floats is far cheaper than indexing NumPy scalars per order
+        rows = bars.tolist()
+        active: list[Order] = []
+        for order in self._orders:
+            if order.status != OrderStatus.PENDING:
+                continue
+            open_, high, low, _, _ = rows[order.ticker]
+            price = None if math.isnan(open_) else self._fill_price(order, open_, high, low)
+            if price is None:
+                active.append(order)
+                continue
+            price *= 1 + self.slippage_rate if order.quantity > 0 else 1 - self.slippage_rate
+            commission = abs(order.quantity) * price * self.commission_rate
+            order.status = OrderStatus.FILLED
+            self._events.push(Fill(order.id, order.ticker, order.quantity, price, commission=commission, date=t))
+        self._orders = active
+
+    def _drain(self, strategy: EventStrategy) -> None:
+        events = self._events
+        while events:
+            event = events.pop()
+            if isinstance(event, Order):
+                if event.status == OrderStatus.PENDING:
+                    self._orders.append(event)
+                continue
+            if not isinstance(event, Fill):
+                msg = f"Unexpected event {event!r}"
+                raise TypeError(msg)
+            fill = event
+            self.positions[fill.ticker].apply(fill)
+            self.quantities[fill.ticker] += fill.quantity
+            self.cash -= fill.quantity * fill.price + fill.commission
+            self.fills.append(fill)
+            strategy.on_fill(self, fill)
+
+    def run(self, strategy: EventStrategy) -> EventBacktestResult:
+        """Run a strategy over every date.
+
+        Args:
+            strategy: Strategy to run. The engine's state is reset first.
+
+        Returns:
+            EventBacktestResult with the equity curve, fills and final positions.
+        """
+        self._reset()
+        n_dates, n_tickers = self.bars.shape
+        equity = np.empty(n_dates)
+        last_close = self._last_close
+        np.copyto(last_close, np.nan_to_num(self.bars["open"][0]))
+
+        previous = self.initial_capital
+        ruined_at = None
+        started = time.perf_counter()
+        strategy.on_start(self)
+        self._drain(strategy)
+        for t in range(n_dates):
+            self.t = t
+            bars = self.bars[t]
+            if self._orders:
+                self._match(t, bars)
+            self._drain(strategy)
+            closes = bars["close"]
+            np.copyto(last_close, closes, where=~np.isnan(closes))
+            strategy.on_bar(self, t, bars)
+            self._drain(strategy)
+            value = self.cash + float(self.quantities @ last_close)
+            if value <= 0:
+                # Returns and exposure are undefined from here on, so stop rather than feed inf/NaN downstream
+                logger.warning("Equity fell to %.2f on %s; stopping the backtest", value, self.dates[t])
+                self.analyzer.update(value / previous - 1.0)
+                equity[t:] = value
+                ruined_at = t
+                break
+            gross = float(np.abs(self.quantities) @ last_close)
+            self.analyzer.update(value / previous - 1.0, gross / value)
+            equity[t] = previous = value
+        elapsed = time.perf_counter() - started
+
+        processed = (n_dates if ruined_at is None else ruined_at + 1) * n_tickers
+        bars_per_second = processed / elapsed if elapsed > 0 else float("inf")
+        logger.info("Event backtest processed %d bars at %.0f bars/s", processed, bars_per_second)
+        base = np.concatenate([[self.initial_capital], equity[:-1]])
+        returns = np.divide(np.diff(equity, prepend=self.initial_capital), base, out=np.zeros(n_dates), where=base > 0)
+        return EventBacktestResult(
+            dates=self.dates,
+            tickers=self.tickers,
+            equity=equity,
+            returns=returns,
+            fills=self.fills,
+            positions=self.positions,
+            bars_per_second=bars_per_second,
+            ruined_at=ruined_at,
+        )
@@ -0,0 +1,288 @@
+"""SQLite store for the parameters, metrics and equity curves of many backtest runs.
+
+Every run is one row of the ``runs`` table. Each parameter and metric gets
+its own indexed column (``param_<name>`` and ``metric_<name>``), added the
+first time a run uses it, so filtering on parameters and ranking by a metric
+are index lookups rather than scans. Equity curves are kept as float64
+blobs in a separate table and only read when asked for.
+
+Writes are batched: ``append`` consumes a stream of results, for example
+straight from ``run_sweep``, and commits one transaction per batch. The
+database runs in WAL mode so it can be queried while a sweep is writing.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from trading_strategy_development.backtest.sweep import SweepResult
+from trading_strategy_development.utils.custom_logging import get_logger
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Final, Self
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE: Final[int] = 1_000
+PARAM_PREFIX: Final[str] = "param_"
+METRIC_PREFIX: Final[str] = "metric_"
+COMPARISONS: Final[frozenset[str]] = frozenset({"=", "!=", "<", "<=", ">", ">="})
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    sweep TEXT NOT NULL,
+    params TEXT NOT NULL,
+    error TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_sweep ON runs (sweep);
+CREATE TABLE IF NOT EXISTS curves (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+"""
+
+# Filter on a parameter or metric: a value to match, or an (operator, value) pair
+Filter = Any | tuple[str, Any]
+
+
+def _sql_value(value: Any) -> Any:  # noqa: ANN401
+    """Convert a parameter value to a type SQLite can store."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, int | float | str):
+        return value
+    return json.dumps(value)
+
+
+def _column(prefix: str, name: str) -> str:
+    """Column name of a parameter or metric, rejecting names that are not identifiers."""
+    if not _IDENTIFIER.fullmatch(name):
+        raise ValueError(f"{name!r} is not a valid parameter or metric name; use letters, digits and underscores.")
+    return prefix + name
+
+
+class ResultsStore:
+    """Queryable store of backtest runs.
+
+    Example:
+        >>> with ResultsStore("results/sweeps.db") as store:
+        ...     store.append(run_sweep(panel, grid, evaluate), sweep="vix")
+        ...     best = store.top("sharpe", 10, sweep="vix", vix_threshold=(">=", 25))
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_SCHEMA)
+        self._columns = {row[1] for row in self._connection.execute("PRAGMA table_info(runs)")}
+
+    def __repr__(self) -> str:
+        """Summarize the store."""
+        return f"ResultsStore(path={str(self.path)!r}, runs={len(self)})"
+
+    def __len__(self) -> int:
+        """Number of stored runs."""
+        return self._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def __enter__(self) -> Self:
+        """Use the store as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Close the store."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    @property
+    def params(self) -> list[str]:
+        """Names of the parameters seen so far."""
+        return sorted(c.removeprefix(PARAM_PREFIX) for c in self._columns if c.startswith(PARAM_PREFIX))
+
+    @property
+    def metrics(self) -> list[str]:
+        """Names of the metrics seen so far."""
+        return sorted(c.removeprefix(METRIC_PREFIX) for c in self._columns if c.startswith(METRIC_PREFIX))
+
+    def _ensure_columns(self, columns: Iterable[str]) -> None:
+        """Add an indexed column for every new parameter or metric."""
+        for column in sorted(set(columns) - self._columns):
+            self._connection.execute(f"ALTER TABLE runs ADD COLUMN {column}")
+            self._connection.execute(f"CREATE INDEX IF NOT EXISTS runs_{column} ON runs ({column})")
+            self._columns.add(column)
+
+    def _write_batch(self, sweep: str, batch: list[SweepResult]) -> None:
+        """Insert a batch of results in one transaction."""
+        rows = []
+        for result in batch:
+            row = {_column(PARAM_PREFIX, name): _sql_value(value) for name, value in result.params.items()}
+            row.update({_column(METRIC_PREFIX, name): float(value) for name, value in result.metrics.items()})
+            rows.append(row)
+        try:
+            self._insert(sweep, batch, rows)
+        except sqlite3.Error:
+            # Columns added in the rolled back transaction are gone again
+            self._columns = {row[1] for row in self._connection.execute("PRAGMA table_info(runs)")}
+            raise
+
+    def _insert(self, sweep: str, batch: list[SweepResult], rows: list[dict[str, Any]]) -> None:
+        """Insert prepared rows and their curves in one transaction."""
+        statements: dict[tuple[str, ...], str] = {}
+        with self._connection:
+            self._ensure_columns(column for row in rows for column in row)
+            created = time.time()
+            for result, row in zip(batch, rows, strict=True):
+                key = tuple(row)
+                sql = statements.get(key)
+                if sql is None:
+                    columns = ["sweep", "params", "error", "created", *key]
+                    sql = f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                    statements[key] = sql
+                params = json.dumps(result.params, sort_keys=True, default=_sql_value)
+                cursor = self._connection.execute(sql, (sweep, params, result.error, created, *row.values()))
+                if result.curve is not None:
+                    self._connection.execute(
+                        "INSERT INTO curves (run_id, data) VALUES (?, ?)",
+                        (cursor.lastrowid, np.asarray(result.curve, dtype="<f8").tobytes()),
+                    )
+
+    def append(
+        self, results: Iterable[SweepResult], *, sweep: str = "default", batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """Store results, committing every ``batch_size`` runs.
+
+        Args:
+            results: Results to store, e.g. the stream from ``run_sweep``.
+            sweep: Name grouping the runs, for later queries.
+            batch_size: Runs written per transaction.
+
+        Returns:
+            Number of runs stored.
+        """
+        count = 0
+        batch: list[SweepResult] = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= batch_size:
+                self._write_batch(sweep, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._write_batch(sweep, batch)
+            count += len(batch)
+        logger.debug("Stored %d runs of sweep %r in %s", count, sweep, self.path)
+        return count
+
+    def _where(self, sweep: str | None, filters: dict[str, Filter]) -> tuple[list[str], list[Any]]:
+        """Build SQL conditions for a sweep and parameter or metric filters."""
+        conditions: list[str] = []
+        values: list[Any] = []
+        if sweep is not None:
+            conditions.append("sweep = ?")
+            values.append(sweep)
+        for name, condition in filters.items():
+            operator, value = condition if isinstance(condition, tuple) else ("=", condition)
+            if operator not in COMPARISONS:
+                raise ValueError(f"Unsupported comparison {operator!r}; use one of {sorted(COMPARISONS)}.")
+            column = next((p + name for p in (PARAM_PREFIX, METRIC_PREFIX) if p + name in self._columns), None)
+            if column is None:
+                raise KeyError(f"No parameter or metric named {name!r} in {self.path}.")
+            conditions.append(f"{column} {operator} ?")
+            values.append(value)
+        return conditions, values
+
+    def _frame(self, sql: str, values: list[Any]) -> pd.DataFrame:
+        """Run a query on ``runs`` and strip the column prefixes."""
+        frame = pd.read_sql_query(sql, self._connection, params=values, index_col="id")
+        frame = frame.drop(columns=["params", "created"])
+        return frame.rename(columns=lambda c: c.removeprefix(PARAM_PREFIX).removeprefix(METRIC_PREFIX))
+
+    def top(
+        self, metric: str, k: int = 10, *, ascending: bool = False, sweep: str | None = None, **filters: Filter
+    ) -> pd.DataFrame:
+        """Best runs by a metric, e.g. ``store.top("sharpe", 10, vix_threshold=(">=", 25))``.
+
+        Args:
+            metric: Metric to rank by.
+            k: Number of runs to return.
+            ascending: Rank the lowest values first, e.g. for drawdowns measured as positive losses.
+            sweep: Only consider runs of this sweep.
+            **filters: Parameter or metric name to a value, or to an ``(operator, value)`` pair.
+
+        Returns:
+            DataFrame indexed by run id with the sweep, error, parameter and metric columns, best first.
+            Failed runs and runs without the metric are excluded.
+
+        Raises:
+            KeyError: If the metric or a filtered name is unknown.
+            ValueError: If a filter uses an unsupported operator.
+        """
+        column = METRIC_PREFIX + metric
+        if column not in self._columns:
+            raise KeyError(f"No metric named {metric!r} in {self.path}.")
+        conditions, values = self._where(sweep, filters)
+        conditions += ["error IS NULL", f"{column} IS NOT NULL"]
+        order = "ASC" if ascending else "DESC"
+        sql = f"SELECT * FROM runs WHERE {' AND '.join(conditions)} ORDER BY {column} {order} LIMIT ?"
+        return self._frame(sql, [*values, k])
+
+    def load(self, sweep: str | None = None, **filters: Filter) -> pd.DataFrame:
+        """All runs matching the filters.
+
+        Args:
+            sweep: Only load runs of this sweep.
+            **filters: Parameter or metric filters, as in ``top``.
+
+        Returns:
+            DataFrame indexed by run id with the sweep, error, parameter and metric columns.
+        """
+        conditions, values = self._where(sweep, filters)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._frame(f"SELECT * FROM runs{where} ORDER BY id", values)
+
+    def curve(self, run_id: int) -> npt.NDArray[np.float64]:
+        """Equity curve of a run.
+
+        Args:
+            run_id: Id of the run, from the index of ``top`` or ``load``.
+
+        Returns:
+            The stored equity curve.
+
+        Raises:
+            KeyError: If no curve was stored for the run.
+        """
+        row = self._connection.execute("SELECT data FROM curves WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No equity curve stored for run {run_id}.")
+        return np.frombuffer(row[0], dtype="<f8").copy()
+
+    def sweeps(self) -> list[str]:
+        """Names of the stored sweeps."""
+        return [name for (name,) in self._connection.execute("SELECT DISTINCT sweep FROM runs ORDER BY sweep")]
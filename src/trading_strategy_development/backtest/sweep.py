@@ -0,0 +1,413 @@
+"""Parallel parameter sweeps over a price panel held in shared memory.
+
+The panel's value block is copied once into a ``multiprocessing.shared_memory``
+segment. Worker processes attach to it when they start and wrap it in a
+read-only PricePanel without copying, so a task only carries its parameter
+combinations and the results coming back are small dictionaries of metrics.
+Finished chunks can be checkpointed to disk so that an interrupted sweep
+resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import itertools
+import json
+import math
+import os
+import pickle
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from trading_strategy_development.data.indicator_cache import fingerprint
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.utils.custom_logging import get_logger, init_worker_logging, logging_pool_kwargs
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+CHECKPOINT_MANIFEST: Final[str] = "checkpoint.json"
+
+Params = dict[str, Any]
+Metrics = dict[str, float]
+Curve = npt.NDArray[np.float64]
+# Evaluates one parameter combination, optionally also returning its equity curve. It must be importable
+# (a module-level function) to reach worker processes.
+Evaluator = Callable[[PricePanel, Params], Metrics | tuple[Metrics, Curve]]
+
+
+@dataclass(frozen=True)
+class SharedPanelHandle:
+    """Picklable description of a panel in shared memory, used by workers to attach to it."""
+
+    name: str
+    shape: tuple[int, int, int]
+    dtype: str
+    tickers: list[str]
+    dates: np.ndarray
+    fields: tuple[str, ...]
+
+    def attach(self) -> tuple[PricePanel, shared_memory.SharedMemory]:
+        """Map the shared block into this process.
+
+        Returns:
+            Read-only PricePanel over the shared block, and the segment, which must stay
+            referenced (and be closed) by the caller.
+        """
+        segment = shared_memory.SharedMemory(name=self.name)
+        values: np.ndarray = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=segment.buf)
+        values.flags.writeable = False
+        panel = PricePanel(values, self.tickers, pd.DatetimeIndex(self.dates), self.fields)
+        return panel, segment
+
+
+class SharedPanel:
+    """Context manager placing a panel's values in a shared memory segment for the duration of a sweep.
+
+    Example:
+        >>> with SharedPanel(panel) as shared:
+        ...     pool = ProcessPoolExecutor(initializer=attach_worker_panel, initargs=(shared.handle,))
+    """
+
+    def __init__(self, panel: PricePanel) -> None:
+        self.panel = panel
+        self._segment: shared_memory.SharedMemory | None = None
+        self._handle: SharedPanelHandle | None = None
+
+    @property
+    def handle(self) -> SharedPanelHandle:
+        """Handle for attaching to the segment. Only valid inside the ``with`` block."""
+        if self._handle is None:
+            raise RuntimeError("SharedPanel is not open; use it as a context manager.")
+        return self._handle
+
+    def __enter__(self) -> SharedPanel:
+        """Copy the panel's values into a new shared memory segment."""
+        values = np.ascontiguousarray(self.panel.values)
+        self._segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        shared: np.ndarray = np.ndarray(values.shape, dtype=values.dtype, buffer=self._segment.buf)
+        shared[...] = values
+        n_fields, n_tickers, n_dates = values.shape
+        self._handle = SharedPanelHandle(
+            name=self._segment.name,
+            shape=(n_fields, n_tickers, n_dates),
+            dtype=values.dtype.str,
+            tickers=list(self.panel.tickers),
+            dates=self.panel.dates.to_numpy(),
+            fields=self.panel.fields,
+        )
+        logger.debug("Shared %d bytes of panel data as %s", values.nbytes, self._segment.name)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Release and remove the segment."""
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+        self._segment = None
+        self._handle = None
+
+
+# Per-process state of sweep workers, set by the pool initializer
+_worker_panel: PricePanel | None = None
+_worker_segment: shared_memory.SharedMemory | None = None
+
+
+def attach_worker_panel(handle: SharedPanelHandle, logging_initargs: tuple[Any, ...] | None = None) -> None:
+    """Process pool initializer attaching the worker to the shared panel.
+
+    Args:
+        handle: Handle of the shared panel.
+        logging_initargs: Arguments of ``init_worker_logging`` to route worker logs to the parent, if any.
+    """
+    global _worker_panel, _worker_segment
+    if logging_initargs is not None:
+        init_worker_logging(*logging_initargs)
+    _worker_panel, _worker_segment = handle.attach()
+
+
+def worker_panel() -> PricePanel:
+    """Get the shared panel attached by ``attach_worker_panel`` in this process.
+
+    Returns:
+        Read-only PricePanel.
+
+    Raises:
+        RuntimeError: If the process is not a sweep worker.
+    """
+    if _worker_panel is None:
+        raise RuntimeError("No shared panel is attached in this process.")
+    return _worker_panel
+
+
+@dataclass
+class SweepResult:
+    """Outcome of one parameter combination.
+
+    Attributes:
+        params: Parameter combination.
+        metrics: Metrics returned by the evaluator. Empty if it failed.
+        error: Error message if the evaluator raised.
+        curve: Equity curve, if the evaluator returned one.
+    """
+
+    params: Params
+    metrics: Metrics = field(default_factory=dict)
+    error: str | None = None
+    curve: Curve | None = None
+
+
+def evaluate_chunk(evaluate: Evaluator, chunk: Sequence[Params], panel: PricePanel | None = None) -> list[SweepResult]:
+    """Evaluate a chunk of parameter combinations, recording failures instead of raising.
+
+    Args:
+        evaluate: Evaluator function.
+        chunk: Parameter combinations.
+        panel: Panel to evaluate on. Defaults to this worker's shared panel.
+
+    Returns:
+        One result per combination, in order.
+    """
+    panel = panel if panel is not None else worker_panel()
+    results = []
+    for params in chunk:
+        try:
+            output = evaluate(panel, params)
+        except Exception as e:
+            logger.warning("Evaluation failed for %s: %s", params, e)
+            results.append(SweepResult(params, error=f"{type(e).__name__}: {e}"))
+            continue
+        metrics, curve = output if isinstance(output, tuple) else (output, None)
+        results.append(SweepResult(params, metrics, curve=curve))
+    return results
+
+
+def param_grid(**axes: Iterable[Any]) -> list[Params]:
+    """Build every combination of the given parameter values.
+
+    Example:
+        >>> param_grid(vix_threshold=[20, 25], sma_window=[10, 50])
+        [{'vix_threshold': 20, 'sma_window': 10}, {'vix_threshold': 20, 'sma_window': 50}, ...]
+
+    Args:
+        **axes: Parameter name to candidate values.
+
+    Returns:
+        List of parameter dictionaries.
+    """
+    names = list(axes)
+    return [dict(zip(names, values, strict=True)) for values in itertools.product(*axes.values())]
+
+
+def chunked(items: Sequence[Params], chunk_size: int) -> list[Sequence[Params]]:
+    """Split parameter combinations into consecutive chunks.
+
+    Args:
+        items: Parameter combinations.
+        chunk_size: Maximum combinations per chunk.
+
+    Returns:
+        List of chunks.
+    """
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def sweep_key(evaluate: Evaluator, combinations: Sequence[Params], panel: PricePanel) -> str:
+    """Identify a sweep by its evaluator, parameter combinations and data.
+
+    Args:
+        evaluate: Evaluator function.
+        combinations: Parameter combinations, in order.
+        panel: Panel the sweep runs on.
+
+    Returns:
+        Hex digest that changes if the evaluator's name or source, any combination, or the panel's tickers,
+        dates, fields or values change.
+    """
+    try:
+        source = inspect.getsource(evaluate)
+    except (OSError, TypeError):
+        source = None
+    description = {
+        "evaluate": f"{evaluate.__module__}.{evaluate.__qualname__}",
+        "source": source,
+        "params": combinations,
+        "panel": {
+            "tickers": list(panel.tickers),
+            "dates": [str(day) for day in panel.dates],
+            "fields": list(panel.fields),
+            "values": fingerprint(panel.values),
+        },
+    }
+    digest = hashlib.blake2b(json.dumps(description, sort_keys=True, default=str).encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+class SweepCheckpoint:
+    """Directory recording the completed chunks of one sweep, so a restarted sweep can skip them.
+
+    Every finished chunk is pickled to its own file, written to a temporary
+    name, flushed to disk and renamed into place, so a crash leaves either the
+    complete file or none. A manifest ties the directory to one sweep (see
+    ``sweep_key``: evaluator, grid and panel) and its chunk size, since chunks
+    are identified by index.
+    """
+
+    def __init__(self, directory: str | Path, key: str) -> None:
+        self.directory = Path(directory)
+        self.key = key
+        self.chunk_size: int | None = None
+        manifest_path = self.directory / CHECKPOINT_MANIFEST
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text("utf-8"))
+            if manifest["key"] != key:
+                raise ValueError(
+                    f"Checkpoint directory {self.directory} belongs to a different sweep; "
+                    "use a new directory or delete it to start over."
+                )
+            self.chunk_size = manifest["chunk_size"]
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Durably replace ``path`` with ``data``."""
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        # The rename only survives a crash once the directory entry is on disk too
+        if hasattr(os, "O_DIRECTORY"):
+            directory = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    def _chunk_path(self, index: int) -> Path:
+        return self.directory / f"chunk-{index:06d}.pkl"
+
+    def begin(self, chunk_size: int) -> None:
+        """Record the sweep in the manifest, unless resuming.
+
+        Args:
+            chunk_size: Combinations per chunk.
+
+        Raises:
+            ValueError: If resuming with a different chunk size.
+        """
+        if self.chunk_size is not None:
+            if chunk_size != self.chunk_size:
+                raise ValueError(f"Checkpoint was written with chunk_size={self.chunk_size}, got {chunk_size}.")
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = {"key": self.key, "chunk_size": chunk_size}
+        self._write(self.directory / CHECKPOINT_MANIFEST, json.dumps(manifest).encode())
+        self.chunk_size = chunk_size
+
+    def completed(self) -> dict[int, list[SweepResult]]:
+        """Load the chunks finished so far.
+
+        Returns:
+            Mapping of chunk index to its results. Unreadable chunk files are skipped, so they are rerun.
+        """
+        done = {}
+        for path in sorted(self.directory.glob("chunk-*.pkl")):
+            try:
+                done[int(path.stem.removeprefix("chunk-"))] = pickle.loads(path.read_bytes())
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError) as e:
+                logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+        return done
+
+    def save(self, index: int, results: list[SweepResult]) -> None:
+        """Record a finished chunk.
+
+        Args:
+            index: Position of the chunk in the sweep.
+            results: Its results.
+        """
+        self._write(self._chunk_path(index), pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def run_sweep(
+    panel: PricePanel,
+    grid: Sequence[Params] | Mapping[str, Iterable[Any]],
+    evaluate: Evaluator,
+    *,
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+    checkpoint_dir: str | Path | None = None,
+) -> Iterator[SweepResult]:
+    """Evaluate every parameter combination in parallel, yielding results as chunks finish.
+
+    The panel is placed in shared memory once for the whole sweep. Combinations
+    are sent to the workers in chunks, which keeps scheduling overhead small
+    while leaving enough chunks to balance load. Results arrive in completion
+    order, not grid order.
+
+    With ``checkpoint_dir``, every finished chunk is saved before its results
+    are yielded. Running the same sweep again with the same directory yields
+    the saved results first and only evaluates the chunks that are missing.
+
+    Args:
+        panel: Price panel shared with every worker.
+        grid: Parameter combinations, or a mapping of parameter name to values to combine with ``param_grid``.
+        evaluate: Module-level function computing metrics for one combination.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+        chunk_size: Combinations per task. Defaults to about four tasks per worker, or to the checkpoint's
+            chunk size when resuming.
+        checkpoint_dir: Directory to record finished chunks in and resume from.
+
+    Yields:
+        One SweepResult per combination.
+    """
+    combinations = param_grid(**grid) if isinstance(grid, Mapping) else list(grid)
+    if not combinations:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    checkpoint = SweepCheckpoint(checkpoint_dir, sweep_key(evaluate, combinations, panel)) if checkpoint_dir else None
+    if checkpoint is not None and chunk_size is None:
+        chunk_size = checkpoint.chunk_size
+    chunk_size = chunk_size or max(1, math.ceil(len(combinations) / (max_workers * 4)))
+    chunks = chunked(combinations, chunk_size)
+
+    done: dict[int, list[SweepResult]] = {}
+    if checkpoint is not None:
+        checkpoint.begin(chunk_size)
+        done = checkpoint.completed()
+        if done:
+            logger.info("Resuming sweep from %s: %d of %d chunks done", checkpoint.directory, len(done), len(chunks))
+        for results in done.values():
+            yield from results
+    pending = [index for index in range(len(chunks)) if index not in done]
+    if not pending:
+        return
+
+    try:
+        logging_initargs = logging_pool_kwargs()["initargs"]
+    except RuntimeError:
+        logging_initargs = None
+
+    logger.info("Sweeping %d combinations in %d chunks over %d workers", len(combinations), len(pending), max_workers)
+    with (
+        SharedPanel(panel) as shared,
+        ProcessPoolExecutor(
+            max_workers=max_workers, initializer=attach_worker_panel, initargs=(shared.handle, logging_initargs)
+        ) as pool,
+    ):
+        futures = {pool.submit(evaluate_chunk, evaluate, chunks[index]): index for index in pending}
+        for future in as_completed(futures):
+            results = future.result()
+            if checkpoint is not None:
+                checkpoint.save(futures[future], results)
+            yield from results
@@ -0,0 +1,252 @@
+"""Walk-forward optimisation over rolling train/test windows.
+
+Indicators only look back, so computing them once on the full history
+gives every window the values it would have seen live, without losing a
+warm-up period at the start of each window. Every window takes date-range
+views of those features instead of rebuilding them per fold. The feature
+block is shared with the worker processes through the same shared memory
+mechanism as parameter sweeps.
+
+The target is the exception: it looks ``TARGET_HORIZON`` dates ahead, so
+the labels at the end of a training window are computed from prices after
+it. Windows therefore leave that many dates between training and test by
+default, keeping test prices out of the training labels.
+
+Models are warm-started: ``fit`` receives the model fitted on the previous
+window, so it only has to adapt to the dates that changed. Warm starting
+makes windows depend on their predecessors, so the windows are split into
+contiguous chains, one per worker, which run in parallel; only the first
+window of each chain is fitted from scratch.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from trading_strategy_development.backtest.sweep import Metrics, SharedPanel, attach_worker_panel, worker_panel
+from trading_strategy_development.data.features import TARGET_HORIZON, compute_indicators
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.data.retrieval import VIX_TICKER
+from trading_strategy_development.utils.custom_logging import get_logger, logging_pool_kwargs
+
+if TYPE_CHECKING:
+    from trading_strategy_development.data.indicator_cache import IndicatorCache
+
+logger = get_logger(__name__)
+
+# Fits a model on a training window, warm-started from the previous window's model when there is one
+Fit = Callable[[PricePanel, Any], Any]
+# Scores a fitted model on a test window
+Evaluate = Callable[[Any, PricePanel], Metrics]
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Date positions of one train/test fold.
+
+    Attributes:
+        index: Position of the window in the walk.
+        train_start: First training date position.
+        train_end: Position one past the last training date.
+        test_start: First test date position.
+        test_end: Position one past the last test date.
+    """
+
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+    def train(self, panel: PricePanel) -> PricePanel:
+        """Training dates of ``panel``, as a view."""
+        return _date_range(panel, self.train_start, self.train_end)
+
+    def test(self, panel: PricePanel) -> PricePanel:
+        """Test dates of ``panel``, as a view."""
+        return _date_range(panel, self.test_start, self.test_end)
+
+
+def _date_range(panel: PricePanel, start: int, stop: int) -> PricePanel:
+    """Slice a panel by date position without copying."""
+    return PricePanel(panel.values[:, :, start:stop], panel.tickers, panel.dates[start:stop], panel.fields)
+
+
+def walk_forward_windows(
+    n_dates: int,
+    train_size: int,
+    test_size: int,
+    *,
+    step: int | None = None,
+    gap: int = TARGET_HORIZON,
+    anchored: bool = False,
+) -> list[WalkForwardWindow]:
+    """Lay out rolling train/test windows over a date axis.
+
+    Example:
+        >>> walk_forward_windows(10, train_size=4, test_size=2, gap=0)[:2]
+        [WalkForwardWindow(index=0, train_start=0, train_end=4, test_start=4, test_end=6),
+         WalkForwardWindow(index=1, train_start=2, train_end=6, test_start=6, test_end=8)]
+
+    Args:
+        n_dates: Number of dates available.
+        train_size: Training dates per window (the initial size if ``anchored``).
+        test_size: Test dates per window.
+        step: Dates between consecutive windows. Defaults to ``test_size``, so test windows tile the history.
+        gap: Dates skipped between training and test to purge labels that look into the test range. Defaults
+            to ``TARGET_HORIZON``; pass 0 only if the training labels do not look ahead.
+        anchored: Keep every training window starting at the first date instead of rolling it.
+
+    Returns:
+        Windows whose test range fits within ``n_dates``.
+
+    Raises:
+        ValueError: If a size is not positive or the gap is negative.
+    """
+    if step is None:
+        step = test_size
+    if min(train_size, test_size, step) <= 0 or gap < 0:
+        raise ValueError("train_size, test_size and step must be positive and gap non-negative.")
+    windows = []
+    train_end = train_size
+    while train_end + gap + test_size <= n_dates:
+        test_start = train_end + gap
+        train_start = 0 if anchored else train_end - train_size
+        windows.append(WalkForwardWindow(len(windows), train_start, train_end, test_start, test_start + test_size))
+        train_end += step
+    return windows
+
+
+def feature_panel(panel: PricePanel, cache: IndicatorCache | None = None, **kwargs: Any) -> PricePanel:  # noqa: ANN401
+    """Compute indicators on the full history and stack them into one panel.
+
+    The VIX is removed from the tickers and added as a ``vix`` field broadcast
+    across them, as in ``engineer_features``. The ``close`` field holds the
+    prices the features were computed from. The ``TARGET_COLUMN`` field is
+    the only one that looks ahead; see ``walk_forward_windows`` for the gap
+    that keeps it from leaking test prices into training.
+
+    Args:
+        panel: Price panel.
+        cache: Indicator cache shared between callers.
+        **kwargs: Window arguments of ``compute_indicators``.
+
+    Returns:
+        Float32 PricePanel whose fields are the feature names.
+    """
+    vix = None
+    if VIX_TICKER in panel.tickers:
+        vix = panel.field("Close")[panel.tickers.get_loc(VIX_TICKER)]
+        panel = panel.select([t for t in panel.tickers if t != VIX_TICKER])
+
+    features = {"close": np.asarray(panel.field("Close"), dtype=np.float32)}
+    features.update(compute_indicators(panel, cache=cache, **kwargs))
+    if vix is not None:
+        features["vix"] = np.broadcast_to(np.asarray(vix, dtype=np.float32), features["close"].shape)
+    return PricePanel(np.stack(list(features.values())), panel.tickers, panel.dates, list(features))
+
+
+@dataclass
+class WalkForwardResult:
+    """Outcome of one walk-forward window.
+
+    Attributes:
+        window: The fold.
+        metrics: Metrics returned by the evaluator on the test dates.
+        model: Model fitted on the training dates.
+        warm_started: Whether the fit started from the previous window's model.
+    """
+
+    window: WalkForwardWindow
+    metrics: Metrics = field(default_factory=dict)
+    model: Any = None
+    warm_started: bool = False
+
+
+def run_chain(
+    fit: Fit,
+    evaluate: Evaluate,
+    windows: Sequence[WalkForwardWindow],
+    *,
+    warm_start: bool = True,
+    features: PricePanel | None = None,
+) -> list[WalkForwardResult]:
+    """Fit and evaluate consecutive windows, passing each model on to the next fit.
+
+    Args:
+        fit: Function fitting a model on training features.
+        evaluate: Function scoring a model on test features.
+        windows: Consecutive windows.
+        warm_start: Pass the previous window's model to ``fit``.
+        features: Feature panel. Defaults to this worker's shared panel.
+
+    Returns:
+        One result per window, in order.
+    """
+    features = features if features is not None else worker_panel()
+    results = []
+    model = None
+    for window in windows:
+        previous = model if warm_start else None
+        model = fit(window.train(features), previous)
+        metrics = evaluate(model, window.test(features))
+        results.append(WalkForwardResult(window, metrics, model, warm_started=previous is not None))
+    return results
+
+
+def run_walk_forward(
+    features: PricePanel,
+    windows: Sequence[WalkForwardWindow],
+    fit: Fit,
+    evaluate: Evaluate,
+    *,
+    warm_start: bool = True,
+    max_workers: int | None = None,
+) -> list[WalkForwardResult]:
+    """Run a walk-forward optimisation with windows evaluated in parallel.
+
+    Args:
+        features: Feature panel, usually from ``feature_panel``. It is placed in shared memory once.
+        windows: Windows from ``walk_forward_windows``.
+        fit: Module-level function ``fit(train, previous_model) -> model``; ``previous_model`` is None on a cold start.
+        evaluate: Module-level function ``evaluate(model, test) -> metrics``.
+        warm_start: Warm-start each fit from the previous window within a chain. Without it every window is an
+            independent task.
+        max_workers: Number of worker processes, and of chains when warm starting. Defaults to the number of CPUs.
+
+    Returns:
+        One result per window, in window order.
+    """
+    if not windows:
+        return []
+    max_workers = max_workers or os.cpu_count() or 1
+    n_chains = min(max_workers, len(windows)) if warm_start else len(windows)
+    bounds = np.linspace(0, len(windows), n_chains + 1).round().astype(int)
+    chains = [windows[start:stop] for start, stop in itertools.pairwise(bounds)]
+
+    try:
+        logging_initargs = logging_pool_kwargs()["initargs"]
+    except RuntimeError:
+        logging_initargs = None
+
+    logger.info("Walking forward over %d windows in %d chains", len(windows), len(chains))
+    results: list[WalkForwardResult] = []
+    with (
+        SharedPanel(features) as shared,
+        ProcessPoolExecutor(
+            max_workers=max_workers, initializer=attach_worker_panel, initargs=(shared.handle, logging_initargs)
+        ) as pool,
+    ):
+        futures = [pool.submit(run_chain, fit, evaluate, chain, warm_start=warm_start) for chain in chains]
+        for future in as_completed(futures):
+            chain_results = future.result()
+            results.extend(chain_results)
+            logger.debug("Finished windows %s", [result.window.index for result in chain_results])
+    return sorted(results, key=lambda result: result.window.index)
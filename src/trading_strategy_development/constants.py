@@ -0,0 +1,10 @@
+"""Market conventions shared by the data, backtest and strategy packages."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Final
+
+TRADING_DAYS_PER_YEAR: Final[int] = 252
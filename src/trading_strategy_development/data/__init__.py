@@ -0,0 +1,85 @@
+"""Data acquisition and processing for the trading strategy development package.
+
+Submodules depend on pandas and numpy, so the names below are imported on first
+access rather than with the package. ``import trading_strategy_development.data``
+stays cheap for code, like the CLI, that may never touch them.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    from trading_strategy_development.data.cache import PriceCache, download_universe_cached
+    from trading_strategy_development.data.constituents import ConstituentsCache
+    from trading_strategy_development.data.features import compute_indicators, engineer_features
+    from trading_strategy_development.data.filters import VixThresholdIndex, filter_high_volatility_days
+    from trading_strategy_development.data.indicator_cache import IndicatorCache
+    from trading_strategy_development.data.panel import OHLCV_FIELDS, PricePanel
+    from trading_strategy_development.data.replay import ReplayProvider
+    from trading_strategy_development.data.retrieval import (
+        DataProvider,
+        YahooFinanceProvider,
+        download_universe,
+        get_sp500_tickers,
+    )
+    from trading_strategy_development.data.synthetic import generate_market, generate_market_panel
+
+# Public name -> submodule defining it
+_EXPORTS: Final[dict[str, str]] = {
+    "OHLCV_FIELDS": "panel",
+    "ConstituentsCache": "constituents",
+    "DataProvider": "retrieval",
+    "IndicatorCache": "indicator_cache",
+    "PriceCache": "cache",
+    "PricePanel": "panel",
+    "ReplayProvider": "replay",
+    "VixThresholdIndex": "filters",
+    "YahooFinanceProvider": "retrieval",
+    "compute_indicators": "features",
+    "download_universe": "retrieval",
+    "download_universe_cached": "cache",
+    "engineer_features": "features",
+    "filter_high_volatility_days": "filters",
+    "generate_market": "synthetic",
+    "generate_market_panel": "synthetic",
+    "get_sp500_tickers": "retrieval",
+}
+
+__all__ = [
+    "OHLCV_FIELDS",
+    "ConstituentsCache",
+    "DataProvider",
+    "IndicatorCache",
+    "PriceCache",
+    "PricePanel",
+    "ReplayProvider",
+    "VixThresholdIndex",
+    "YahooFinanceProvider",
+    "compute_indicators",
+    "download_universe",
+    "download_universe_cached",
+    "engineer_features",
+    "filter_high_volatility_days",
+    "generate_market",
+    "generate_market_panel",
+    "get_sp500_tickers",
+]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the submodule defining ``name`` on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the module's attributes including the lazily imported names."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,276 @@
+"""Incremental on-disk Parquet cache for downloaded price history."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from trading_strategy_development.data.retrieval import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+    VIX_TICKER,
+    DataProvider,
+    download_universe,
+)
+from trading_strategy_development.utils.custom_logging import get_logger, get_project_root
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR: Final[Path] = get_project_root() / "cache" / "prices"
+MANIFEST_NAME: Final[str] = "manifest.json"
+
+# Half-open [start, end) date range
+DateRange = tuple[pd.Timestamp, pd.Timestamp]
+
+
+def _merge_ranges(ranges: Sequence[DateRange]) -> list[DateRange]:
+    """Merge overlapping or touching date ranges.
+
+    Args:
+        ranges: Half-open date ranges in any order.
+
+    Returns:
+        Sorted, non-overlapping date ranges.
+    """
+    merged: list[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_ranges(wanted: DateRange, covered: Sequence[DateRange]) -> list[DateRange]:
+    """Return the parts of ``wanted`` that are not in ``covered``.
+
+    Args:
+        wanted: Half-open date range being requested.
+        covered: Sorted, non-overlapping date ranges already stored.
+
+    Returns:
+        Sorted list of missing date ranges.
+    """
+    start, end = wanted
+    gaps: list[DateRange] = []
+    for cov_start, cov_end in covered:
+        if cov_end <= start or cov_start >= end:
+            continue
+        if cov_start > start:
+            gaps.append((start, cov_start))
+        start = max(start, cov_end)
+    if start < end:
+        gaps.append((start, end))
+    return gaps
+
+
+class PriceCache:
+    """Per-ticker price history stored as Parquet files partitioned by interval, ticker and year.
+
+    A JSON manifest records which date ranges have been requested for each
+    ``(ticker, interval)`` pair, so that ranges without any bars (weekends,
+    holidays) are not re-requested on every run.
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.cache_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._manifest: dict[str, dict[str, list[list[str]]]] = self._read_manifest()
+
+    def _read_manifest(self) -> dict[str, dict[str, list[list[str]]]]:
+        if not self._manifest_path.exists():
+            return {}
+        try:
+            manifest: dict[str, dict[str, list[list[str]]]] = json.loads(self._manifest_path.read_text("utf-8"))
+            return manifest
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Ignoring unreadable cache manifest at %s", self._manifest_path)
+            return {}
+
+    def _write_manifest(self) -> None:
+        tmp_path = self._manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._manifest, indent=1, sort_keys=True), "utf-8")
+        os.replace(tmp_path, self._manifest_path)
+
+    def _ticker_dir(self, ticker: str, interval: str) -> Path:
+        return self.cache_dir / f"interval={interval}" / f"ticker={ticker}"
+
+    def covered_ranges(self, ticker: str, interval: str) -> list[DateRange]:
+        """Get the date ranges already stored for a ticker.
+
+        Args:
+            ticker: Ticker symbol.
+            interval: Bar interval.
+
+        Returns:
+            Sorted, non-overlapping half-open date ranges.
+        """
+        entries = self._manifest.get(interval, {}).get(ticker, [])
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in entries]
+
+    def missing_ranges(self, ticker: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> list[DateRange]:
+        """Get the parts of ``[start, end)`` that are not yet stored for a ticker.
+
+        Args:
+            ticker: Ticker symbol.
+            interval: Bar interval.
+            start: Inclusive start date.
+            end: Exclusive end date.
+
+        Returns:
+            Sorted list of missing date ranges.
+        """
+        return _subtract_ranges((start, end), self.covered_ranges(ticker, interval))
+
+    def store(self, ticker: str, interval: str, data: pd.DataFrame, covered: DateRange | None = None) -> None:
+        """Merge bars for a ticker into the cache.
+
+        Args:
+            ticker: Ticker symbol.
+            interval: Bar interval.
+            data: Date-indexed DataFrame with one column per price field.
+            covered: Date range that ``data`` is complete for, recorded in the manifest.
+        """
+        ticker_dir = self._ticker_dir(ticker, interval)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+
+        for year, rows in data.groupby(data.index.year):
+            path = ticker_dir / f"year={year}.parquet"
+            merged = rows
+            if path.exists():
+                merged = pd.concat([pd.read_parquet(path), rows])
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            tmp_path = path.with_suffix(".tmp")
+            merged.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+
+        if covered is not None:
+            self.mark_covered([ticker], interval, covered)
+
+    def mark_covered(self, tickers: Sequence[str], interval: str, covered: DateRange) -> None:
+        """Record a date range as requested for tickers, whether or not it had any bars.
+
+        Args:
+            tickers: Ticker symbols.
+            interval: Bar interval.
+            covered: Date range that the stored bars of every ticker are complete for.
+        """
+        with self._lock:
+            entries = self._manifest.setdefault(interval, {})
+            for ticker in tickers:
+                ranges = _merge_ranges([*self.covered_ranges(ticker, interval), covered])
+                entries[ticker] = [[start.date().isoformat(), end.date().isoformat()] for start, end in ranges]
+            self._write_manifest()
+
+    def load(self, ticker: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Load the stored bars for a ticker within ``[start, end)``.
+
+        Args:
+            ticker: Ticker symbol.
+            interval: Bar interval.
+            start: Inclusive start date.
+            end: Exclusive end date.
+
+        Returns:
+            Date-indexed DataFrame with one column per price field (empty if nothing is stored).
+        """
+        ticker_dir = self._ticker_dir(ticker, interval)
+        paths = [ticker_dir / f"year={year}.parquet" for year in range(start.year, end.year + 1)]
+        frames = [pd.read_parquet(path) for path in paths if path.exists()]
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames).sort_index()
+        return data[(data.index >= start) & (data.index < end)]
+
+
+def download_universe_cached(
+    tickers: Sequence[str],
+    *,
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp | None = None,
+    interval: str = "1d",
+    include_vix: bool = True,
+    cache: PriceCache | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    provider: DataProvider | None = None,
+) -> pd.DataFrame:
+    """Download OHLCV data through the on-disk cache, fetching only missing date ranges.
+
+    Tickers that share the same missing range are downloaded together, so a
+    daily refresh of the whole universe becomes one small batched download.
+    Today's bar is never marked as covered since it may still be incomplete.
+
+    Args:
+        tickers: Ticker symbols to load.
+        start: Inclusive start date.
+        end: Exclusive end date. Defaults to tomorrow, i.e. up to and including today.
+        interval: Bar interval.
+        include_vix: Whether to append ``^VIX`` to the universe.
+        cache: Cache to use. Defaults to a cache in the project's ``cache/prices`` directory.
+        batch_size: Maximum number of tickers per request.
+        max_workers: Maximum number of concurrent requests.
+        provider: Source of the data. Defaults to Yahoo Finance.
+
+    Returns:
+        DataFrame indexed by date with ``(Price, Ticker)`` MultiIndex columns.
+    """
+    cache = cache or PriceCache()
+    today = pd.Timestamp.today().normalize()
+    start_ts = pd.Timestamp(start).normalize()
+    end_ts = pd.Timestamp(end).normalize() if end is not None else today + pd.Timedelta(days=1)
+
+    universe = list(dict.fromkeys(tickers))
+    if include_vix and VIX_TICKER not in universe:
+        universe.append(VIX_TICKER)
+
+    gaps: defaultdict[DateRange, list[str]] = defaultdict(list)
+    for ticker in universe:
+        for gap in cache.missing_ranges(ticker, interval, start_ts, end_ts):
+            gaps[gap].append(ticker)
+
+    if gaps:
+        logger.info("Fetching %d missing date ranges for %d tickers", len(gaps), len(universe))
+    for (gap_start, gap_end), gap_tickers in gaps.items():
+        try:
+            data = download_universe(
+                gap_tickers,
+                start=gap_start.date().isoformat(),
+                end=gap_end.date().isoformat(),
+                interval=interval,
+                include_vix=False,
+                batch_size=batch_size,
+                max_workers=max_workers,
+                provider=provider,
+            )
+        except RuntimeError:
+            logger.warning("No data for %s to %s, will retry on next run", gap_start.date(), gap_end.date())
+            continue
+
+        for ticker in data.columns.unique("Ticker"):
+            cache.store(ticker, interval, data.xs(ticker, axis="columns", level="Ticker").dropna(how="all"))
+        # Tickers without bars in the gap (weekends, holidays, not yet listed) are covered too, unless their
+        # batch failed
+        covered = (gap_start, min(gap_end, today))
+        if covered[0] < covered[1]:
+            failed = set(data.attrs.get("failed", ()))
+            cache.mark_covered([ticker for ticker in gap_tickers if ticker not in failed], interval, covered)
+
+    frames = {ticker: cache.load(ticker, interval, start_ts, end_ts) for ticker in universe}
+    frames = {ticker: frame for ticker, frame in frames.items() if not frame.empty}
+    if not frames:
+        return pd.DataFrame()
+    data = pd.concat(frames, axis="columns", names=["Ticker", "Price"]).swaplevel(axis="columns")
+    return data.sort_index().sort_index(axis="columns")
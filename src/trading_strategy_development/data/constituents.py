@@ -0,0 +1,190 @@
+"""Persistent, point-in-time cache of index constituents."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from trading_strategy_development.utils.custom_logging import get_logger, get_project_root
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+DEFAULT_CONSTITUENTS_DIR: Final[Path] = get_project_root() / "cache" / "constituents"
+DEFAULT_TTL: Final[timedelta] = timedelta(days=1)
+DEFAULT_RETRY_INTERVAL: Final[timedelta] = timedelta(minutes=15)
+INDEX_NAME: Final[str] = "index.json"
+
+# Returns the current constituents and a table of historical changes with
+# ``date``, ``added`` and ``removed`` columns (one ticker per row, NaN if none).
+ConstituentsFetcher = Callable[[], tuple[list[str], pd.DataFrame]]
+
+
+def reconstruct_snapshots(current: list[str], changes: pd.DataFrame, as_of: date) -> dict[date, list[str]]:
+    """Rebuild historical membership by undoing index changes backwards from today.
+
+    Args:
+        current: Constituents as of ``as_of``.
+        changes: Table of changes with ``date``, ``added`` and ``removed`` columns.
+        as_of: Date at which ``current`` was observed.
+
+    Returns:
+        Mapping of effective date to the sorted constituents from that date until the next key.
+    """
+    members = set(current)
+    snapshots: dict[date, list[str]] = {as_of: sorted(members)}
+
+    changes = changes.dropna(subset=["date"])
+    for change_date, rows in sorted(changes.groupby("date"), key=lambda item: item[0], reverse=True):
+        effective = pd.Timestamp(change_date).date()
+        if effective > as_of:
+            continue
+        snapshots[effective] = sorted(members)
+        members -= set(rows["added"].dropna())
+        members |= set(rows["removed"].dropna())
+
+    return snapshots
+
+
+class ConstituentsCache:
+    """Constituent lists persisted as dated snapshots with a time-to-live on the latest fetch.
+
+    The snapshots are held in memory as a sorted date index, so point-in-time
+    lookups are a binary search. The on-disk index is shared by all processes
+    using the same cache directory, so only one of them needs to refresh it.
+    After a failed refresh the stale snapshots are served without fetching
+    again until ``retry_interval`` has passed.
+    """
+
+    def __init__(
+        self,
+        fetch: ConstituentsFetcher,
+        cache_dir: str | Path = DEFAULT_CONSTITUENTS_DIR,
+        ttl: timedelta = DEFAULT_TTL,
+        retry_interval: timedelta = DEFAULT_RETRY_INTERVAL,
+    ) -> None:
+        self.fetch = fetch
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._index_path = self.cache_dir / INDEX_NAME
+        self._lock = threading.Lock()
+        self._fetched_at: datetime | None = None
+        self._failed_at: datetime | None = None
+        self._dates: list[date] = []
+        self._members: list[tuple[str, ...]] = []
+        self._load()
+
+    def _load(self) -> None:
+        if not self._index_path.exists():
+            return
+        try:
+            index = json.loads(self._index_path.read_text("utf-8"))
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Ignoring unreadable constituents index at %s", self._index_path)
+            return
+        self._set_snapshots(
+            datetime.fromisoformat(index["fetched_at"]),
+            {date.fromisoformat(day): tickers for day, tickers in index["snapshots"].items()},
+        )
+
+    def _set_snapshots(self, fetched_at: datetime, snapshots: dict[date, list[str]]) -> None:
+        ordered = sorted(snapshots.items())
+        self._fetched_at = fetched_at
+        self._dates = [day for day, _ in ordered]
+        self._members = [tuple(tickers) for _, tickers in ordered]
+
+    def _save(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index = {
+            "fetched_at": self._fetched_at.isoformat() if self._fetched_at else None,
+            "snapshots": {
+                day.isoformat(): list(members) for day, members in zip(self._dates, self._members, strict=True)
+            },
+        }
+        tmp_path = self._index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index), "utf-8")
+        os.replace(tmp_path, self._index_path)
+
+    def is_stale(self) -> bool:
+        """Check whether the latest fetch is older than the TTL.
+
+        Returns:
+            True if the cache is empty or expired.
+        """
+        return self._fetched_at is None or datetime.now() - self._fetched_at >= self.ttl
+
+    def refresh(self, force: bool = False) -> None:
+        """Fetch the constituents if the cache is stale, keeping earlier snapshots.
+
+        If the fetch fails and older snapshots exist, they continue to be served,
+        and no new fetch is attempted until ``retry_interval`` has passed.
+
+        Args:
+            force: Fetch even if the cache is still fresh.
+
+        Raises:
+            ValueError: If the fetch fails and there is nothing cached to fall back on.
+        """
+        with self._lock:
+            now = datetime.now()
+            if not force and not self.is_stale():
+                return
+            if not force and self._failed_at is not None and now - self._failed_at < self.retry_interval:
+                return
+            # Another process may have refreshed the shared index in the meantime
+            self._load()
+            if not force and not self.is_stale():
+                return
+
+            try:
+                current, changes = self.fetch()
+            except Exception as e:
+                if not self._dates:
+                    raise ValueError("Could not retrieve constituents and no cached copy exists.") from e
+                logger.warning(
+                    "Constituents refresh failed, serving snapshot from %s until %s",
+                    self._fetched_at,
+                    now + self.retry_interval,
+                )
+                self._failed_at = now
+                return
+
+            self._failed_at = None
+            snapshots = dict(zip(self._dates, (list(members) for members in self._members), strict=True))
+            snapshots.update(reconstruct_snapshots(current, changes, now.date()))
+            self._set_snapshots(now, snapshots)
+            self._save()
+            logger.info("Cached %d constituents and %d dated snapshots", len(current), len(self._dates))
+
+    def members(self, as_of: date | str | None = None) -> list[str]:
+        """Get the constituents as of a date.
+
+        Args:
+            as_of: Date of interest. Defaults to the latest snapshot.
+
+        Returns:
+            Sorted list of ticker symbols.
+
+        Raises:
+            ValueError: If no snapshot exists on or before ``as_of``.
+        """
+        self.refresh()
+        if as_of is None:
+            return list(self._members[-1])
+
+        day = pd.Timestamp(as_of).date()
+        position = bisect_right(self._dates, day) - 1
+        if position < 0:
+            raise ValueError(f"No constituents snapshot on or before {day}.")
+        return list(self._members[position])
@@ -0,0 +1,288 @@
+"""Vectorised technical indicators computed for every ticker at once.
+
+Every kernel takes a 2-D ``(n_tickers, n_dates)`` array (as returned by
+``PricePanel.field``) and works along the date axis with cumulative sums or
+sliding-window views, so there is no per-ticker Python loop. Kernels
+accumulate in float64 and leave NaN wherever a window is incomplete or
+contains a missing bar.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from trading_strategy_development.data.indicator_cache import IndicatorCache
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.data.retrieval import VIX_TICKER
+from trading_strategy_development.utils.custom_logging import get_logger, span
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+FloatArray = npt.NDArray[np.floating]
+
+DEFAULT_SMA_WINDOWS: Final[tuple[int, ...]] = (5, 10, 20, 50)
+DEFAULT_RSI_WINDOW: Final[int] = 14
+DEFAULT_VOLATILITY_WINDOW: Final[int] = 20
+TARGET_COLUMN: Final[str] = "next_day_return"
+# Dates that the target looks ahead: a row's target is computed from the next date's close
+TARGET_HORIZON: Final[int] = 1
+
+
+def _rolling_sums(values: FloatArray, window: int) -> tuple[FloatArray, npt.NDArray[np.int64]]:
+    """Sum and count the valid values in each trailing window along the last axis.
+
+    Args:
+        values: Array of shape ``(..., n_dates)``.
+        window: Window length.
+
+    Returns:
+        Window sums and counts of shape ``(..., n_dates - window + 1)``.
+    """
+    valid = ~np.isnan(values)
+    padding = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    sums = np.pad(np.cumsum(np.where(valid, values, 0.0), axis=-1, dtype=np.float64), padding)
+    counts = np.pad(np.cumsum(valid, axis=-1, dtype=np.int64), padding)
+    return sums[..., window:] - sums[..., :-window], counts[..., window:] - counts[..., :-window]
+
+
+def _align(windowed: FloatArray, n_dates: int) -> FloatArray:
+    """Left-pad a trailing-window result with NaN so it lines up with the input dates."""
+    out = np.full((*windowed.shape[:-1], n_dates), np.nan, dtype=np.float64)
+    out[..., n_dates - windowed.shape[-1] :] = windowed
+    return out
+
+
+def sma(values: FloatArray, window: int) -> FloatArray:
+    """Simple moving average.
+
+    Args:
+        values: Array of shape ``(n_tickers, n_dates)``.
+        window: Window length.
+
+    Returns:
+        Array of the same shape.
+    """
+    if window > values.shape[-1]:
+        return np.full(values.shape, np.nan)
+    sums, counts = _rolling_sums(values, window)
+    return _align(np.where(counts == window, sums / window, np.nan), values.shape[-1])
+
+
+def rolling_std(values: FloatArray, window: int) -> FloatArray:
+    """Rolling sample standard deviation (``ddof=1``).
+
+    Args:
+        values: Array of shape ``(n_tickers, n_dates)``.
+        window: Window length.
+
+    Returns:
+        Array of the same shape.
+    """
+    if window > values.shape[-1]:
+        return np.full(values.shape, np.nan)
+    # Centre each row first so the sum of squares does not cancel catastrophically
+    centred = values - np.nanmean(values, axis=-1, keepdims=True)
+    sums, counts = _rolling_sums(centred, window)
+    squares, _ = _rolling_sums(centred * centred, window)
+    variance = np.maximum((squares - sums * sums / window) / (window - 1), 0.0)
+    return _align(np.where(counts == window, np.sqrt(variance), np.nan), values.shape[-1])
+
+
+def rolling_max(values: FloatArray, window: int) -> FloatArray:
+    """Rolling maximum.
+
+    Args:
+        values: Array of shape ``(n_tickers, n_dates)``.
+        window: Window length.
+
+    Returns:
+        Array of the same shape.
+    """
+    if window > values.shape[-1]:
+        return np.full(values.shape, np.nan)
+    return _align(sliding_window_view(values, window, axis=-1).max(axis=-1), values.shape[-1])
+
+
+def rolling_min(values: FloatArray, window: int) -> FloatArray:
+    """Rolling minimum.
+
+    Args:
+        values: Array of shape ``(n_tickers, n_dates)``.
+        window: Window length.
+
+    Returns:
+        Array of the same shape.
+    """
+    if window > values.shape[-1]:
+        return np.full(values.shape, np.nan)
+    return _align(sliding_window_view(values, window, axis=-1).min(axis=-1), values.shape[-1])
+
+
+def pct_change(values: FloatArray, periods: int = 1) -> FloatArray:
+    """Percentage change over ``periods`` dates.
+
+    Args:
+        values: Array of shape ``(n_tickers, n_dates)``.
+        periods: Number of dates to look back.
+
+    Returns:
+        Array of the same shape.
+    """
+    out = np.full(values.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[..., periods:] = values[..., periods:] / values[..., :-periods] - 1.0
+    return out
+
+
+def rsi(values: FloatArray, window: int = DEFAULT_RSI_WINDOW) -> FloatArray:
+    """Relative strength index with Wilder's smoothing.
+
+    Gains and losses are smoothed with an exponential average of
+    ``alpha = 1 / window`` seeded with the first change, matching
+    ``ewm(alpha=1 / window, adjust=False)``. The recursion runs over dates
+    with every ticker updated in one vector operation.
+
+    Args:
+        values: Array of shape ``(n_tickers, n_dates)``.
+        window: Smoothing window.
+
+    Returns:
+        Array of the same shape with values between 0 and 100.
+    """
+    delta = np.diff(values, axis=-1)
+    gains = np.clip(delta, 0.0, None)
+    losses = np.clip(-delta, 0.0, None)
+    alpha = 1.0 / window
+
+    avg_gain = np.zeros(values.shape[:-1])
+    avg_loss = np.zeros(values.shape[:-1])
+    seen = np.zeros(values.shape[:-1], dtype=np.int64)
+    out = np.full(values.shape, np.nan)
+    for t in range(delta.shape[-1]):
+        gain, loss = gains[..., t], losses[..., t]
+        valid = ~np.isnan(gain)
+        first = valid & (seen == 0)
+        avg_gain = np.where(first, gain, np.where(valid, avg_gain + alpha * (gain - avg_gain), avg_gain))
+        avg_loss = np.where(first, loss, np.where(valid, avg_loss + alpha * (loss - avg_loss), avg_loss))
+        seen += valid
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[..., t + 1] = np.where(seen >= window, 100.0 * avg_gain / (avg_gain + avg_loss), np.nan)
+    return out
+
+
+def _apply(
+    cache: IndicatorCache | None, func: Callable[..., FloatArray], values: FloatArray, **params: int
+) -> FloatArray:
+    """Run an indicator kernel, through ``cache`` if one is given."""
+    if cache is None:
+        return func(values, **params)
+    return cache.get_or_compute(func.__name__, func, values, **params)
+
+
+def compute_indicators(
+    panel: PricePanel,
+    sma_windows: Sequence[int] = DEFAULT_SMA_WINDOWS,
+    rsi_window: int = DEFAULT_RSI_WINDOW,
+    volatility_window: int = DEFAULT_VOLATILITY_WINDOW,
+    cache: IndicatorCache | None = None,
+) -> dict[str, npt.NDArray[np.float32]]:
+    """Compute every indicator for all tickers in a panel.
+
+    Args:
+        panel: Price panel.
+        sma_windows: Windows of the simple moving averages.
+        rsi_window: RSI smoothing window.
+        volatility_window: Window of the rolling volatility of daily returns.
+        cache: Indicator cache shared between callers, so indicators already computed on the
+            same prices with the same parameters are reused.
+
+    Returns:
+        Mapping of feature name to a float32 array of shape ``(n_tickers, n_dates)``.
+    """
+    close = np.asarray(panel.field("Close"), dtype=np.float64)
+    returns = _apply(cache, pct_change, close, periods=1)
+
+    features: dict[str, FloatArray] = {
+        "return_1d": returns,
+        "return_5d": _apply(cache, pct_change, close, periods=5),
+        f"rsi_{rsi_window}": _apply(cache, rsi, close, window=rsi_window),
+        f"volatility_{volatility_window}": _apply(cache, rolling_std, returns, window=volatility_window),
+    }
+    for window in sma_windows:
+        average = _apply(cache, sma, close, window=window)
+        features[f"sma_{window}"] = average
+        with np.errstate(divide="ignore", invalid="ignore"):
+            features[f"close_to_sma_{window}"] = close / average - 1.0
+    if "Volume" in panel.fields:
+        volume = np.asarray(panel.field("Volume"), dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            features[f"volume_ratio_{volatility_window}"] = volume / _apply(
+                cache, sma, volume, window=volatility_window
+            )
+
+    next_day = np.full(close.shape, np.nan)
+    next_day[:, :-TARGET_HORIZON] = returns[:, TARGET_HORIZON:]
+    features[TARGET_COLUMN] = next_day
+
+    return {name: values.astype(np.float32) for name, values in features.items()}
+
+
+@span("features", logger)
+def engineer_features(
+    stock_data: pd.DataFrame | PricePanel,
+    sma_windows: Sequence[int] = DEFAULT_SMA_WINDOWS,
+    rsi_window: int = DEFAULT_RSI_WINDOW,
+    volatility_window: int = DEFAULT_VOLATILITY_WINDOW,
+    *,
+    dates: pd.DatetimeIndex | None = None,
+    cache: IndicatorCache | None = None,
+) -> pd.DataFrame:
+    """Engineer technical features for every ticker.
+
+    Indicators are computed on the full history and then restricted to
+    ``dates``, so windows are not broken by gaps when only high-volatility
+    days are of interest. The VIX close is added as a feature instead of
+    being treated as a ticker.
+
+    Args:
+        stock_data: Wide DataFrame with ``(Price, Ticker)`` columns, or a PricePanel.
+        sma_windows: Windows of the simple moving averages.
+        rsi_window: RSI smoothing window.
+        volatility_window: Window of the rolling volatility of daily returns.
+        dates: Dates to keep, e.g. the index of ``filter_high_volatility_days``. Defaults to all.
+        cache: Indicator cache shared between callers.
+
+    Returns:
+        Float32 DataFrame indexed by ``(Date, Ticker)`` with one column per feature and the
+        ``next_day_return`` target.
+    """
+    panel = stock_data if isinstance(stock_data, PricePanel) else PricePanel.from_frame(stock_data)
+    vix: FloatArray | None = None
+    if VIX_TICKER in panel.tickers:
+        vix = panel.field("Close")[panel.tickers.get_loc(VIX_TICKER)]
+        panel = panel.select([t for t in panel.tickers if t != VIX_TICKER])
+
+    features = compute_indicators(panel, sma_windows, rsi_window, volatility_window, cache)
+    close = np.asarray(panel.field("Close"), dtype=np.float32)
+
+    keep = np.arange(len(panel.dates)) if dates is None else panel.dates.get_indexer(dates)
+    keep = keep[keep >= 0]
+    columns = {"close": close[:, keep].T.ravel()}
+    columns.update({name: values[:, keep].T.ravel() for name, values in features.items()})
+    if vix is not None:
+        columns["vix"] = np.repeat(np.asarray(vix, dtype=np.float32)[keep], len(panel.tickers))
+
+    index = pd.MultiIndex.from_product([panel.dates[keep], panel.tickers], names=["Date", "Ticker"])
+    frame = pd.DataFrame(columns, index=index)
+    frame = frame[~np.isnan(columns["close"])]
+    logger.info("Engineered %d features for %d rows", len(frame.columns), len(frame))
+    return frame
@@ -0,0 +1,151 @@
+"""Filters selecting high-volatility trading days."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import overload
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.data.retrieval import VIX_TICKER
+from trading_strategy_development.utils.custom_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class VixThresholdIndex:
+    """VIX closes sorted once so any threshold query is a binary search.
+
+    ``mask(threshold)`` finds where the threshold falls in the sorted values
+    and marks the dates of every value above it, so sweeping many thresholds
+    over the same data costs one sort plus a search per threshold.
+    """
+
+    def __init__(self, vix: pd.Series) -> None:
+        self.dates = pd.DatetimeIndex(vix.index)
+        values = vix.to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.argsort(values[valid], kind="stable")]
+        self._sorted_values = values[order]
+        self._order = order
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame | PricePanel, vix_ticker: str = VIX_TICKER) -> VixThresholdIndex:
+        """Build the index from the VIX close series in a dataset.
+
+        Args:
+            data: Wide DataFrame with ``(Price, Ticker)`` columns, or a PricePanel.
+            vix_ticker: Ticker of the volatility index.
+
+        Returns:
+            New VixThresholdIndex aligned with the dataset's dates.
+        """
+        if isinstance(data, PricePanel):
+            position = data.tickers.get_loc(vix_ticker)
+            return cls(pd.Series(data.field("Close")[position], index=data.dates))
+        return cls(data[("Close", vix_ticker)])
+
+    def count_above(self, threshold: float) -> int:
+        """Count the days on which the VIX closed above ``threshold``.
+
+        Args:
+            threshold: VIX level.
+
+        Returns:
+            Number of days.
+        """
+        return len(self._sorted_values) - int(np.searchsorted(self._sorted_values, threshold, side="right"))
+
+    def positions_above(self, threshold: float) -> npt.NDArray[np.intp]:
+        """Get the positions of the days on which the VIX closed above ``threshold``.
+
+        Args:
+            threshold: VIX level.
+
+        Returns:
+            Sorted integer positions into ``dates``.
+        """
+        start = np.searchsorted(self._sorted_values, threshold, side="right")
+        return np.sort(self._order[start:])
+
+    def mask(self, threshold: float) -> npt.NDArray[np.bool_]:
+        """Get a boolean mask of the days on which the VIX closed above ``threshold``.
+
+        Args:
+            threshold: VIX level.
+
+        Returns:
+            Boolean array aligned with ``dates``.
+        """
+        mask = np.zeros(len(self.dates), dtype=bool)
+        mask[self._order[np.searchsorted(self._sorted_values, threshold, side="right") :]] = True
+        return mask
+
+    def masks(self, thresholds: Sequence[float]) -> npt.NDArray[np.bool_]:
+        """Get masks for several thresholds at once.
+
+        Args:
+            thresholds: VIX levels.
+
+        Returns:
+            Boolean array of shape ``(len(thresholds), len(dates))``.
+        """
+        # Rank of each day's VIX in sorted order; days without a VIX value rank -1 and never pass
+        ranks = np.full(len(self.dates), -1, dtype=np.intp)
+        ranks[self._order] = np.arange(len(self._order))
+        starts = np.searchsorted(self._sorted_values, np.asarray(thresholds, dtype=np.float64), side="right")
+        return ranks >= starts[:, None]
+
+
+@overload
+def filter_high_volatility_days(
+    stock_data: pd.DataFrame, vix_threshold: float = ..., vix_index: VixThresholdIndex | None = ...
+) -> pd.DataFrame: ...
+
+
+@overload
+def filter_high_volatility_days(
+    stock_data: PricePanel, vix_threshold: float = ..., vix_index: VixThresholdIndex | None = ...
+) -> PricePanel: ...
+
+
+def filter_high_volatility_days(
+    stock_data: pd.DataFrame | PricePanel,
+    vix_threshold: float = 20.0,
+    vix_index: VixThresholdIndex | None = None,
+) -> pd.DataFrame | PricePanel:
+    """Keep only the days on which the VIX closed above a threshold.
+
+    The selection is a single take along the date axis for every ticker at
+    once. Pass a prebuilt ``vix_index`` to reuse the sorted VIX across
+    several thresholds.
+
+    Args:
+        stock_data: Wide DataFrame with ``(Price, Ticker)`` columns including ``^VIX``, or a PricePanel.
+        vix_threshold: VIX level that a day's close must exceed.
+        vix_index: Index built from the same data with ``VixThresholdIndex.from_data``.
+
+    Returns:
+        Data of the same type restricted to high-volatility days.
+
+    Raises:
+        ValueError: If ``vix_index`` was built from data with different dates.
+    """
+    vix_index = vix_index or VixThresholdIndex.from_data(stock_data)
+    dates = stock_data.dates if isinstance(stock_data, PricePanel) else stock_data.index
+    if not vix_index.dates.equals(dates):
+        raise ValueError("vix_index dates do not match stock_data.")
+    positions = vix_index.positions_above(vix_threshold)
+    logger.debug(
+        "Found %d of %d days with VIX above %s",
+        len(positions),
+        len(vix_index.dates),
+        vix_threshold,
+    )
+
+    if isinstance(stock_data, PricePanel):
+        return stock_data.take_dates(positions)
+    return stock_data.iloc[positions]
@@ -0,0 +1,172 @@
+"""Memoization of indicator results keyed by indicator, parameters and input content."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+from trading_strategy_development.utils.custom_logging import get_logger
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BYTES: Final[int] = 512 * 1024 * 1024
+
+Array = npt.NDArray[np.generic]
+CacheKey = tuple[str, tuple[tuple[str, object], ...], str]
+
+
+def fingerprint(values: Array) -> str:
+    """Hash the content, shape and dtype of an array.
+
+    Args:
+        values: Array to hash.
+
+    Returns:
+        Hex digest identifying the array's content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(np.ascontiguousarray(values).data)
+    return digest.hexdigest()
+
+
+def _is_frozen(values: Array) -> bool:
+    """Check that an array's data cannot change: it and the array owning its memory are read-only."""
+    root = values
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+    return not values.flags.writeable and root.flags.owndata and not root.flags.writeable
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how an IndicatorCache has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    spill_hits: int = 0
+    evictions: int = 0
+
+
+class IndicatorCache:
+    """LRU cache of indicator arrays bounded by total size in bytes.
+
+    Results are keyed by indicator name, parameters and a content hash of the
+    input, so two strategies asking for ``sma(close, 20)`` on the same prices
+    share one computation even if they hold different array objects. Cached
+    arrays are returned read-only. When the byte budget is exceeded the least
+    recently used results are evicted, and written to ``spill_dir`` first if
+    one is configured so that they can be reloaded instead of recomputed.
+
+    Hashing a large input is not free, so the fingerprint of an array whose
+    data cannot change (a read-only array, or view of one, that owns its
+    memory, such as a result from this cache) is remembered for as long as
+    the array is alive. Other arrays, including memory maps, whose file may
+    be rewritten through another mapping, are hashed on every call.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, spill_dir: str | Path | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, Array] = OrderedDict()
+        self._size = 0
+        self._fingerprints: dict[int, tuple[weakref.ref[Array], str]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the results held in memory."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Number of results held in memory."""
+        return len(self._entries)
+
+    def _fingerprint(self, values: Array) -> str:
+        if not _is_frozen(values):
+            return fingerprint(values)
+        key = id(values)
+        with self._lock:
+            entry = self._fingerprints.get(key)
+        # The weak reference tells a live entry apart from a dead array whose id was reused
+        if entry is not None and entry[0]() is values:
+            return entry[1]
+        digest = fingerprint(values)
+        with self._lock:
+            self._fingerprints[key] = (weakref.ref(values), digest)
+        weakref.finalize(values, self._fingerprints.pop, key, None)
+        return digest
+
+    def _spill_path(self, key: CacheKey) -> Path | None:
+        if self.spill_dir is None:
+            return None
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return self.spill_dir / f"{key[0]}-{name}.npy"
+
+    def _insert(self, key: CacheKey, result: Array) -> None:
+        if result.nbytes > self.max_bytes:
+            return
+        self._entries[key] = result
+        self._size += result.nbytes
+        while self._size > self.max_bytes:
+            old_key, old_result = self._entries.popitem(last=False)
+            self._size -= old_result.nbytes
+            self.stats.evictions += 1
+            spill_path = self._spill_path(old_key)
+            if spill_path is not None and not spill_path.exists():
+                spill_path.parent.mkdir(parents=True, exist_ok=True)
+                np.save(spill_path, old_result)
+
+    def get_or_compute(self, name: str, func: Callable[..., Array], values: Array, **params: object) -> Array:
+        """Return the cached result of ``func(values, **params)``, computing it on a miss.
+
+        Args:
+            name: Indicator name, part of the cache key.
+            func: Function computing the indicator.
+            values: Input array.
+            **params: Keyword arguments of ``func``, part of the cache key.
+
+        Returns:
+            Read-only result array.
+        """
+        key: CacheKey = (name, tuple(sorted(params.items())), self._fingerprint(values))
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return result
+
+        spill_path = self._spill_path(key)
+        if spill_path is not None and spill_path.exists():
+            result = np.load(spill_path)
+            with self._lock:
+                self.stats.spill_hits += 1
+        else:
+            result = func(values, **params)
+            with self._lock:
+                self.stats.misses += 1
+
+        result.setflags(write=False)
+        with self._lock:
+            self._insert(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Drop every result held in memory. Spilled results are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
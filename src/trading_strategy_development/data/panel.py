@@ -0,0 +1,228 @@
+"""Dense, memory-mappable price panel indexed by field, ticker and date."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+if TYPE_CHECKING:
+    from typing import Final
+
+OHLCV_FIELDS: Final[tuple[str, ...]] = ("Open", "High", "Low", "Close", "Volume")
+
+VALUES_FILE: Final[str] = "values.npy"
+DATES_FILE: Final[str] = "dates.npy"
+META_FILE: Final[str] = "meta.json"
+
+
+class PricePanel:
+    """OHLCV prices held in one contiguous NumPy block with ticker and date indexes.
+
+    Values are stored field-major with shape ``(n_fields, n_tickers, n_dates)``,
+    so ``panel.field("Close")`` is a contiguous ticker x date matrix that
+    vectorised code can use without copying. Missing bars are NaN.
+
+    A saved panel is a directory holding the block as a ``.npy`` file next to
+    its indexes. ``PricePanel.open`` memory-maps the block, so opening costs
+    the same regardless of size and processes opening the same file share the
+    pages through the OS cache.
+    """
+
+    def __init__(
+        self,
+        values: npt.NDArray[np.floating],
+        tickers: Sequence[str],
+        dates: pd.DatetimeIndex,
+        fields: Sequence[str] = OHLCV_FIELDS,
+    ) -> None:
+        expected = (len(fields), len(tickers), len(dates))
+        if values.shape != expected:
+            raise ValueError(f"values has shape {values.shape}, expected {expected} (fields, tickers, dates).")
+
+        self.values = values
+        self.tickers = pd.Index(tickers, name="Ticker")
+        self.dates = pd.DatetimeIndex(dates, name="Date")
+        self.fields = tuple(fields)
+
+    def __repr__(self) -> str:
+        """Summarize the panel dimensions."""
+        return (
+            f"PricePanel(fields={len(self.fields)}, tickers={len(self.tickers)}, dates={len(self.dates)}, "
+            f"dtype={self.values.dtype})"
+        )
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """Shape of the value block as ``(n_fields, n_tickers, n_dates)``."""
+        n_fields, n_tickers, n_dates = self.values.shape
+        return n_fields, n_tickers, n_dates
+
+    @classmethod
+    def from_frame(
+        cls,
+        data: pd.DataFrame,
+        fields: Sequence[str] = OHLCV_FIELDS,
+        dtype: npt.DTypeLike = np.float64,
+    ) -> PricePanel:
+        """Build a panel from a wide DataFrame with ``(Price, Ticker)`` MultiIndex columns.
+
+        Args:
+            data: Date-indexed DataFrame as returned by the retrieval functions.
+            fields: Price fields to include, in order. Fields missing from ``data`` are filled with NaN.
+            dtype: Floating point dtype of the value block.
+
+        Returns:
+            New PricePanel.
+        """
+        tickers = data.columns.unique("Ticker").sort_values()
+        dates = pd.DatetimeIndex(data.index).sort_values()
+        columns = pd.MultiIndex.from_product([fields, tickers], names=["Price", "Ticker"])
+        aligned = data.reindex(index=dates, columns=columns)
+
+        # (dates, fields * tickers) -> (fields, tickers, dates)
+        block = aligned.to_numpy(dtype=dtype).T.reshape(len(fields), len(tickers), len(dates))
+        return cls(np.ascontiguousarray(block), tickers, dates, fields)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert the panel back to a wide DataFrame with ``(Price, Ticker)`` MultiIndex columns.
+
+        Returns:
+            Date-indexed DataFrame.
+        """
+        columns = pd.MultiIndex.from_product([self.fields, self.tickers], names=["Price", "Ticker"])
+        block = np.asarray(self.values).reshape(len(columns), len(self.dates)).T
+        return pd.DataFrame(block, index=self.dates, columns=columns)
+
+    def field(self, name: str) -> npt.NDArray[np.floating]:
+        """Get one field as a ticker x date matrix without copying.
+
+        Args:
+            name: Field name, e.g. ``"Close"``.
+
+        Returns:
+            View of shape ``(n_tickers, n_dates)``.
+        """
+        return self.values[self.fields.index(name)]
+
+    def ticker(self, symbol: str) -> pd.DataFrame:
+        """Get the history of one ticker.
+
+        Args:
+            symbol: Ticker symbol.
+
+        Returns:
+            Date-indexed DataFrame with one column per field.
+        """
+        position = self.tickers.get_loc(symbol)
+        return pd.DataFrame(self.values[:, position, :].T, index=self.dates, columns=list(self.fields))
+
+    def select(
+        self,
+        tickers: Sequence[str] | None = None,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> PricePanel:
+        """Select a subset of tickers and an inclusive date range.
+
+        A contiguous date range on all tickers is a view of the original block;
+        selecting tickers copies.
+
+        Args:
+            tickers: Tickers to keep, in order. Defaults to all.
+            start: First date to keep.
+            end: Last date to keep.
+
+        Returns:
+            New PricePanel.
+        """
+        date_slice = self.dates.slice_indexer(start, end)
+        values = self.values[:, :, date_slice]
+        ticker_index = self.tickers
+        if tickers is not None:
+            positions = self.tickers.get_indexer(tickers)
+            if (positions < 0).any():
+                missing = [t for t, p in zip(tickers, positions, strict=True) if p < 0]
+                raise KeyError(f"Tickers not in panel: {missing}")
+            values = values[:, positions, :]
+            ticker_index = self.tickers[positions]
+        return PricePanel(values, ticker_index, self.dates[date_slice], self.fields)
+
+    def take_dates(self, positions: npt.ArrayLike) -> PricePanel:
+        """Select dates by integer position for every ticker and field in one take.
+
+        Args:
+            positions: Integer positions into ``dates``.
+
+        Returns:
+            New PricePanel holding a copy of the selected dates.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        return PricePanel(self.values.take(positions, axis=2), self.tickers, self.dates[positions], self.fields)
+
+    def save(self, path: str | Path) -> Path:
+        """Write the panel to a directory.
+
+        Every file is written to a temporary name and moved into place. The
+        metadata goes last and is removed first, so it marks a complete save:
+        an interrupted save leaves a directory that ``open`` rejects rather
+        than a mix of old and new files.
+
+        Args:
+            path: Directory to write to (created if needed).
+
+        Returns:
+            Path to the panel directory.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / META_FILE).unlink(missing_ok=True)
+
+        _save_array(path / VALUES_FILE, np.ascontiguousarray(self.values))
+        _save_array(path / DATES_FILE, self.dates.asi8)
+        meta = {"tickers": self.tickers.tolist(), "fields": list(self.fields), "shape": list(self.values.shape)}
+        tmp_meta = path / f"{META_FILE}.tmp"
+        tmp_meta.write_text(json.dumps(meta), "utf-8")
+        os.replace(tmp_meta, path / META_FILE)
+        return path
+
+    @classmethod
+    def open(cls, path: str | Path, mode: str = "r") -> PricePanel:
+        """Open a saved panel with its value block memory-mapped.
+
+        Args:
+            path: Panel directory written by ``save``.
+            mode: Memory-map mode: ``"r"`` (read-only), ``"r+"`` (read-write) or ``"c"`` (copy-on-write).
+
+        Returns:
+            PricePanel backed by the file.
+
+        Raises:
+            FileNotFoundError: If the directory holds no completed save.
+            ValueError: If the files do not belong to the same save.
+        """
+        path = Path(path)
+        if not (path / META_FILE).exists():
+            raise FileNotFoundError(f"No complete panel at {path}: {META_FILE} is missing; the save may have failed.")
+        meta = json.loads((path / META_FILE).read_text("utf-8"))
+        values = np.load(path / VALUES_FILE, mmap_mode=mode)
+        dates = pd.DatetimeIndex(np.load(path / DATES_FILE).view("datetime64[ns]"))
+        # Panels saved before the shape was recorded are trusted as they are
+        shape = tuple(meta.get("shape", values.shape))
+        if values.shape != shape or len(dates) != shape[-1]:
+            raise ValueError(f"Panel files in {path} do not match: expected shape {shape}, got {values.shape}.")
+        return cls(values, meta["tickers"], dates, meta["fields"])
+
+
+def _save_array(path: Path, array: npt.NDArray) -> None:
+    """Write ``array`` to ``path`` as ``.npy`` by way of a temporary file."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
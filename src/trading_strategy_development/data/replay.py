@@ -0,0 +1,166 @@
+"""Offline data provider that replays recorded prices with simulated latency and failures."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.data.retrieval import VIX_TICKER
+from trading_strategy_development.utils.rate_limit import RateLimiter
+
+
+@dataclass
+class ReplayStats:
+    """Counters describing the requests a ReplayProvider has served."""
+
+    requests: int = 0
+    failures: int = 0
+    tickers: int = 0
+    simulated_latency: float = 0.0
+
+
+def _period_start(end: pd.Timestamp, period: str) -> pd.Timestamp | None:
+    """Convert a yfinance-style period (``"5y"``, ``"6mo"``, ``"10d"``, ``"max"``) to a start date.
+
+    Args:
+        end: Last available date.
+        period: Period string.
+
+    Returns:
+        Start date, or None for ``"max"``.
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1)
+    for suffix, unit in (("mo", "months"), ("y", "years"), ("wk", "weeks"), ("d", "days")):
+        if period.endswith(suffix):
+            return end - pd.DateOffset(**{unit: int(period.removesuffix(suffix))})
+    raise ValueError(f"Unsupported period: {period!r}")
+
+
+class ReplayProvider:
+    """Data provider that serves a recorded price history from memory or disk.
+
+    Each request sleeps for ``latency`` seconds plus ``latency_per_ticker`` for
+    every ticker in the batch, and fails with ``ConnectionError`` with
+    probability ``failure_rate``. The random draws are seeded, so a benchmark
+    of the concurrent download, cache and retry paths sees the same sequence
+    of failures on every run without touching the network.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame | PricePanel,
+        *,
+        constituents: Sequence[str] | None = None,
+        changes: pd.DataFrame | None = None,
+        latency: float = 0.0,
+        latency_per_ticker: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self.data = data.to_frame() if isinstance(data, PricePanel) else data
+        self.constituents = (
+            list(constituents)
+            if constituents is not None
+            else [t for t in self.data.columns.unique("Ticker") if t != VIX_TICKER]
+        )
+        self.changes = changes if changes is not None else pd.DataFrame(columns=["date", "added", "removed"])
+        self.latency = latency
+        self.latency_per_ticker = latency_per_ticker
+        self.failure_rate = failure_rate
+        self.stats = ReplayStats()
+        self._rate_limiter = rate_limiter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_path(cls, path: str | Path, **kwargs: Any) -> ReplayProvider:  # noqa: ANN401
+        """Load a recording from disk.
+
+        Args:
+            path: A PricePanel directory or a Parquet file with ``(Price, Ticker)`` columns.
+            **kwargs: Any other ``ReplayProvider`` option, such as ``latency``, ``failure_rate``, ``seed``,
+                ``rate_limiter``, ``constituents`` or ``changes``.
+
+        Returns:
+            New ReplayProvider.
+        """
+        path = Path(path)
+        data: pd.DataFrame | PricePanel = PricePanel.open(path) if path.is_dir() else pd.read_parquet(path)
+        return cls(data, **kwargs)
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """Limiter simulating the recorded provider's throttling, if any."""
+        return self._rate_limiter
+
+    def get_constituents(self) -> tuple[list[str], pd.DataFrame]:
+        """Get the recorded constituents and change history.
+
+        Returns:
+            Ticker symbols and a table of changes with ``date``, ``added`` and ``removed`` columns.
+        """
+        return list(self.constituents), self.changes.copy()
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        *,
+        period: str | None,
+        start: str | None,
+        end: str | None,
+        interval: str,
+    ) -> pd.DataFrame:
+        """Serve a batch of tickers from the recording.
+
+        Args:
+            tickers: Ticker symbols in the batch.
+            period: Lookback period counted back from the last recorded date, ignored if ``start`` is set.
+            start: Inclusive start date (``YYYY-MM-DD``).
+            end: Exclusive end date (``YYYY-MM-DD``).
+            interval: Bar interval. Only the recorded interval can be served, so this is not used.
+
+        Returns:
+            DataFrame indexed by date with ``(Price, Ticker)`` MultiIndex columns.
+
+        Raises:
+            ConnectionError: When a simulated failure is drawn.
+        """
+        delay = self.latency + self.latency_per_ticker * len(tickers)
+        with self._lock:
+            fail = self._random.random() < self.failure_rate
+            self.stats.requests += 1
+            self.stats.tickers += len(tickers)
+            self.stats.simulated_latency += delay
+            if fail:
+                self.stats.failures += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise ConnectionError(f"Simulated failure for batch starting with {tickers[0]}")
+
+        index = self.data.index
+        first = pd.Timestamp(start) if start is not None else None
+        if first is None and period is not None and len(index):
+            first = _period_start(index.max(), period)
+        rows = np.ones(len(index), dtype=bool)
+        if first is not None:
+            rows &= index >= first
+        if end is not None:
+            rows &= index < pd.Timestamp(end)
+
+        columns = self.data.columns.get_level_values("Ticker").isin(tickers)
+        return self.data.loc[rows, columns]
@@ -2,84 +2,524 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import random
+import threading
 import time
-from collections.abc import Callable
-from functools import wraps
-from typing import Any, TypeVar
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from functools import lru_cache, wraps
+from typing import Any, Protocol, TypeVar, cast
 
 import pandas as pd
 
-from trading_strategy_development.utils.custom_logging import get_logger
+from trading_strategy_development.data.constituents import ConstituentsCache
+from trading_strategy_development.utils.custom_logging import DuplicateFilter, get_logger, get_project_root, span
+from trading_strategy_development.utils.rate_limit import RateLimiter
 
 logger = get_logger(__name__)
+# During a provider outage every batch fails with the same retry warnings; collapse them into periodic summaries
+logger.addFilter(DuplicateFilter(burst=3))
 
 # Type variable for retry decorator
 T = TypeVar("T")
 
+VIX_TICKER = "^VIX"
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_WORKERS = 8
 
-def retry(max_attempts: int = 3, delay: float = 1.0) -> Callable[[Callable[..., T]], Callable[..., T]]:
+# Yahoo Finance does not publish its limits; this stays below the point where it starts throttling
+YAHOO_REQUESTS_PER_SECOND = 1.0
+YAHOO_BURST = 5.0
+
+
+class DataProvider(Protocol):
+    """Source of index constituents and OHLCV bars.
+
+    Implementations must be safe to call from several threads at once, since
+    ``download_universe`` fetches batches concurrently.
+    """
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """Limiter that requests to this provider should respect, if any."""
+        ...
+
+    def get_constituents(self) -> tuple[list[str], pd.DataFrame]:
+        """Get the current index constituents and their change history.
+
+        Returns:
+            Current ticker symbols, and a table of changes with ``date``, ``added`` and ``removed`` columns.
+        """
+        ...
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        *,
+        period: str | None,
+        start: str | None,
+        end: str | None,
+        interval: str,
+    ) -> pd.DataFrame:
+        """Download OHLCV data for a batch of tickers in a single request.
+
+        Args:
+            tickers: Ticker symbols in the batch.
+            period: Lookback period (e.g. ``"5y"``), ignored if ``start`` is set.
+            start: Inclusive start date (``YYYY-MM-DD``).
+            end: Exclusive end date (``YYYY-MM-DD``).
+            interval: Bar interval (e.g. ``"1d"``).
+
+        Returns:
+            DataFrame indexed by date with ``(Price, Ticker)`` MultiIndex columns.
+        """
+        ...
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker shared by all calls to one endpoint.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    are rejected with ``CircuitOpenError`` until ``reset_timeout`` has elapsed.
+    A single trial call is then let through; its outcome closes or re-opens the
+    circuit. A trial that ends in an error unrelated to the endpoint's health
+    releases its slot with ``release_trial`` so the next call can try again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is currently rejecting calls."""
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a trial call already in flight.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError("Circuit breaker is open; call rejected.")
+            self._trial_in_flight = True
+
+    def release_trial(self) -> None:
+        """Free the trial slot of a half-open circuit without recording an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("Opening circuit breaker after %d consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+def _backoff_delay(attempt: int, delay: float, backoff: float, max_delay: float, jitter: float) -> float:
+    """Compute the sleep before the next attempt.
+
+    Args:
+        attempt: Number of attempts made so far (starting at 1).
+        delay: Delay after the first attempt in seconds.
+        backoff: Multiplier applied to the delay after each attempt.
+        max_delay: Upper bound on the delay before jitter.
+        jitter: Fraction of the delay to randomly add or subtract.
+
+    Returns:
+        Delay in seconds.
+    """
+    base = min(max_delay, delay * backoff ** (attempt - 1))
+    return max(0.0, base * (1 + random.uniform(-jitter, jitter)))
+
+
+def retry(
+    max_attempts: int = 3,
+    delay: float = 1.0,
+    *,
+    backoff: float = 2.0,
+    max_delay: float = 60.0,
+    jitter: float = 0.1,
+    exceptions: tuple[type[BaseException], ...] = (Exception,),
+    circuit_breaker: CircuitBreaker | None = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to retry a function on failure.
 
+    Works on both regular and coroutine functions; coroutines wait with
+    ``asyncio.sleep`` so the event loop is never blocked.
+
     Args:
         max_attempts: Maximum number of retry attempts.
-        delay: Delay between attempts in seconds.
+        delay: Delay after the first failed attempt in seconds.
+        backoff: Multiplier applied to the delay after each failed attempt.
+        max_delay: Upper bound on the delay between attempts before jitter.
+        jitter: Fraction of the delay to randomly add or subtract, so concurrent callers do not retry in lock-step.
+        exceptions: Exception types that trigger a retry. Anything else is raised immediately without counting
+            as a failure of the circuit breaker.
+        circuit_breaker: Breaker shared between decorated calls. Calls are rejected while it is open.
 
     Returns:
         Decorated function.
     """
 
+    def on_failure(func: Callable[..., Any], attempts: int, error: BaseException) -> float | None:
+        # Returns the delay before the next attempt, or None when giving up
+        if not isinstance(error, exceptions):
+            # Not a failure of the endpoint, e.g. a bad request or an interrupt: just free a half-open trial slot
+            if circuit_breaker is not None:
+                circuit_breaker.release_trial()
+            return None
+        if circuit_breaker is not None:
+            circuit_breaker.record_failure()
+        logger.warning(
+            "Attempt %d/%d failed for %s: %s",
+            attempts,
+            max_attempts,
+            func.__qualname__,
+            str(error),
+        )
+        if attempts >= max_attempts:
+            logger.error(
+                "All %d attempts failed for %s",
+                max_attempts,
+                func.__qualname__,
+            )
+            return None
+        if circuit_breaker is not None and circuit_breaker.is_open:
+            logger.error("Circuit breaker open, giving up on %s after %d attempts", func.__qualname__, attempts)
+            return None
+        sleep_for = _backoff_delay(attempts, delay, backoff, max_delay, jitter)
+        logger.info("Retrying in %.2f seconds...", sleep_for)
+        return sleep_for
+
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: dict[str, Any], **kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+                attempts = 0
+                while True:
+                    if circuit_breaker is not None:
+                        circuit_breaker.before_call()
+                    try:
+                        result = await func(*args, **kwargs)
+                    except BaseException as e:
+                        attempts += 1
+                        sleep_for = on_failure(func, attempts, e)
+                        if sleep_for is None:
+                            raise
+                        await asyncio.sleep(sleep_for)
+                    else:
+                        if circuit_breaker is not None:
+                            circuit_breaker.record_success()
+                        return result
+
+            return cast(Callable[..., T], async_wrapper)
+
         @wraps(func)
         def wrapper(*args: dict[str, Any], **kwargs: dict[str, Any]) -> T:
             attempts = 0
-            last_exception = None
-
-            while attempts < max_attempts:
+            while True:
+                if circuit_breaker is not None:
+                    circuit_breaker.before_call()
                 try:
-                    return func(*args, **kwargs)
-                except Exception as e:
+                    result = func(*args, **kwargs)
+                except BaseException as e:
                     attempts += 1
-                    last_exception = e
-                    logger.warning(
-                        "Attempt %d/%d failed for %s: %s",
-                        attempts,
-                        max_attempts,
-                        func.__qualname__,
-                        str(e),
-                    )
-
-                    if attempts < max_attempts:
-                        logger.info("Retrying in %d seconds...", delay)
-                        time.sleep(delay)
-                    else:
-                        logger.error(
-                            "All %d attempts failed for %s",
-                            max_attempts,
-                            func.__qualname__,
-                        )
-
-            if last_exception:
-                raise last_exception
-
-            raise RuntimeError("Unexpected error in retry decorator")
+                    sleep_for = on_failure(func, attempts, e)
+                    if sleep_for is None:
+                        raise
+                    time.sleep(sleep_for)
+                else:
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_success()
+                    return result
 
         return wrapper
 
     return decorator
 
 
+SP500_WIKIPEDIA_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+
+
+def _normalize_symbols(symbols: pd.Series) -> pd.Series:
+    """Convert Wikipedia ticker notation (``BRK.B``) to Yahoo Finance notation (``BRK-B``)."""
+    return symbols.str.replace(".", "-", regex=False)
+
+
 @retry(max_attempts=3, delay=2.0)
-def get_sp500_tickers() -> list[str]:
-    """Get a list of S&P 500 tickers using Wikipedia.
+def _scrape_sp500_constituents() -> tuple[list[str], pd.DataFrame]:
+    """Scrape the current S&P 500 constituents and their change history from Wikipedia.
 
     Returns:
-        List of S&P 500 ticker symbols.
+        Current ticker symbols, and a table of changes with ``date``, ``added`` and ``removed`` columns.
     """
     try:
         logger.info("Attempting to get S&P 500 tickers from Wikipedia...")
-        ticker_table = pd.read_html("https://en.wikipedia.org/wiki/List_of_S%26P_500_companies")[0]
-        tickers: list[str] = ticker_table["Symbol"].str.replace(".", "-", regex=False).tolist()
-        return tickers
+        tables = pd.read_html(SP500_WIKIPEDIA_URL)
+        tickers: list[str] = _normalize_symbols(tables[0]["Symbol"]).tolist()
+
+        # The second table lists changes as Date, Added (Ticker, Security), Removed (Ticker, Security), Reason
+        history = tables[1]
+        changes = pd.DataFrame(
+            {
+                "date": pd.to_datetime(history.iloc[:, 0], errors="coerce"),
+                "added": _normalize_symbols(history.iloc[:, 1].astype("string")),
+                "removed": _normalize_symbols(history.iloc[:, 3].astype("string")),
+            }
+        )
+        return tickers, changes
     except Exception as e:
         logger.exception("Failed to get S&P 500 tickers from Wikipedia: ")
         raise ValueError("Could not retreive S&P tickers.") from e
+
+
+@lru_cache(maxsize=1)
+def get_default_constituents_cache() -> ConstituentsCache:
+    """Get the process-wide S&P 500 constituents cache backed by Wikipedia.
+
+    Returns:
+        Shared ConstituentsCache instance.
+    """
+    return ConstituentsCache(_scrape_sp500_constituents)
+
+
+def get_sp500_tickers(as_of: date | str | None = None, *, cache: ConstituentsCache | None = None) -> list[str]:
+    """Get a list of S&P 500 tickers using Wikipedia.
+
+    Results are served from a persistent constituents cache and only scraped
+    again once the cache's TTL has expired.
+
+    Args:
+        as_of: Return the members of the index as of this date. Defaults to the latest list.
+        cache: Constituents cache to use. Defaults to the shared Wikipedia-backed cache.
+
+    Returns:
+        List of S&P 500 ticker symbols.
+    """
+    return (cache or get_default_constituents_cache()).members(as_of)
+
+
+@lru_cache(maxsize=1)
+def get_yahoo_rate_limiter() -> RateLimiter:
+    """Get the rate limiter shared by every process downloading from Yahoo Finance.
+
+    The bucket is stored in the project's cache directory so that concurrent
+    worker processes draw from the same limit.
+
+    Returns:
+        Shared RateLimiter instance.
+    """
+    return RateLimiter(
+        rate=YAHOO_REQUESTS_PER_SECOND,
+        capacity=YAHOO_BURST,
+        state_file=get_project_root() / "cache" / "yahoo_rate_limit.bin",
+    )
+
+
+class YahooFinanceProvider:
+    """Live provider: S&P 500 constituents from Wikipedia and prices from Yahoo Finance."""
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Rate limiter shared by every process downloading from Yahoo Finance."""
+        return get_yahoo_rate_limiter()
+
+    def get_constituents(self) -> tuple[list[str], pd.DataFrame]:
+        """Scrape the current S&P 500 constituents and their change history from Wikipedia.
+
+        Returns:
+            Current ticker symbols, and a table of changes with ``date``, ``added`` and ``removed`` columns.
+        """
+        return _scrape_sp500_constituents()
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        *,
+        period: str | None,
+        start: str | None,
+        end: str | None,
+        interval: str,
+    ) -> pd.DataFrame:
+        """Download a batch of tickers from Yahoo Finance with one ``yf.download`` call.
+
+        Args:
+            tickers: Ticker symbols in the batch.
+            period: Period string understood by yfinance (e.g. ``"5y"``), ignored if ``start`` is set.
+            start: Inclusive start date (``YYYY-MM-DD``).
+            end: Exclusive end date (``YYYY-MM-DD``).
+            interval: Bar interval (e.g. ``"1d"``).
+
+        Returns:
+            DataFrame indexed by date with ``(Price, Ticker)`` MultiIndex columns.
+        """
+        # yfinance takes longer to import than pandas; only pay for it when this provider downloads
+        import yfinance as yf  # noqa: PLC0415
+
+        data: pd.DataFrame = yf.download(
+            list(tickers),
+            period=None if start else period,
+            start=start,
+            end=end,
+            interval=interval,
+            group_by="column",
+            auto_adjust=True,
+            threads=False,
+            progress=False,
+        )
+        return data
+
+
+def _normalize_batch(data: pd.DataFrame, tickers: Sequence[str]) -> pd.DataFrame:
+    """Coerce a batch result to ``(Price, Ticker)`` columns and drop tickers with no data.
+
+    Args:
+        data: Raw batch result.
+        tickers: Tickers requested in the batch.
+
+    Returns:
+        Normalized DataFrame.
+    """
+    if not isinstance(data.columns, pd.MultiIndex):
+        # Single-ticker downloads may come back with flat field columns
+        data = data.copy()
+        data.columns = pd.MultiIndex.from_product([data.columns, [tickers[0]]])
+    data.columns = data.columns.set_names(["Price", "Ticker"])
+    return data.dropna(axis="columns", how="all")
+
+
+def _chunk(items: Sequence[str], size: int) -> list[list[str]]:
+    """Split ``items`` into consecutive chunks of at most ``size`` elements."""
+    return [list(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+@span("retrieval", logger)
+def download_universe(
+    tickers: Sequence[str] | None = None,
+    *,
+    period: str | None = "5y",
+    start: str | None = None,
+    end: str | None = None,
+    interval: str = "1d",
+    include_vix: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_attempts: int = 3,
+    retry_delay: float = 2.0,
+    circuit_breaker: CircuitBreaker | None = None,
+    rate_limiter: RateLimiter | None = None,
+    provider: DataProvider | None = None,
+) -> pd.DataFrame:
+    """Download daily OHLCV data for a whole ticker universe concurrently.
+
+    Tickers are split into batches so that each request covers many symbols, and
+    batches are fetched on a bounded thread pool. Each batch is retried
+    independently, so a transient failure only costs that batch.
+
+    Args:
+        tickers: Ticker symbols to download. Defaults to the current S&P 500 constituents, or to the
+            provider's constituents when a provider is given.
+        period: Lookback period (e.g. ``"5y"``), used when ``start`` is not given.
+        start: Inclusive start date (``YYYY-MM-DD``).
+        end: Exclusive end date (``YYYY-MM-DD``).
+        interval: Bar interval.
+        include_vix: Whether to append ``^VIX`` to the universe.
+        batch_size: Maximum number of tickers per request.
+        max_workers: Maximum number of concurrent requests.
+        max_attempts: Attempts per batch before giving up on it.
+        retry_delay: Delay after the first failed attempt for a batch in seconds.
+        circuit_breaker: Breaker shared by all batches. Defaults to a new breaker for this download,
+            so a failing endpoint stops receiving requests after a few consecutive errors.
+        rate_limiter: Limiter consulted before every request, including retries. Defaults to the
+            provider's own limiter.
+        provider: Source of the data. Defaults to Yahoo Finance.
+
+    Returns:
+        DataFrame indexed by date with ``(Price, Ticker)`` MultiIndex columns. ``attrs["failed"]`` lists
+        the tickers of batches that were given up on, as opposed to tickers that simply had no bars.
+
+    Raises:
+        ValueError: If ``batch_size`` or ``max_workers`` is not positive.
+        RuntimeError: If no data could be downloaded for any ticker.
+    """
+    if batch_size < 1 or max_workers < 1:
+        raise ValueError("batch_size and max_workers must be positive.")
+
+    if tickers is None:
+        tickers = get_sp500_tickers() if provider is None else provider.get_constituents()[0]
+    universe = list(dict.fromkeys(tickers))
+    if include_vix and VIX_TICKER not in universe:
+        universe.append(VIX_TICKER)
+
+    provider = provider or YahooFinanceProvider()
+    rate_limiter = rate_limiter or provider.rate_limiter
+    fetch_batch: Callable[..., pd.DataFrame] = provider.download
+    if rate_limiter is not None:
+        fetch_batch = rate_limiter(fetch_batch)
+    fetch = retry(
+        max_attempts=max_attempts,
+        delay=retry_delay,
+        circuit_breaker=circuit_breaker or CircuitBreaker(),
+    )(fetch_batch)
+    batches = _chunk(universe, batch_size)
+    logger.info(
+        "Downloading %d tickers in %d batches with %d workers...",
+        len(universe),
+        len(batches),
+        min(max_workers, len(batches)),
+    )
+
+    frames: list[pd.DataFrame] = []
+    failed: list[str] = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches)) or 1) as executor:
+        futures = {
+            executor.submit(fetch, batch, period=period, start=start, end=end, interval=interval): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                frames.append(_normalize_batch(future.result(), batch))
+            except Exception:
+                logger.exception("Giving up on batch of %d tickers starting with %s", len(batch), batch[0])
+                failed.extend(batch)
+
+    if not frames:
+        raise RuntimeError("Could not download data for any ticker.")
+
+    data = pd.concat(frames, axis="columns").sort_index().sort_index(axis="columns")
+    missing = sorted(set(universe) - set(data.columns.get_level_values("Ticker")) - set(failed))
+    if failed or missing:
+        logger.warning("No data for %d tickers: %s", len(failed) + len(missing), sorted(failed) + missing)
+
+    data.attrs["failed"] = sorted(failed)
+    return data
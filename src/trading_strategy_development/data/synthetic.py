@@ -0,0 +1,197 @@
+"""Seeded synthetic market generator for scale tests and benchmarks."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from trading_strategy_development.constants import TRADING_DAYS_PER_YEAR
+from trading_strategy_development.data.panel import OHLCV_FIELDS, PricePanel
+from trading_strategy_development.data.retrieval import VIX_TICKER
+
+if TYPE_CHECKING:
+    from typing import Final
+
+# Market GARCH(1, 1) parameters on daily log returns
+CALM_DAILY_VOL: Final[float] = 0.01
+GARCH_ALPHA: Final[float] = 0.08
+GARCH_BETA: Final[float] = 0.90
+
+# Tickers are generated in fixed-size chunks, each with its own random stream, to bound memory
+CHUNK_SIZE: Final[int] = 256
+
+
+def _simulate_regimes(rng: np.random.Generator, n_days: int, p_enter: float, p_exit: float) -> npt.NDArray[np.bool_]:
+    """Simulate a two-state calm/stress Markov chain.
+
+    Args:
+        rng: Random generator.
+        n_days: Number of days.
+        p_enter: Daily probability of entering the stress regime.
+        p_exit: Daily probability of leaving the stress regime.
+
+    Returns:
+        Boolean array that is True on stress days.
+    """
+    draws = rng.random(n_days)
+    stress = np.empty(n_days, dtype=bool)
+    state = False
+    for t in range(n_days):
+        state = draws[t] >= p_exit if state else draws[t] < p_enter
+        stress[t] = state
+    return stress
+
+
+def _simulate_market(
+    rng: np.random.Generator, stress: npt.NDArray[np.bool_], stress_multiplier: float
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Simulate market log returns with GARCH(1, 1) variance that jumps in the stress regime.
+
+    Args:
+        rng: Random generator.
+        stress: Stress regime indicator per day.
+        stress_multiplier: Factor applied to the long-run variance during stress.
+
+    Returns:
+        Daily log returns and conditional variances.
+    """
+    n_days = len(stress)
+    omega = CALM_DAILY_VOL**2 * (1 - GARCH_ALPHA - GARCH_BETA)
+    shocks = rng.standard_normal(n_days)
+    variance = np.empty(n_days)
+    returns = np.empty(n_days)
+
+    var_t = CALM_DAILY_VOL**2
+    eps2 = 0.0
+    for t in range(n_days):
+        level = omega * (stress_multiplier if stress[t] else 1.0)
+        var_t = level + GARCH_ALPHA * eps2 + GARCH_BETA * var_t
+        eps = np.sqrt(var_t) * shocks[t]
+        eps2 = eps * eps
+        variance[t] = var_t
+        returns[t] = 0.0003 - 0.5 * var_t + eps
+    return returns, variance
+
+
+def generate_market_panel(
+    n_tickers: int = 500,
+    n_days: int = 5 * TRADING_DAYS_PER_YEAR,
+    *,
+    start: str = "2015-01-02",
+    seed: int | None = None,
+    n_sectors: int = 11,
+    stress_probability: float = 0.01,
+    stress_duration: float = 20.0,
+    stress_multiplier: float = 6.0,
+    include_vix: bool = True,
+    dtype: npt.DTypeLike = np.float32,
+) -> PricePanel:
+    """Generate correlated OHLCV price paths and a VIX-like volatility index.
+
+    Log returns follow a one-factor model with sector factors: each ticker has
+    a market beta, belongs to one sector and has idiosyncratic noise, all
+    scaled by the market's GARCH volatility so that volatility clusters across
+    the whole universe. A calm/stress regime chain raises the market's
+    long-run variance, producing the VIX spikes that high-volatility filters
+    key on. The VIX series is the annualised conditional market volatility in
+    percent, with observation noise.
+
+    The output only depends on the arguments, including ``seed``, so benchmark
+    datasets can be regenerated at any size instead of being stored.
+
+    Args:
+        n_tickers: Number of stock tickers.
+        n_days: Number of business days.
+        start: First date.
+        seed: Seed for the random streams.
+        n_sectors: Number of sector factors.
+        stress_probability: Daily probability of entering the stress regime.
+        stress_duration: Expected length of a stress regime in days.
+        stress_multiplier: Factor applied to the market's long-run variance during stress.
+        include_vix: Whether to add the ``^VIX`` ticker.
+        dtype: Floating point dtype of the panel.
+
+    Returns:
+        PricePanel with the same fields and ticker layout as downloaded data.
+    """
+    dates = pd.bdate_range(start, periods=n_days)
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+    n_chunks = -(-n_tickers // CHUNK_SIZE)
+    market_seq, vix_seq, *chunk_seqs = np.random.SeedSequence(seed).spawn(2 + n_chunks)
+
+    market_rng = np.random.default_rng(market_seq)
+    stress = _simulate_regimes(market_rng, n_days, stress_probability, 1 / stress_duration)
+    market_returns, market_variance = _simulate_market(market_rng, stress, stress_multiplier)
+    vol_scale = np.sqrt(market_variance) / CALM_DAILY_VOL
+    sector_returns = 0.006 * vol_scale[:, None] * market_rng.standard_normal((n_days, n_sectors))
+
+    all_tickers = [*tickers, VIX_TICKER] if include_vix else tickers
+    values = np.empty((len(OHLCV_FIELDS), len(all_tickers), n_days), dtype=dtype)
+    open_, high, low, close, volume = range(len(OHLCV_FIELDS))
+
+    for chunk, chunk_seq in enumerate(chunk_seqs):
+        rng = np.random.default_rng(chunk_seq)
+        columns = slice(chunk * CHUNK_SIZE, min((chunk + 1) * CHUNK_SIZE, n_tickers))
+        width = columns.stop - columns.start
+
+        beta = rng.uniform(0.5, 1.6, width)
+        sector = rng.integers(0, n_sectors, width)
+        idio_vol = rng.uniform(0.008, 0.025, width)
+        start_price = np.exp(rng.uniform(np.log(10), np.log(500), width))
+        base_volume = np.exp(rng.uniform(np.log(2e5), np.log(5e7), width))
+
+        noise = rng.standard_normal((n_days, width)) * idio_vol * vol_scale[:, None]
+        log_returns = beta * market_returns[:, None] + sector_returns[:, sector] + noise
+        closes = start_price * np.exp(np.cumsum(log_returns, axis=0))
+
+        prev_close = np.vstack([start_price, closes[:-1]])
+        opens = prev_close * np.exp(0.3 * noise * rng.standard_normal((n_days, width)))
+        intraday = idio_vol * vol_scale[:, None] * np.abs(rng.standard_normal((2, n_days, width)))
+        highs = np.maximum(opens, closes) * np.exp(intraday[0])
+        lows = np.minimum(opens, closes) * np.exp(-intraday[1])
+        volumes = base_volume * np.exp(
+            0.3 * rng.standard_normal((n_days, width)) + np.abs(log_returns) / idio_vol * 0.2
+        )
+
+        for field, block in ((open_, opens), (high, highs), (low, lows), (close, closes), (volume, volumes)):
+            values[field, columns, :] = block.T
+
+    if include_vix:
+        vix_rng = np.random.default_rng(vix_seq)
+        vix = 100 * np.sqrt(TRADING_DAYS_PER_YEAR * market_variance) * np.exp(0.05 * vix_rng.standard_normal(n_days))
+        vix_open = np.concatenate([[vix[0]], vix[:-1]])
+        swing = np.abs(0.03 * vix_rng.standard_normal((2, n_days)))
+        values[open_, -1] = vix_open
+        values[high, -1] = np.maximum(vix_open, vix) * (1 + swing[0])
+        values[low, -1] = np.minimum(vix_open, vix) * (1 - swing[1])
+        values[close, -1] = vix
+        values[volume, -1] = 0.0
+
+    return PricePanel(values, all_tickers, dates, OHLCV_FIELDS)
+
+
+def generate_market(
+    n_tickers: int = 500,
+    n_days: int = 5 * TRADING_DAYS_PER_YEAR,
+    *,
+    start: str = "2015-01-02",
+    seed: int | None = None,
+    include_vix: bool = True,
+) -> pd.DataFrame:
+    """Generate a synthetic market in the wide DataFrame layout returned by ``download_universe``.
+
+    Args:
+        n_tickers: Number of stock tickers.
+        n_days: Number of business days.
+        start: First date.
+        seed: Seed for the random streams.
+        include_vix: Whether to add the ``^VIX`` ticker.
+
+    Returns:
+        DataFrame indexed by date with ``(Price, Ticker)`` MultiIndex columns.
+    """
+    panel = generate_market_panel(n_tickers, n_days, start=start, seed=seed, include_vix=include_vix, dtype=np.float64)
+    return panel.to_frame()
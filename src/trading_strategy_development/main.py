@@ -0,0 +1,304 @@
+"""Command line entry point for the trading strategy pipeline.
+
+Only click and the standard library are imported with this module. Each
+command imports pandas, numpy and the data modules when it runs, so
+``--help``, ``--version`` and small commands start without loading them.
+
+``run`` executes its stages through a content-addressed ``Pipeline``, so a
+rerun only recomputes the stages downstream of what changed: a different
+``--strategy`` reuses the cached features, a different ``--vix`` reuses the
+downloaded prices.
+
+Usage:
+    python -m trading_strategy_development.main run --vix 25 --start-date 2020-01-01
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+
+from trading_strategy_development import __version__
+from trading_strategy_development.pipeline import DEFAULT_STAGE_CACHE_DIR, Pipeline
+from trading_strategy_development.utils.custom_logging import get_logger, setup_logging, span
+
+if TYPE_CHECKING:
+    from typing import Final
+
+    import pandas as pd
+
+    from trading_strategy_development.data.panel import PricePanel
+
+logger = get_logger(__name__)
+
+LOG_LEVELS: Final[tuple[str, ...]] = ("DEBUG", "INFO", "WARNING", "ERROR")
+DEFAULT_OUTPUT_DIR: Final[str] = "results"
+FEATURES_FILE: Final[str] = "features.parquet"
+BACKTEST_FILE: Final[str] = "backtest.json"
+# Names of trading_strategy_development.strategies.rules.RULES, repeated to keep pandas out of --help
+STRATEGIES: Final[tuple[str, ...]] = ("hold_all", "trend", "reversion")
+# Packages whose code the run stages call into; editing them invalidates the cached stage outputs
+DATA_MODULES: Final[tuple[str, ...]] = ("trading_strategy_development.data",)
+BACKTEST_MODULES: Final[tuple[str, ...]] = (
+    "trading_strategy_development.backtest",
+    "trading_strategy_development.strategies",
+)
+
+
+def _start_logging(ctx: click.Context) -> None:
+    """Configure logging from the group's options.
+
+    Commands call this instead of the group callback so that ``<command> --help`` creates no log file.
+    """
+    options = ctx.find_root().params
+    setup_logging(
+        log_dir=options["log_dir"],
+        log_level=getattr(logging, options["log_level"].upper()),
+        console_output=True,
+        json_logs=options["json_logs"],
+    )
+
+
+def _load_data(path: Path) -> pd.DataFrame | PricePanel:
+    """Load market data saved as a PricePanel directory or a Parquet file."""
+    import pandas as pd  # noqa: PLC0415
+
+    from trading_strategy_development.data.panel import PricePanel  # noqa: PLC0415
+
+    return PricePanel.open(path) if path.is_dir() else pd.read_parquet(path)
+
+
+def _file_version(path: Path) -> str:
+    """Identify the content of a file or directory by the sizes and modification times of its files."""
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    return ";".join(f"{p.relative_to(path.parent)}:{p.stat().st_size}:{p.stat().st_mtime_ns}" for p in files)
+
+
+def _prices_stage(*, data_path: str | None, start: str | None, end: str | None) -> pd.DataFrame | PricePanel:
+    """Load local market data, or download the S&P 500 and the VIX, from ``start`` up to but excluding ``end``."""
+    if data_path is not None:
+        import pandas as pd  # noqa: PLC0415
+
+        prices = _load_data(Path(data_path))
+        if start is None and end is None:
+            return prices
+        # Both types slice dates inclusively; the end date is exclusive as for downloads
+        last = pd.Timestamp(end) - pd.Timedelta(1, "ns") if end is not None else None
+        if isinstance(prices, pd.DataFrame):
+            return prices.loc[start:last]
+        return prices.select(start=start, end=last)
+
+    from trading_strategy_development.data.cache import download_universe_cached  # noqa: PLC0415
+    from trading_strategy_development.data.retrieval import get_sp500_tickers  # noqa: PLC0415
+
+    return download_universe_cached(get_sp500_tickers(), start=start, end=end)
+
+
+def _dates_stage(*, prices: pd.DataFrame | PricePanel, vix_threshold: float) -> pd.DatetimeIndex:
+    """Find the high-volatility days."""
+    from trading_strategy_development.data.filters import VixThresholdIndex  # noqa: PLC0415
+
+    # Only the dates are needed: features are computed on the full history and then restricted to them
+    with span("filtering", logger) as stage:
+        vix_index = VixThresholdIndex.from_data(prices)
+        dates = vix_index.dates[vix_index.positions_above(vix_threshold)]
+        stage.rows = len(dates)
+    return dates
+
+
+def _features_stage(*, prices: pd.DataFrame | PricePanel, dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """Engineer features for every ticker on the high-volatility days."""
+    from trading_strategy_development.data.features import engineer_features  # noqa: PLC0415
+
+    return engineer_features(prices, dates=dates)
+
+
+def _backtest_stage(*, features: pd.DataFrame, strategy: str) -> dict[str, float]:
+    """Backtest a rule on the high-volatility days and summarize its performance."""
+    from trading_strategy_development.backtest.analyzers import PerformanceAnalyzer  # noqa: PLC0415
+    from trading_strategy_development.strategies.rules import RULES, rule_returns  # noqa: PLC0415
+
+    with span("backtest", logger, strategy=strategy) as stage:
+        returns = rule_returns(features, RULES[strategy])
+        summary = PerformanceAnalyzer.from_returns(returns.to_numpy()).summary()
+        stage.rows = len(returns)
+    return {name: float(value) for name, value in summary.items()}
+
+
+@click.group()
+@click.version_option(__version__, prog_name="trading-strategy-development")
+@click.option(
+    "--log-level",
+    type=click.Choice(LOG_LEVELS, case_sensitive=False),
+    default="INFO",
+    show_default=True,
+    help="Minimum level of log records.",
+)
+@click.option("--json-logs", is_flag=True, help="Write the log file as JSON lines.")
+@click.option(
+    "--log-dir",
+    default="logs",
+    show_default=True,
+    help="Directory of the log file, relative to the project root.",
+)
+def cli(log_level: str, json_logs: bool, log_dir: str) -> None:
+    """Develop and backtest trading strategies for S&P 500 stocks on high-volatility days."""
+
+
+@cli.command()
+@click.option("--start-date", default=None, help="First date to download (YYYY-MM-DD). Defaults to five years ago.")
+@click.option("--end-date", default=None, help="Exclusive last date to download (YYYY-MM-DD). Defaults to today.")
+@click.option("--interval", default="1d", show_default=True, help="Bar interval.")
+@click.option("--ticker", "tickers", multiple=True, help="Ticker to download; repeatable. Defaults to the S&P 500.")
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Also save the data as a PricePanel directory.",
+)
+@click.pass_context
+def download(
+    ctx: click.Context,
+    *,
+    start_date: str | None,
+    end_date: str | None,
+    interval: str,
+    tickers: tuple[str, ...],
+    output: Path | None,
+) -> None:
+    """Download prices into the local cache, fetching only missing date ranges."""
+    _start_logging(ctx)
+    import pandas as pd  # noqa: PLC0415
+
+    from trading_strategy_development.data.cache import download_universe_cached  # noqa: PLC0415
+    from trading_strategy_development.data.panel import PricePanel  # noqa: PLC0415
+    from trading_strategy_development.data.retrieval import get_sp500_tickers  # noqa: PLC0415
+
+    start = start_date or (pd.Timestamp.today().normalize() - pd.DateOffset(years=5))
+    data = download_universe_cached(list(tickers) or get_sp500_tickers(), start=start, end=end_date, interval=interval)
+    if data.empty:
+        raise click.ClickException("No data was downloaded.")
+    click.echo(f"Loaded {len(data)} bars for {data.columns.get_level_values('Ticker').nunique()} tickers.")
+    if output is not None:
+        click.echo(f"Saved panel to {PricePanel.from_frame(data).save(output)}")
+
+
+@cli.command()
+@click.argument("output", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--tickers", "n_tickers", default=500, show_default=True, help="Number of tickers.")
+@click.option("--days", "n_days", default=1260, show_default=True, help="Number of business days.")
+@click.option("--seed", default=None, type=int, help="Random seed.")
+def synthetic(output: Path, n_tickers: int, n_days: int, seed: int | None) -> None:
+    """Generate a seeded synthetic market and save it as a PricePanel directory."""
+    from trading_strategy_development.data.synthetic import generate_market_panel  # noqa: PLC0415
+
+    panel = generate_market_panel(n_tickers, n_days, seed=seed)
+    click.echo(f"Saved {panel!r} to {panel.save(output)}")
+
+
+@cli.command()
+@click.option("--vix", "vix_threshold", default=20.0, show_default=True, help="VIX level defining high volatility.")
+@click.option(
+    "--strategy",
+    type=click.Choice(STRATEGIES),
+    default="trend",
+    show_default=True,
+    help="Rule to backtest on the high-volatility days.",
+)
+@click.option(
+    "--data",
+    "data_path",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="PricePanel directory or Parquet file to use instead of downloading.",
+)
+@click.option(
+    "--start-date",
+    default=None,
+    help="First date to use (YYYY-MM-DD). Defaults to five years ago when downloading, else the first date in --data.",
+)
+@click.option(
+    "--end-date",
+    default=None,
+    help="Exclusive last date to use (YYYY-MM-DD). Defaults to today when downloading, else the end of --data.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_OUTPUT_DIR,
+    show_default=True,
+    help="Directory for the results.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_STAGE_CACHE_DIR,
+    show_default=True,
+    help="Directory of cached stage outputs.",
+)
+@click.option("--no-cache", is_flag=True, help="Recompute every stage without reading or writing the cache.")
+@click.pass_context
+def run(
+    ctx: click.Context,
+    *,
+    vix_threshold: float,
+    strategy: str,
+    data_path: Path | None,
+    start_date: str | None,
+    end_date: str | None,
+    output_dir: Path,
+    cache_dir: Path,
+    no_cache: bool,
+) -> None:
+    """Filter high-volatility days, engineer features and backtest a strategy on them."""
+    _start_logging(ctx)
+    import pandas as pd  # noqa: PLC0415
+
+    today = pd.Timestamp.today().normalize()
+    pipeline = Pipeline(None if no_cache else cache_dir)
+    if data_path is not None:
+        # Local data is cheap to reload; its files' sizes and times stand in for its content in the keys
+        pipeline.add(
+            "prices",
+            _prices_stage,
+            version=_file_version(data_path),
+            cache=False,
+            depends_on=DATA_MODULES,
+            data_path=str(data_path),
+            start=start_date,
+            end=end_date,
+        )
+    else:
+        # Without an end date the download runs up to today, so it is cached for the day
+        pipeline.add(
+            "prices",
+            _prices_stage,
+            version=end_date or str(today.date()),
+            depends_on=DATA_MODULES,
+            data_path=None,
+            start=start_date or str((today - pd.DateOffset(years=5)).date()),
+            end=end_date,
+        )
+    pipeline.add("dates", _dates_stage, inputs=("prices",), depends_on=DATA_MODULES, vix_threshold=vix_threshold)
+    pipeline.add("features", _features_stage, inputs=("prices", "dates"), depends_on=DATA_MODULES)
+    pipeline.add("backtest", _backtest_stage, inputs=("features",), depends_on=BACKTEST_MODULES, strategy=strategy)
+
+    metrics = pipeline.run("backtest")
+    features = pipeline.run("features")
+    dates = pipeline.run("dates")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    features.to_parquet(output_dir / FEATURES_FILE)
+    (output_dir / BACKTEST_FILE).write_text(json.dumps({"strategy": strategy, **metrics}, indent=2), "utf-8")
+    click.echo(f"Wrote {len(features)} feature rows for {len(dates)} high-volatility days to {output_dir}")
+    click.echo(f"{strategy}: total return {metrics['total_return']:.2%}, Sharpe {metrics['sharpe']:.2f}")
+    if pipeline.reused:
+        click.echo(f"Reused cached stages: {', '.join(pipeline.reused)}")
+
+
+if __name__ == "__main__":
+    cli()
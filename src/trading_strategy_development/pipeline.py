@@ -0,0 +1,233 @@
+"""Pipeline of named stages whose outputs are cached on disk by content address.
+
+A stage's cache key hashes its name, the source code of its function and of
+the modules it declares in ``depends_on``, the package version, its
+parameters and the keys of the stages it reads from.
+Keys therefore change exactly when something that could change the output
+changes, and are known before anything runs: when a stage's key is cached
+its output is loaded and its upstream stages are not run, or even loaded.
+
+Stage outputs are pickled to ``<cache_dir>/<stage>/<key>.pkl``, written to a
+temporary file and renamed into place. Only the standard library is imported
+here, so the CLI can build its pipeline without loading pandas first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import pickle
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from trading_strategy_development import __version__
+from trading_strategy_development.utils.custom_logging import get_logger, get_project_root
+
+if TYPE_CHECKING:
+    from typing import Final
+
+logger = get_logger(__name__)
+
+DEFAULT_STAGE_CACHE_DIR: Final[Path] = get_project_root() / "cache" / "stages"
+
+
+def module_files(name: str) -> list[Path]:
+    """Find the source files of a module, or of every module in a package, without importing it.
+
+    Args:
+        name: Dotted module or package name, e.g. ``"trading_strategy_development.data"``.
+
+    Returns:
+        Sorted paths of the Python source files.
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found.
+    """
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError(f"No source found for module {name!r}.", name=name)
+    if spec.submodule_search_locations:
+        return sorted(p for location in spec.submodule_search_locations for p in Path(location).rglob("*.py"))
+    return [Path(spec.origin)]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a pipeline.
+
+    Attributes:
+        name: Stage name, also the keyword under which downstream stages receive its output.
+        func: Function called with the outputs of ``inputs`` and with ``params`` as keyword arguments.
+        inputs: Names of the stages whose outputs the function needs.
+        params: Parameters passed to the function and hashed into the key.
+        version: Extra value hashed into the key but not passed on, e.g. the modification time of an input file.
+        cache: Whether to store the output. Stages that only read local files are cheaper to rerun.
+        depends_on: Modules or packages whose source code the output depends on, beyond the function itself.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    params: Mapping[str, Any] = field(default_factory=dict)
+    version: str | None = None
+    cache: bool = True
+    depends_on: tuple[str, ...] = ()
+
+    def code_version(self) -> str:
+        """Hash of the package version and the sources of the function and of its declared dependencies."""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = f"{self.func.__module__}.{self.func.__qualname__}"
+        digest.update(f"{__version__}\n{source}".encode())
+        for module in self.depends_on:
+            for path in module_files(module):
+                digest.update(f"\n{module}:{path.name}\n".encode())
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+
+class Pipeline:
+    """DAG of stages with a content-addressed output cache.
+
+    Example:
+        >>> pipeline = Pipeline(cache_dir)
+        >>> pipeline.add("prices", load_prices, start="2020-01-01")
+        >>> pipeline.add("features", build_features, inputs=("prices",), depends_on=("mypackage.features",), window=20)
+        >>> features = pipeline.run("features")
+
+    Attributes:
+        cache_dir: Directory of cached outputs, or None to cache nothing.
+        computed: Names of the stages run by this pipeline, in order.
+        reused: Names of the stages loaded from the cache, in order.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = DEFAULT_STAGE_CACHE_DIR) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.computed: list[str] = []
+        self.reused: list[str] = []
+        self._stages: dict[str, Stage] = {}
+        self._keys: dict[str, str] = {}
+        self._outputs: dict[str, Any] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *,
+        inputs: tuple[str, ...] = (),
+        version: str | None = None,
+        cache: bool = True,
+        depends_on: tuple[str, ...] = (),
+        **params: Any,  # noqa: ANN401
+    ) -> Stage:
+        """Add a stage after the stages it reads from.
+
+        Args:
+            name: Unique stage name.
+            func: Function computing the stage's output.
+            inputs: Names of earlier stages whose outputs are passed to ``func``.
+            version: Extra value hashed into the key, not passed to ``func``.
+            cache: Whether to store the output on disk.
+            depends_on: Dotted names of the modules or packages ``func`` calls into, so that editing them
+                invalidates the cached output.
+            **params: Parameters passed to ``func``. They must be JSON-serializable, or at least have a stable
+                ``str()``.
+
+        Returns:
+            The new Stage.
+
+        Raises:
+            ValueError: If the name is taken, an input is unknown, or a parameter shadows an input.
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage {name!r} is already defined.")
+        unknown = [stage for stage in inputs if stage not in self._stages]
+        if unknown:
+            raise ValueError(f"Stage {name!r} reads from undefined stages {unknown}; add them first.")
+        clashes = set(inputs) & set(params)
+        if clashes:
+            raise ValueError(f"Parameters {sorted(clashes)} of stage {name!r} have the names of its inputs.")
+        stage = Stage(name, func, tuple(inputs), dict(params), version, cache, tuple(depends_on))
+        self._stages[name] = stage
+        return stage
+
+    def key(self, name: str) -> str:
+        """Content address of a stage's output.
+
+        Args:
+            name: Stage name.
+
+        Returns:
+            Hex digest of the stage's name, code, parameters, version and upstream keys.
+        """
+        if name not in self._keys:
+            stage = self._stages[name]
+            description = {
+                "stage": name,
+                "code": stage.code_version(),
+                "params": stage.params,
+                "version": stage.version,
+                "inputs": {upstream: self.key(upstream) for upstream in stage.inputs},
+            }
+            encoded = json.dumps(description, sort_keys=True, default=str).encode()
+            self._keys[name] = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        return self._keys[name]
+
+    def _path(self, stage: Stage) -> Path | None:
+        if self.cache_dir is None or not stage.cache:
+            return None
+        return self.cache_dir / stage.name / f"{self.key(stage.name)}.pkl"
+
+    def _load(self, stage: Stage) -> tuple[bool, Any]:
+        """Load a cached output, reporting whether there was a readable one."""
+        path = self._path(stage)
+        if path is None or not path.exists():
+            return False, None
+        try:
+            with path.open("rb") as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logger.warning("Ignoring unreadable cached output %s: %s", path, e)
+            return False, None
+
+    def _store(self, stage: Stage, output: Any) -> None:  # noqa: ANN401
+        path = self._path(stage)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def run(self, name: str) -> Any:  # noqa: ANN401
+        """Get a stage's output, from memory, the cache, or by running it and whatever it needs.
+
+        Args:
+            name: Stage name.
+
+        Returns:
+            The stage's output.
+        """
+        if name in self._outputs:
+            return self._outputs[name]
+        stage = self._stages[name]
+        found, output = self._load(stage)
+        if found:
+            logger.info("Stage %s: reusing cached output %s", name, self.key(name))
+            self.reused.append(name)
+        else:
+            inputs = {upstream: self.run(upstream) for upstream in stage.inputs}
+            logger.info("Stage %s: computing output %s", name, self.key(name))
+            output = stage.func(**inputs, **stage.params)
+            self._store(stage, output)
+            self.computed.append(name)
+        self._outputs[name] = output
+        return output
@@ -0,0 +1,57 @@
+"""Rule-based strategies on engineered features.
+
+A rule selects the ``(Date, Ticker)`` rows of the frame returned by
+``engineer_features`` to hold until the next close. Selected tickers are
+held with equal weights, so a rule's return on a date is the mean
+``next_day_return`` of its selection.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from trading_strategy_development.data.features import TARGET_COLUMN
+
+if TYPE_CHECKING:
+    from typing import Final
+
+Rule = Callable[[pd.DataFrame], "pd.Series[bool]"]
+
+OVERSOLD_RSI: Final[float] = 30.0
+
+
+def hold_all(features: pd.DataFrame) -> pd.Series[bool]:
+    """Hold every ticker, the benchmark for the other rules."""
+    return pd.Series(True, index=features.index)
+
+
+def trend(features: pd.DataFrame) -> pd.Series[bool]:
+    """Hold tickers closing above their 50-day average."""
+    return features["close_to_sma_50"] > 0
+
+
+def reversion(features: pd.DataFrame) -> pd.Series[bool]:
+    """Hold oversold tickers, whose 14-day RSI is below 30."""
+    return features["rsi_14"] < OVERSOLD_RSI
+
+
+RULES: Final[dict[str, Rule]] = {"hold_all": hold_all, "trend": trend, "reversion": reversion}
+
+
+def rule_returns(features: pd.DataFrame, rule: Rule) -> pd.Series[float]:
+    """Daily returns of holding a rule's selection with equal weights.
+
+    Args:
+        features: Frame indexed by ``(Date, Ticker)`` from ``engineer_features``.
+        rule: Rule selecting the rows to hold.
+
+    Returns:
+        Returns indexed by date, zero on dates where nothing is selected or the next return is unknown.
+    """
+    selected = rule(features).fillna(False).astype(bool)
+    next_returns = features[TARGET_COLUMN].where(selected)
+    returns = next_returns.groupby(level="Date").mean()
+    return returns.reindex(features.index.unique(level="Date")).fillna(0.0)
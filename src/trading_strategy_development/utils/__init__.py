@@ -1,9 +1,29 @@
 """Utility functions for the trading strategy development package."""
 
 from trading_strategy_development.utils.custom_logging import (
+    DuplicateFilter,
+    JsonFormatter,
+    Span,
     get_logger,
     get_project_root,
+    init_worker_logging,
+    logging_pool_kwargs,
     setup_logging,
+    shutdown_logging,
+    span,
 )
+from trading_strategy_development.utils.rate_limit import RateLimiter
 
-__all__ = ["get_logger", "get_project_root", "setup_logging"]
+__all__ = [
+    "DuplicateFilter",
+    "JsonFormatter",
+    "RateLimiter",
+    "Span",
+    "get_logger",
+    "get_project_root",
+    "init_worker_logging",
+    "logging_pool_kwargs",
+    "setup_logging",
+    "shutdown_logging",
+    "span",
+]
@@ -2,19 +2,41 @@
 
 from __future__ import annotations
 
+import atexit
+import contextvars
+import copy
+import functools
+import itertools
+import json
 import logging
+import os
+import queue
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Literal, ParamSpec, TypeVar
+
+if sys.platform != "win32":
+    import resource
 
 if TYPE_CHECKING:
-    from typing import Final, TypedDict
+    import multiprocessing.queues
+    from typing import Final, Self, TypedDict
 
 
+@functools.cache
 def get_project_root() -> Path:
     """Determine the project root directory by finding the parent of the 'src' directory.
 
+    The result is cached, so only the first call touches the filesystem.
+
     Returns:
         Path object pointing to the project root.
     """
@@ -25,42 +47,325 @@ def get_project_root() -> Path:
     raise RuntimeError("Could not find project root (expected to find 'src' directory).")
 
 
-DEFAULT_LOG_DIR: Final[Path] = get_project_root() / "logs"
+DEFAULT_QUEUE_SIZE: Final[int] = 10_000
+DEFAULT_DEDUP_INTERVAL: Final[float] = 10.0
+
+OverflowPolicy = Literal["drop", "block"]
 
 if TYPE_CHECKING:
+    DEFAULT_LOG_DIR: Final[Path]
+
+    RecordQueue = queue.Queue[logging.LogRecord] | multiprocessing.queues.Queue[logging.LogRecord]
 
     class LoggingConfig(TypedDict):
         log_dir: Path
         log_file: Path
         log_level: int
         console_output: bool
+        queue_logging: bool
+        multiprocess: bool
+        json_logs: bool
+
+
+def __getattr__(name: str) -> Path:
+    """Resolve path constants under the project root on first access instead of at import."""
+    if name == "DEFAULT_LOG_DIR":
+        return get_project_root() / "logs"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Attributes every LogRecord has; anything else on a record was passed through ``extra``
+_RECORD_ATTRIBUTES: Final[frozenset[str]] = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line.
+
+    The object holds the timestamp (ISO 8601, UTC), level, logger name,
+    message, process id and every field passed through ``extra``, so that log
+    files can be loaded and aggregated without parsing free text.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialise a record to a JSON line.
+
+        Args:
+            record: Record to format.
+
+        Returns:
+            JSON object on a single line.
+        """
+        payload: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        payload.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that does the minimum work on the logging thread.
+
+    Records are copied with their message already merged, but formatting
+    (timestamps, layout) is left to the listener thread. When the queue is
+    full, records are either dropped (``"drop"``) or the caller waits for
+    space (``"block"``). Dropped records are counted and reported by a
+    warning once the queue accepts records again.
+    """
+
+    def __init__(self, log_queue: RecordQueue, overflow: OverflowPolicy = "drop") -> None:
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._pending_drops = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy a record with its message merged and any traceback rendered to text.
+
+        Args:
+            record: Record being logged.
+
+        Returns:
+            Record safe to hand to another thread.
+        """
+        prepared = copy.copy(record)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            prepared.exc_info = None
+        return prepared
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, applying the overflow policy.
+
+        Args:
+            record: Prepared record.
+        """
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+                self._pending_drops += 1
+            return
+        if self._pending_drops:
+            self._report_drops()
+
+    def _report_drops(self) -> None:
+        with self._drop_lock:
+            count, self._pending_drops = self._pending_drops, 0
+        warning = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0, "Dropped %d log records because the queue was full", (count,), None
+        )
+        try:
+            self.queue.put_nowait(self.prepare(warning))
+        except queue.Full:
+            with self._drop_lock:
+                self._pending_drops += count
+
+
+@dataclass
+class _DedupWindow:
+    """Occurrences of one message template within the current interval."""
+
+    start: float
+    seen: int = 0
+    suppressed: int = 0
+
+
+_duplicate_filters: weakref.WeakSet[DuplicateFilter] = weakref.WeakSet()
+
+
+class DuplicateFilter(logging.Filter):
+    """Collapse bursts of similar records into periodic summaries.
+
+    Records are similar when they come from the same logger at the same level
+    with the same message template, so ``"Attempt %d/%d failed for %s"``
+    matches across attempts and tickers. In every ``interval`` the first
+    ``burst`` similar records pass and the rest are counted instead of
+    emitted. Once the interval has elapsed, the next similar record is
+    preceded by one summary ("N similar messages suppressed in last 10s")
+    carrying the count in its ``suppressed`` field. ``flush`` (also run by
+    ``shutdown_logging``) reports counts that are still pending.
+
+    Attach it to a logger, or to a single handler with ``sink=handler.handle``
+    so summaries only go to that handler.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_DEDUP_INTERVAL,
+        burst: int = 1,
+        name: str = "",
+        sink: Callable[[logging.LogRecord], object] | None = None,
+    ) -> None:
+        super().__init__(name)
+        self.interval = interval
+        self.burst = burst
+        self.sink = sink
+        self.suppressed = 0
+        self._windows: dict[tuple[str, int, str], _DedupWindow] = {}
+        self._lock = threading.Lock()
+        _duplicate_filters.add(self)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record is emitted.
+
+        Args:
+            record: Record being logged.
+
+        Returns:
+            False if the record was suppressed.
+        """
+        if not super().filter(record) or hasattr(record, "suppressed"):
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        expired: _DedupWindow | None = None
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window.start >= self.interval:
+                expired = window
+                window = self._windows[key] = _DedupWindow(now)
+            window.seen += 1
+            allowed = window.seen <= self.burst
+            if not allowed:
+                window.suppressed += 1
+                self.suppressed += 1
+        if expired is not None and expired.suppressed:
+            self._summarize(record, expired, now)
+        return allowed
+
+    def _summarize(self, template: logging.LogRecord, window: _DedupWindow, now: float) -> None:
+        elapsed = now - window.start
+        summary = logging.getLogger(template.name).makeRecord(
+            template.name,
+            template.levelno,
+            template.pathname,
+            template.lineno,
+            "%d similar messages suppressed in last %.0fs: %s",
+            (window.suppressed, elapsed, template.msg),
+            None,
+            extra={"suppressed": window.suppressed},
+        )
+        (self.sink or logging.getLogger(template.name).handle)(summary)
+
+    def flush(self) -> None:
+        """Emit summaries for every message template with suppressed records, and start new intervals."""
+        now = time.monotonic()
+        with self._lock:
+            pending = [(key, window) for key, window in self._windows.items() if window.suppressed]
+            self._windows.clear()
+        for (name, levelno, msg), window in pending:
+            template = logging.LogRecord(name, levelno, __file__, 0, msg, None, None)
+            self._summarize(template, window, now)
+
+
+_queue_listener: QueueListener | None = None
+_listener_pid: int | None = None
+_process_queue: multiprocessing.queues.Queue[logging.LogRecord] | None = None
+_overflow: OverflowPolicy = "drop"
+
+
+def shutdown_logging() -> None:
+    """Stop the background queue listener, flushing every queued record to its handlers.
+
+    Only the process that started the listener stops it, so a forked worker
+    inheriting this module's state cannot shut down its parent's listener.
+    """
+    global _queue_listener, _listener_pid, _process_queue  # noqa: PLW0603
+    for duplicate_filter in list(_duplicate_filters):
+        duplicate_filter.flush()
+    if _queue_listener is not None and _listener_pid == os.getpid():
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        if _process_queue is not None:
+            _process_queue.close()
+            _process_queue.join_thread()
+    _queue_listener = None
+    _listener_pid = None
+    _process_queue = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _start_queue_listener(
+    handlers: list[logging.Handler], multiprocess: bool, queue_size: int, overflow: OverflowPolicy
+) -> BoundedQueueHandler:
+    """Start a listener thread feeding ``handlers`` and return the handler that queues records for it."""
+    global _queue_listener, _listener_pid, _process_queue, _overflow  # noqa: PLW0603
+    log_queue: RecordQueue
+    if multiprocess:
+        # Deferred: multiprocessing is only needed for worker pools and is slow to import
+        import multiprocessing  # noqa: PLC0415
+
+        log_queue = _process_queue = multiprocessing.get_context().Queue(maxsize=queue_size)
+    else:
+        log_queue = queue.Queue(maxsize=queue_size)
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    _listener_pid = os.getpid()
+    _overflow = overflow
+    return BoundedQueueHandler(log_queue, overflow=overflow)
 
 
 def setup_logging(
-    log_dir: str | Path = DEFAULT_LOG_DIR,
+    log_dir: str | Path | None = None,
     log_level: int = logging.INFO,
     log_format: str | None = None,
     capture_warnings: bool = True,
     console_output: bool = True,
     file_prefix: str = "trading_log",
+    *,
+    queue_logging: bool = False,
+    multiprocess: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    overflow: OverflowPolicy = "drop",
+    json_logs: bool = False,
 ) -> LoggingConfig:
     """Set up logging configuration for the entire application with timed rotation.
 
     Args:
         log_dir: Directory to store log files (will be resolved relative to project root).
+            Defaults to ``DEFAULT_LOG_DIR``.
         log_level: Logging level (default: INFO).
         log_format: Custom log format string (if None, uses default format).
         capture_warnings: Whether to capture warnings via logging.
         console_output: Whether to output logs to console in addition to file.
         file_prefix: Prefix for log filename (e.g., 'trading_log' for 'trading_log.log').
+        queue_logging: Whether to hand records to a background thread through a bounded queue
+            instead of writing them on the calling thread.
+        multiprocess: Whether to use a multiprocessing queue that worker processes can also log
+            to, so that only this process writes the log file. Implies ``queue_logging``. Pass
+            ``logging_pool_kwargs()`` to ``ProcessPoolExecutor`` to connect its workers.
+        queue_size: Maximum number of records waiting in the queue.
+        overflow: What to do when the queue is full: ``"drop"`` the record or ``"block"`` until there is space.
+        json_logs: Whether to write the log file as JSON lines. Console output keeps ``log_format``.
 
     Returns:
         Dictionary with logging configuration details.
     """
-    if isinstance(log_dir, str):
-        log_dir = Path(log_dir)
-
     project_root = get_project_root()
+    log_dir = Path(log_dir) if log_dir is not None else project_root / "logs"
 
     # Normalize log_dir to be relative to the project root
     if log_dir.is_absolute():
@@ -94,16 +399,18 @@ def setup_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
+    shutdown_logging()
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
+    handlers: list[logging.Handler] = []
     try:
         file_handler = TimedRotatingFileHandler(
             filename=log_file, when="D", interval=1, backupCount=7, encoding="utf-8"
         )
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(JsonFormatter() if json_logs else formatter)
         file_handler.setLevel(log_level)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except (OSError, PermissionError) as e:
         error_msg = f"Failed to set up file handler: {e!s}"
         print(error_msg, file=sys.stderr)
@@ -112,7 +419,14 @@ def setup_logging(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
         console_handler.setLevel(log_level)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    queue_logging = queue_logging or multiprocess
+    if queue_logging:
+        root_logger.addHandler(_start_queue_listener(handlers, multiprocess, queue_size, overflow))
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
 
     if capture_warnings:
         logging.captureWarnings(capture_warnings)
@@ -124,6 +438,62 @@ def setup_logging(
         "log_file": log_file,
         "log_level": log_level,
         "console_output": console_output,
+        "queue_logging": queue_logging,
+        "multiprocess": multiprocess,
+        "json_logs": json_logs,
+    }
+
+
+def init_worker_logging(
+    log_queue: multiprocessing.queues.Queue[logging.LogRecord],
+    log_level: int = logging.INFO,
+    overflow: OverflowPolicy = "drop",
+) -> None:
+    """Send every record logged in a worker process to the parent's log queue.
+
+    Meant to be the ``initializer`` of a process pool. Any handlers the worker
+    inherited or configured are removed, so the parent's listener is the only
+    writer of the log file.
+
+    Args:
+        log_queue: Multiprocessing queue created by ``setup_logging(multiprocess=True)``.
+        log_level: Logging level of the worker's root logger.
+        overflow: What to do when the queue is full: ``"drop"`` the record or ``"block"`` until there is space.
+    """
+    global _queue_listener, _listener_pid, _process_queue  # noqa: PLW0603
+    # State inherited through fork belongs to the parent
+    _queue_listener = None
+    _listener_pid = None
+    _process_queue = None
+
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.setLevel(log_level)
+    root_logger.addHandler(BoundedQueueHandler(log_queue, overflow=overflow))
+
+
+def logging_pool_kwargs() -> dict[str, Any]:
+    """Get the ``initializer`` and ``initargs`` connecting a process pool's workers to the log queue.
+
+    Example:
+        >>> with ProcessPoolExecutor(max_workers=4, **logging_pool_kwargs()) as pool:
+        ...     pool.map(run_backtest, configs)
+
+    The queue belongs to the default multiprocessing context, so the pool must
+    use the default start method too.
+
+    Returns:
+        Keyword arguments for ``ProcessPoolExecutor`` or ``multiprocessing.Pool``.
+
+    Raises:
+        RuntimeError: If logging was not set up with ``multiprocess=True``.
+    """
+    if _process_queue is None or _listener_pid != os.getpid():
+        raise RuntimeError("Multiprocess logging is not active; call setup_logging(multiprocess=True) first.")
+    return {
+        "initializer": init_worker_logging,
+        "initargs": (_process_queue, logging.getLogger().level, _overflow),
     }
 
 
@@ -137,3 +507,146 @@ def get_logger(name: str) -> logging.Logger:
         Logger instance.
     """
     return logging.getLogger(name)
+
+
+def peak_rss_mb() -> float | None:
+    """Get the peak resident set size of the current process.
+
+    Returns:
+        Peak RSS in MiB, or None where the platform does not report it.
+    """
+    if sys.platform == "win32":
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+_span_ids = itertools.count(1)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """Timed pipeline stage, logged once when it starts and once when it ends.
+
+    Both records carry structured fields (``event``, ``stage``, ``span_id``
+    and ``parent_id`` of the enclosing span), and the end record adds
+    ``status``, ``duration_s``, ``rows`` and ``peak_rss_mb``. With
+    ``setup_logging(json_logs=True)`` the log file is therefore a timeline
+    that can be aggregated across runs.
+
+    Use it as a context manager, setting ``rows`` once known::
+
+        with span("features") as stage:
+            features = engineer_features(data)
+            stage.rows = len(features)
+
+    or as a decorator, where ``rows`` defaults to ``len()`` of the result::
+
+        @span("retrieval")
+        def download(...): ...
+
+    Both records are logged at ``level``. When the logger is disabled for
+    that level the span skips the peak memory lookup, so spans around hot
+    code cost little more than two clock reads.
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        logger: logging.Logger | None = None,
+        level: int = logging.INFO,
+        **fields: Any,  # noqa: ANN401
+    ) -> None:
+        self.stage = stage
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+        self.fields = fields
+        self.rows: int | None = None
+        self.span_id = 0
+        self.parent_id: int | None = None
+        self._start = 0.0
+        self._token: contextvars.Token[Span | None] | None = None
+
+    def _extra(self, event: str) -> dict[str, Any]:
+        return {
+            "event": event,
+            "stage": self.stage,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            **self.fields,
+        }
+
+    def __enter__(self) -> Self:
+        """Start timing the stage."""
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.span_id = next(_span_ids)
+        self._token = _current_span.set(self)
+        self.logger.log(self.level, "Stage %s started", self.stage, extra=self._extra("span_start"))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Log the stage's duration, rows and peak memory."""
+        duration = time.perf_counter() - self._start
+        if self._token is not None:
+            _current_span.reset(self._token)
+        if not self.logger.isEnabledFor(self.level):
+            return
+        status = "ok" if exc_type is None else "error"
+        peak = peak_rss_mb()
+        extra = self._extra("span_end") | {
+            "status": status,
+            "duration_s": round(duration, 6),
+            "rows": self.rows,
+            "peak_rss_mb": round(peak, 1) if peak is not None else None,
+        }
+        self.logger.log(
+            self.level,
+            "Stage %s finished (%s) in %.3fs, rows=%s, peak RSS=%s MiB",
+            self.stage,
+            status,
+            duration,
+            self.rows,
+            extra["peak_rss_mb"],
+            extra=extra,
+        )
+
+    def __call__(self, func: Callable[P, R]) -> Callable[P, R]:
+        """Time every call of ``func`` as a separate span."""
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with Span(self.stage, self.logger, self.level, **self.fields) as active:
+                result = func(*args, **kwargs)
+                if hasattr(result, "__len__"):
+                    active.rows = len(result)
+                return result
+
+        return wrapper
+
+
+def span(
+    stage: str,
+    logger: logging.Logger | None = None,
+    level: int = logging.INFO,
+    **fields: Any,  # noqa: ANN401
+) -> Span:
+    """Time a pipeline stage, as a context manager or a decorator.
+
+    Args:
+        stage: Stage name, e.g. ``"retrieval"``, ``"filtering"`` or ``"features"``.
+        logger: Logger to write to. Defaults to this module's logger.
+        level: Level of the start and end records.
+        **fields: Extra fields added to both records, e.g. ``universe="sp500"``.
+
+    Returns:
+        Span for the stage.
+    """
+    return Span(stage, logger, level, **fields)
@@ -0,0 +1,148 @@
+"""Token-bucket rate limiting shared by threads, asyncio tasks and processes."""
+
+from __future__ import annotations
+
+import inspect
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from functools import wraps
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+if sys.platform != "win32":
+    import fcntl
+
+T = TypeVar("T")
+
+# Bucket state persisted for cross-process limiting: available tokens and last refill time
+_STATE_FORMAT = "dd"
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+
+class RateLimiter:
+    """Token bucket that refills at ``rate`` tokens per second up to ``capacity``.
+
+    Callers reserve tokens up front and then sleep until their reservation is
+    due, so concurrent callers are spaced out evenly rather than all waking up
+    and competing for the next token. When ``state_file`` is given, the bucket
+    lives in that file and is updated under an exclusive ``flock``, so every
+    process pointing at the same file shares one limit. The in-process bucket
+    is timed with the monotonic clock; the shared one stores wall-clock time,
+    the only clock that processes can compare.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, state_file: str | Path | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        if state_file is not None and sys.platform == "win32":
+            raise NotImplementedError("Cross-process rate limiting requires fcntl.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.state_file = Path(state_file) if state_file is not None else None
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, tokens: float, updated_at: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def _reserve_local(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = self._refill(self._tokens, self._updated_at, now) - tokens
+            self._updated_at = now
+            return max(0.0, -self._tokens / self.rate)
+
+    def _reserve_shared(self, state_file: Path, tokens: float) -> float:
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(state_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            raw = os.pread(fd, _STATE_SIZE, 0)
+            available, updated_at = (
+                struct.unpack(_STATE_FORMAT, raw) if len(raw) == _STATE_SIZE else (self.capacity, now)
+            )
+            available = self._refill(available, updated_at, now) - tokens
+            os.pwrite(fd, struct.pack(_STATE_FORMAT, available, now), 0)
+            return max(0.0, -available / self.rate)
+        finally:
+            os.close(fd)  # Closing the descriptor releases the lock
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket, going into debt if necessary.
+
+        Args:
+            tokens: Number of tokens to take.
+
+        Returns:
+            Seconds the caller must wait before proceeding.
+        """
+        if self.state_file is not None:
+            return self._reserve_shared(self.state_file, tokens)
+        return self._reserve_local(tokens)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the calling thread until ``tokens`` are available.
+
+        Args:
+            tokens: Number of tokens to take.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Wait without blocking the event loop until ``tokens`` are available.
+
+        Args:
+            tokens: Number of tokens to take.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        # Imported here so that synchronous users do not pay for asyncio; inside a running loop it is already loaded
+        import asyncio  # noqa: PLC0415
+
+        if self.state_file is not None:
+            # Taking the file lock can block on other processes, so do it off the event loop
+            wait = await asyncio.to_thread(self._reserve_shared, self.state_file, tokens)
+        else:
+            wait = self._reserve_local(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Decorate a function or coroutine function so each call takes one token.
+
+        Args:
+            func: Function to rate limit.
+
+        Returns:
+            Decorated function.
+        """
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                await self.acquire_async()
+                return await func(*args, **kwargs)
+
+            return cast(Callable[..., T], async_wrapper)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+            self.acquire()
+            return func(*args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,104 @@
+"""
+Tests for the streaming performance analyzers.
+"""
+
+import numpy as np
+import pytest
+
+from trading_strategy_development.backtest.analyzers import PerformanceAnalyzer
+from trading_strategy_development.backtest.events import EventBacktestEngine, EventStrategy, Order
+from trading_strategy_development.backtest.vectorized import VectorBacktestEngine
+from trading_strategy_development.constants import TRADING_DAYS_PER_YEAR
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(4)
+    values = rng.normal(0.0005, 0.01, size=(3, 500))
+    values[:, ::7] = 0.0  # Flat days count towards exposure and not towards the win rate
+    return values
+
+
+def batch_metrics(returns):
+    """Metrics computed from the full return series."""
+    equity = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+    annualise = np.sqrt(TRADING_DAYS_PER_YEAR)
+    return {
+        "total_return": equity[-1] - 1,
+        "sharpe": returns.mean() / returns.std(ddof=1) * annualise,
+        "sortino": returns.mean() / np.sqrt((np.minimum(returns, 0) ** 2).mean()) * annualise,
+        "max_drawdown": (equity / peak - 1).min(),
+        "win_rate": (returns > 0).sum() / (returns != 0).sum(),
+        "exposure": (returns != 0).mean(),
+    }
+
+
+def test_updates_match_batch_metrics(returns) -> None:
+    """Test that bar-by-bar updates give the same metrics as the full series."""
+    analyzer = PerformanceAnalyzer()
+    for value in returns[0]:
+        analyzer.update(value)
+
+    summary = analyzer.summary()
+    for name, expected in batch_metrics(returns[0]).items():
+        assert summary[name] == pytest.approx(expected, rel=1e-9), name
+    assert analyzer.count == 500
+
+
+def test_vectorised_chunks_and_merge(returns) -> None:
+    """Test that chunked accumulation merged in order equals a single pass, for every run at once."""
+    whole = PerformanceAnalyzer.from_returns(returns)
+    merged = PerformanceAnalyzer(3)
+    for chunk in np.array_split(returns, 7, axis=-1):
+        merged = merged.merge(PerformanceAnalyzer.from_returns(chunk))
+
+    stepped = PerformanceAnalyzer(3)
+    for t in range(returns.shape[1]):
+        stepped.update(returns[:, t])
+
+    for analyzer in (merged, stepped):
+        for name, values in analyzer.summary().items():
+            np.testing.assert_allclose(values, whole.summary()[name], rtol=1e-9, err_msg=name)
+    for run in range(3):
+        assert whole.summary()["max_drawdown"][run] == pytest.approx(batch_metrics(returns[run])["max_drawdown"])
+
+
+def test_concat_runs_from_workers(returns) -> None:
+    """Test that analyzers of separate runs stack into one array analyzer."""
+    stacked = PerformanceAnalyzer.concat([PerformanceAnalyzer.from_returns(run) for run in returns])
+    np.testing.assert_allclose(
+        stacked.summary()["sharpe"], PerformanceAnalyzer.from_returns(returns).summary()["sharpe"]
+    )
+    with pytest.raises(ValueError, match="different numbers of bars"):
+        PerformanceAnalyzer.concat([PerformanceAnalyzer.from_returns(returns[0, :10]), stacked])
+
+
+def test_empty_analyzer_is_nan() -> None:
+    """Test that ratios are undefined before any bars."""
+    summary = PerformanceAnalyzer().summary()
+    assert np.isnan(summary["sharpe"])
+    assert np.isnan(summary["win_rate"])
+    assert summary["max_drawdown"] == 0
+
+
+def test_matches_engine_results() -> None:
+    """Test the analyzer against the vectorised summary and the event engine's live metrics."""
+    panel = generate_market_panel(5, 250, seed=2, include_vix=False, dtype=np.float64)
+    weights = np.full((5, 250), 0.2)
+    result = VectorBacktestEngine.from_panel(panel).run(weights)
+    summary = PerformanceAnalyzer.from_returns(result.returns).summary()
+    for name in ("sharpe", "max_drawdown"):
+        assert summary[name] == pytest.approx(result.summary()[name])
+
+    class BuyFirst(EventStrategy):
+        def on_start(self, engine):
+            engine.submit(Order(0, 1000))
+
+    engine = EventBacktestEngine.from_panel(panel)
+    events = engine.run(BuyFirst())
+    live = engine.analyzer.summary()
+    assert live["total_return"] == pytest.approx(events.equity[-1] / engine.initial_capital - 1)
+    assert live["sharpe"] == pytest.approx(PerformanceAnalyzer.from_returns(events.returns).summary()["sharpe"])
+    assert 0 < live["exposure"] < 1
@@ -0,0 +1,210 @@
+"""
+Tests for the event-driven backtest engine.
+"""
+
+import numpy as np
+import pytest
+
+from trading_strategy_development.backtest.events import (
+    BAR_DTYPE,
+    EventBacktestEngine,
+    EventRing,
+    EventStrategy,
+    Fill,
+    Order,
+    OrderStatus,
+    OrderType,
+    Position,
+    bars_from_panel,
+)
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+def make_bars(rows):
+    """Build single-ticker bars from (open, high, low, close) tuples."""
+    bars = np.zeros((len(rows), 1), dtype=BAR_DTYPE)
+    for t, (open_, high, low, close) in enumerate(rows):
+        bars[t, 0] = (open_, high, low, close, 1000.0)
+    return bars
+
+
+class ScriptedStrategy(EventStrategy):
+    """Submit given orders on given dates and record fills."""
+
+    def __init__(self, orders_by_date):
+        self.orders_by_date = orders_by_date
+        self.fills = []
+
+    def on_bar(self, engine, t, bars):
+        for order in self.orders_by_date.get(t, []):
+            engine.submit(order)
+
+    def on_fill(self, engine, fill):
+        self.fills.append(fill)
+
+
+def test_market_order_fills_at_next_open_with_costs() -> None:
+    """Test that a market order fills at the next open with slippage and commission."""
+    bars = make_bars([(100, 101, 99, 100), (102, 104, 101, 103), (103, 105, 102, 104)])
+    engine = EventBacktestEngine(bars, initial_capital=10_000, commission_bps=10, slippage_bps=100)
+    strategy = ScriptedStrategy({0: [Order(0, 10)]})
+
+    result = engine.run(strategy)
+
+    (fill,) = result.fills
+    assert fill.date == 1
+    assert fill.price == pytest.approx(102 * 1.01)
+    assert fill.commission == pytest.approx(10 * 102 * 1.01 * 0.001)
+    assert strategy.fills == [fill]
+    assert result.positions[0].quantity == 10
+    assert result.equity[0] == 10_000
+    assert result.equity[2] == pytest.approx(10_000 - 10 * fill.price - fill.commission + 10 * 104)
+
+
+def test_stop_and_limit_orders() -> None:
+    """Test trigger conditions and gap handling of stop and limit orders."""
+    bars = make_bars(
+        [
+            (100, 100, 100, 100),
+            (100, 101, 96, 98),  # limit buy at 97 fills at 97
+            (99, 99, 97, 98),
+            (90, 92, 89, 91),  # gaps below the stop at 95: fills at the open
+        ]
+    )
+    engine = EventBacktestEngine(bars, commission_bps=0, slippage_bps=0)
+    strategy = ScriptedStrategy(
+        {0: [Order(0, 5, OrderType.LIMIT, limit_price=97)], 1: [Order(0, -5, OrderType.STOP, stop_price=95)]}
+    )
+
+    result = engine.run(strategy)
+
+    assert [(fill.date, fill.quantity, fill.price) for fill in result.fills] == [(1, 5, 97), (3, -5, 90)]
+    assert result.positions[0].quantity == 0
+    assert result.positions[0].realized_pnl == pytest.approx(5 * (90 - 97))
+
+
+def test_trailing_stop_ratchets_with_highs() -> None:
+    """Test that a trailing stop follows new highs and exits on the pullback."""
+    bars = make_bars(
+        [
+            (100, 100, 100, 100),
+            (100, 110, 100, 108),  # stop rises to 99 after this bar
+            (108, 120, 107, 118),  # stop rises to 108
+            (115, 116, 105, 106),  # triggers at 108
+        ]
+    )
+    engine = EventBacktestEngine(bars, commission_bps=0, slippage_bps=0)
+    order = Order(0, -1, OrderType.TRAILING_STOP, trail=0.1)
+    strategy = ScriptedStrategy({0: [Order(0, 1), order]})
+
+    result = engine.run(strategy)
+
+    assert order.status == OrderStatus.FILLED
+    assert result.fills[-1].date == 3
+    assert result.fills[-1].price == pytest.approx(108)
+
+
+def test_cancelled_orders_do_not_fill() -> None:
+    """Test that cancelling a pending order removes it from the book."""
+
+    class CancelStrategy(EventStrategy):
+        def on_bar(self, engine, t, bars):
+            if t == 0:
+                self.order = engine.submit(Order(0, 1, OrderType.LIMIT, limit_price=50))
+            elif t == 1:
+                engine.cancel(self.order)
+
+    bars = make_bars([(100, 100, 100, 100), (100, 100, 99, 99), (40, 45, 40, 42)])
+    result = EventBacktestEngine(bars).run(CancelStrategy())
+    assert result.fills == []
+
+
+def test_order_subclasses_are_queued_as_orders() -> None:
+    """Test that orders are dispatched by type, so an Order subclass is not treated as a fill."""
+
+    class TaggedOrder(Order):
+        __slots__ = ("tag",)
+
+    bars = make_bars([(100, 100, 100, 100), (101, 102, 100, 101), (102, 103, 101, 102)])
+    order = TaggedOrder(0, 5)
+    result = EventBacktestEngine(bars, commission_bps=0, slippage_bps=0).run(ScriptedStrategy({0: [order]}))
+
+    assert order.status == OrderStatus.FILLED
+    (fill,) = result.fills
+    assert (fill.date, fill.price) == (1, 101)
+
+
+def test_run_stops_when_equity_is_wiped_out() -> None:
+    """Test that the run stops at ruin instead of producing inf/NaN returns."""
+    bars = make_bars([(10, 10, 10, 10), (10, 10, 10, 10), (10, 10, 5, 5), (5, 5, 0, 0), (10, 10, 10, 10)])
+    engine = EventBacktestEngine(bars, initial_capital=1_000, commission_bps=0, slippage_bps=0)
+
+    result = engine.run(ScriptedStrategy({0: [Order(0, 100)]}))
+
+    assert result.ruined_at == 3
+    np.testing.assert_allclose(result.equity, [1_000, 1_000, 500, 0, 0])
+    np.testing.assert_allclose(result.returns, [0, 0, -0.5, -1, 0])
+    assert engine.analyzer.count == 4
+    assert np.isfinite(engine.analyzer.mean)
+    assert np.isfinite(engine.analyzer.exposure)
+
+
+def test_position_accounting() -> None:
+    """Test average price and realised profit through adds, partial closes and flips."""
+    position = Position(0)
+    position.apply(Fill(0, 0, 10, 100.0, commission=0.0, date=0))
+    position.apply(Fill(1, 0, 10, 110.0, commission=0.0, date=1))
+    assert position.average_price == pytest.approx(105)
+    position.apply(Fill(2, 0, -5, 120.0, commission=0.0, date=2))
+    assert position.realized_pnl == pytest.approx(75)
+    position.apply(Fill(3, 0, -20, 100.0, commission=0.0, date=3))
+    assert position.quantity == -5
+    assert position.average_price == 100
+    assert position.realized_pnl == pytest.approx(75 - 75)
+
+
+def test_zero_quantity_fill_leaves_position_unchanged() -> None:
+    """Test that an empty fill is a no-op, including on a flat position."""
+    position = Position(0)
+    position.apply(Fill(0, 0, 0, 100.0, commission=0.0, date=0))
+    assert (position.quantity, position.average_price, position.realized_pnl) == (0, 0.0, 0.0)
+
+    position.apply(Fill(1, 0, 10, 100.0, commission=0.0, date=1))
+    position.apply(Fill(2, 0, 0, 120.0, commission=0.0, date=2))
+    assert (position.quantity, position.average_price, position.realized_pnl) == (10, 100.0, 0.0)
+
+
+def test_event_ring_grows_and_keeps_order() -> None:
+    """Test FIFO order across wrap-around and growth."""
+    ring = EventRing(capacity=2)
+    ring.push(Order(0, 1))
+    first = ring.pop()
+    orders = [Order(i, 1) for i in range(5)]
+    for order in orders:
+        ring.push(order)
+    assert len(ring) == 5
+    assert [ring.pop() for _ in range(5)] == orders
+    assert first.ticker == 0
+    with pytest.raises(IndexError):
+        ring.pop()
+
+
+def test_runs_on_panel_and_reports_throughput() -> None:
+    """Test a stop-protected buy-and-hold over a synthetic panel."""
+
+    class ProtectedHold(EventStrategy):
+        def on_start(self, engine):
+            size = engine.initial_capital / len(engine.tickers) / 100
+            for ticker in range(len(engine.tickers)):
+                engine.submit(Order(ticker, size))
+                engine.submit(Order(ticker, -size, OrderType.TRAILING_STOP, trail=0.15))
+
+    panel = generate_market_panel(50, 500, seed=11, include_vix=False, dtype=np.float64)
+    engine = EventBacktestEngine.from_panel(panel)
+    result = engine.run(ProtectedHold())
+
+    assert result.equity.shape == (500,)
+    assert len(result.fills) > 50
+    assert result.bars_per_second > 0
+    np.testing.assert_allclose(engine.equity(), result.equity[-1])
+    np.testing.assert_array_equal(bars_from_panel(panel)["close"], panel.field("Close").T)
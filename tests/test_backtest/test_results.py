@@ -0,0 +1,89 @@
+"""
+Tests for the SQLite results store.
+"""
+
+import numpy as np
+import pytest
+
+from trading_strategy_development.backtest.results import ResultsStore
+from trading_strategy_development.backtest.sweep import SweepResult, param_grid, run_sweep
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+def sma_curve(panel, params):
+    """Return metrics and the equity curve of a long-above-average strategy; module level for the pool."""
+    close = panel.field("Close")
+    window = params["window"]
+    average = np.full(close.shape, np.nan)
+    cumulative = np.cumsum(close, axis=1)
+    average[:, window - 1 :] = (
+        cumulative[:, window - 1 :] - np.pad(cumulative, ((0, 0), (1, 0)))[:, :-window]
+    ) / window
+    held = np.zeros(close.shape)
+    held[:, 1:] = (close > average)[:, :-1]
+    returns = np.nanmean(held[:, 1:] * (close[:, 1:] / close[:, :-1] - 1), axis=0)
+    equity = np.cumprod(1 + returns)
+    return {"total_return": float(equity[-1] - 1), "threshold": params["vix_threshold"] / 10}, equity
+
+
+def results(grid):
+    return [SweepResult(params, {"sharpe": float(i), "drawdown": -i / 10}) for i, params in enumerate(grid)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(tmp_path / "runs.db") as store:
+        yield store
+
+
+def test_top_k_with_filters(store) -> None:
+    """Test ranking by a metric restricted by parameter and metric conditions."""
+    grid = param_grid(vix_threshold=[20, 25, 30], window=np.array([10, 50]))
+    assert store.append(results(grid), sweep="vix", batch_size=4) == 6
+
+    best = store.top("sharpe", 2, vix_threshold=(">=", 25))
+    assert best["sharpe"].tolist() == [5.0, 4.0]
+    assert (best["vix_threshold"] >= 25).all()
+    assert store.top("sharpe", 10, window=10, sweep="vix")["sharpe"].tolist() == [4.0, 2.0, 0.0]
+    assert store.top("drawdown", 1, ascending=True)["sharpe"].tolist() == [5.0]
+    assert len(store.load(sharpe=("<", 2))) == 2
+    assert store.params == ["vix_threshold", "window"]
+    assert store.metrics == ["drawdown", "sharpe"]
+    assert store.sweeps() == ["vix"]
+
+
+def test_failed_runs_and_new_columns(store) -> None:
+    """Test that failed runs are kept but not ranked, and later runs may add parameters."""
+    store.append([SweepResult({"a": 1}, {"sharpe": 1.0}), SweepResult({"a": 2}, error="ValueError: bad")])
+    store.append([SweepResult({"a": 3, "b": "x"}, {"sharpe": 0.5, "sortino": float("nan")})])
+
+    assert store.top("sharpe")["a"].tolist() == [1, 3]
+    assert store.top("sortino").empty
+    frame = store.load()
+    assert frame["error"].notna().sum() == 1
+    assert frame["b"].isna().sum() == 2
+    with pytest.raises(KeyError, match="missing"):
+        store.top("missing")
+    with pytest.raises(ValueError, match="comparison"):
+        store.top("sharpe", a=("LIKE", 1))
+    with pytest.raises(ValueError, match="valid"):
+        store.append([SweepResult({"bad name": 1}, {})])
+    assert len(store) == 3
+
+
+def test_streams_sweep_with_curves(tmp_path) -> None:
+    """Test appending the stream of a parallel sweep, including equity curves, and reopening the store."""
+    panel = generate_market_panel(5, 120, seed=1, include_vix=False, dtype=np.float64)
+    grid = param_grid(vix_threshold=[20, 30], window=[5, 20])
+    path = tmp_path / "sweeps" / "runs.db"
+    with ResultsStore(path) as store:
+        store.append(run_sweep(panel, grid, sma_curve, max_workers=2), sweep="sma", batch_size=3)
+
+    with ResultsStore(path) as store:
+        best = store.top("total_return", 1)
+        curve = store.curve(int(best.index[0]))
+        assert curve.shape == (119,)
+        assert curve[-1] - 1 == pytest.approx(best["total_return"].iloc[0])
+        assert len(store.load(sweep="sma", threshold=3.0)) == 2
+        with pytest.raises(KeyError, match="curve"):
+            store.curve(999)
@@ -0,0 +1,151 @@
+"""
+Tests for the shared-memory parameter sweep runner.
+"""
+
+import linecache
+
+import numpy as np
+import pytest
+
+from trading_strategy_development.backtest.sweep import (
+    SharedPanel,
+    SweepResult,
+    evaluate_chunk,
+    param_grid,
+    run_sweep,
+    sweep_key,
+)
+from trading_strategy_development.backtest.vectorized import VectorBacktestEngine, weights_from_signals
+from trading_strategy_development.data.panel import PricePanel
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+def momentum_sharpe(panel, params):
+    """Evaluate a momentum strategy; module level so worker processes can import it."""
+    if params["window"] <= 0:
+        raise ValueError("window must be positive")
+    close = panel.field("Close")
+    window = params["window"]
+    momentum = np.zeros(close.shape)
+    momentum[:, window:] = close[:, window:] / close[:, :-window] - 1
+    engine = VectorBacktestEngine(close, slippage_bps=params["slippage_bps"])
+    summary = engine.run(weights_from_signals(np.sign(momentum))).summary()
+    return {"sharpe": float(summary["sharpe"]), "writeable": float(close.flags.writeable)}
+
+
+def logged_evaluation(panel, params):
+    """Record every evaluation in a log file so tests can count them across processes."""
+    with open(params["log"], "a") as log:
+        log.write(f"{params['x']}\n")
+    return {"square": float(params["x"] ** 2)}
+
+
+@pytest.fixture
+def panel():
+    return generate_market_panel(10, 200, seed=5, include_vix=False, dtype=np.float64)
+
+
+def test_param_grid() -> None:
+    """Test that the grid holds every combination in order."""
+    assert param_grid(a=[1, 2], b="xy") == [
+        {"a": 1, "b": "x"},
+        {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"},
+        {"a": 2, "b": "y"},
+    ]
+
+
+def test_sweep_matches_serial_evaluation(panel) -> None:
+    """Test that the parallel sweep returns the same metrics as evaluating in process."""
+    grid = param_grid(window=[5, 10, 20, 40, 0], slippage_bps=[0, 5])
+
+    results = list(run_sweep(panel, grid, momentum_sharpe, max_workers=2, chunk_size=3))
+
+    assert len(results) == len(grid)
+    by_params = {tuple(result.params.values()): result for result in results}
+    for expected in evaluate_chunk(momentum_sharpe, grid, panel):
+        result = by_params[tuple(expected.params.values())]
+        assert result.error == expected.error
+        if expected.error is None:
+            assert result.metrics["sharpe"] == pytest.approx(expected.metrics["sharpe"])
+            assert result.metrics["writeable"] == 0.0  # Workers see a read-only view of shared memory
+    assert sum(result.error is not None for result in results) == 2
+
+
+def test_sweep_accepts_mapping_and_empty_grid(panel) -> None:
+    """Test that a mapping of axes is expanded and an empty grid yields nothing."""
+    results = list(run_sweep(panel, {"window": [5], "slippage_bps": [1, 2]}, momentum_sharpe, max_workers=1))
+    assert sorted(result.params["slippage_bps"] for result in results) == [1, 2]
+    assert all(isinstance(result, SweepResult) for result in results)
+    assert list(run_sweep(panel, [], momentum_sharpe)) == []
+
+
+def test_shared_panel_round_trip(panel) -> None:
+    """Test that an attached view matches the panel and the segment is released on exit."""
+    with SharedPanel(panel) as shared:
+        view, segment = shared.handle.attach()
+        np.testing.assert_array_equal(view.values, panel.values)
+        assert list(view.tickers) == list(panel.tickers)
+        assert view.dates.equals(panel.dates)
+        del view
+        segment.close()
+    with pytest.raises(RuntimeError, match="not open"):
+        _ = shared.handle
+
+
+def test_sweep_resumes_from_checkpoint(panel, tmp_path) -> None:
+    """Test that an interrupted sweep only evaluates the chunks that were not checkpointed."""
+    log = tmp_path / "evaluations.log"
+    grid = param_grid(x=range(10), log=[str(log)])
+    checkpoint_dir = tmp_path / "checkpoint"
+
+    sweep = run_sweep(panel, grid, logged_evaluation, max_workers=1, chunk_size=2, checkpoint_dir=checkpoint_dir)
+    first = [next(sweep), next(sweep)]
+    sweep.close()  # Interrupted after the first chunk was yielded
+    assert len(list(checkpoint_dir.glob("chunk-*.pkl"))) == 1
+    assert not list(checkpoint_dir.glob("*.tmp"))
+
+    log.unlink()
+    resumed = list(run_sweep(panel, grid, logged_evaluation, max_workers=2, checkpoint_dir=checkpoint_dir))
+
+    assert resumed[:2] == first
+    assert sorted(result.metrics["square"] for result in resumed) == [float(x**2) for x in range(10)]
+    assert len(log.read_text().split()) == 8
+    log.unlink()
+    assert len(list(run_sweep(panel, grid, logged_evaluation, checkpoint_dir=checkpoint_dir))) == 10
+    assert not log.exists()
+
+
+def test_checkpoint_belongs_to_one_sweep(panel, tmp_path) -> None:
+    """Test that a checkpoint cannot be resumed with a different grid or chunk size."""
+    grid = param_grid(window=[5, 10], slippage_bps=[0])
+    list(run_sweep(panel, grid, momentum_sharpe, max_workers=1, chunk_size=1, checkpoint_dir=tmp_path))
+
+    with pytest.raises(ValueError, match="different sweep"):
+        list(run_sweep(panel, param_grid(window=[20], slippage_bps=[0]), momentum_sharpe, checkpoint_dir=tmp_path))
+    with pytest.raises(ValueError, match="chunk_size"):
+        list(run_sweep(panel, grid, momentum_sharpe, chunk_size=2, checkpoint_dir=tmp_path))
+
+
+def test_sweep_key_covers_data_and_evaluator_source(panel, tmp_path) -> None:
+    """Test that a checkpoint cannot be resumed on changed data or with a changed evaluator."""
+    grid = param_grid(window=[5], slippage_bps=[0])
+    list(run_sweep(panel, grid, momentum_sharpe, max_workers=1, checkpoint_dir=tmp_path))
+
+    changed = PricePanel(panel.values * 1.01, panel.tickers, panel.dates, panel.fields)
+    with pytest.raises(ValueError, match="different sweep"):
+        list(run_sweep(changed, grid, momentum_sharpe, max_workers=1, checkpoint_dir=tmp_path))
+
+    first, second = _evaluator("return {'sharpe': 1.0}"), _evaluator("return {'sharpe': 2.0}")
+    assert sweep_key(first, grid, panel) != sweep_key(second, grid, panel)
+    assert sweep_key(first, grid, panel) == sweep_key(_evaluator("return {'sharpe': 1.0}"), grid, panel)
+
+
+def _evaluator(body):
+    """Compile an evaluator with the same name but the given body, its source registered for inspect."""
+    source = f"def evaluate(panel, params):\n    {body}\n"
+    filename = f"<evaluator {body}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(keepends=True), filename)
+    namespace = {}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["evaluate"]
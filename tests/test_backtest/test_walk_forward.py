@@ -0,0 +1,125 @@
+"""
+Tests for the walk-forward driver.
+"""
+
+import numpy as np
+import pytest
+
+from trading_strategy_development.backtest.walk_forward import (
+    feature_panel,
+    run_chain,
+    run_walk_forward,
+    walk_forward_windows,
+)
+from trading_strategy_development.data.features import TARGET_COLUMN, TARGET_HORIZON
+from trading_strategy_development.data.indicator_cache import IndicatorCache
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+def fit_mean_reversion(train, previous):
+    """Fit the slope of next-day returns on RSI by gradient descent, starting from the previous slope."""
+    x = train.field("rsi_14").ravel().astype(np.float64) / 100 - 0.5
+    y = train.field(TARGET_COLUMN).ravel().astype(np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    slope, steps = (previous["slope"] if previous else 0.0), 0
+    while steps < 10_000:
+        gradient = ((slope * x - y) * x).mean()
+        if abs(gradient) < 1e-9:
+            break
+        slope -= 10 * gradient
+        steps += 1
+    return {"slope": slope, "steps": steps}
+
+
+def score(model, test):
+    x = test.field("rsi_14").astype(np.float64) / 100 - 0.5
+    y = test.field(TARGET_COLUMN).astype(np.float64)
+    hit = np.sign(model["slope"] * x) == np.sign(y)
+    return {"hit_rate": float(np.nanmean(hit)), "n_dates": float(len(test.dates))}
+
+
+@pytest.fixture
+def panel():
+    return generate_market_panel(8, 300, seed=9, dtype=np.float64)
+
+
+def test_windows_roll_and_anchor() -> None:
+    """Test rolling, anchored and gapped window layouts."""
+    rolling = walk_forward_windows(10, train_size=4, test_size=2, gap=0)
+    assert [(w.train_start, w.train_end, w.test_start, w.test_end) for w in rolling] == [
+        (0, 4, 4, 6),
+        (2, 6, 6, 8),
+        (4, 8, 8, 10),
+    ]
+    anchored = walk_forward_windows(10, train_size=4, test_size=2, gap=1, anchored=True)
+    assert [(w.train_start, w.train_end, w.test_start) for w in anchored] == [(0, 4, 5), (0, 6, 7)]
+    with pytest.raises(ValueError, match="positive"):
+        walk_forward_windows(10, train_size=0, test_size=2)
+    with pytest.raises(ValueError, match="positive"):
+        walk_forward_windows(10, train_size=4, test_size=2, step=0)
+
+
+def test_default_gap_keeps_test_prices_out_of_training_labels(panel) -> None:
+    """Test that the last training label is not computed from a test-window price."""
+    features = feature_panel(panel)
+    close = features.field("close").astype(np.float64)
+    for window in walk_forward_windows(len(features.dates), train_size=100, test_size=25):
+        assert window.test_start - window.train_end == TARGET_HORIZON
+        # The last training label is the return into this close, which precedes the test window
+        label_date = window.train_end - 1 + TARGET_HORIZON
+        assert label_date < window.test_start
+        np.testing.assert_allclose(
+            window.train(features).field(TARGET_COLUMN)[:, -1],
+            close[:, label_date] / close[:, label_date - 1] - 1,
+            rtol=1e-4,
+        )
+
+
+def test_feature_panel_matches_per_window_features(panel) -> None:
+    """Test that slicing full-history features equals recomputing finite-window features on the window."""
+    cache = IndicatorCache()
+    features = feature_panel(panel, cache=cache)
+    assert "^VIX" not in features.tickers
+    assert {"close", "vix", "rsi_14", TARGET_COLUMN} <= set(features.fields)
+
+    window = walk_forward_windows(len(panel.dates), train_size=120, test_size=60, gap=0)[2]
+    recomputed = feature_panel(panel.select(start=panel.dates[window.train_start]))
+    train = window.train(features)
+    assert np.shares_memory(train.values, features.values)
+    warm = slice(60, None)
+    for name in ("sma_50", "volatility_20", "close_to_sma_20"):
+        np.testing.assert_allclose(
+            train.field(name)[:, warm], recomputed.field(name)[:, : len(train.dates)][:, warm], rtol=1e-6
+        )
+    feature_panel(panel, cache=cache)
+    assert cache.stats.hits > 0
+
+
+def test_parallel_walk_forward_matches_serial_chain(panel) -> None:
+    """Test that parallel chains reproduce serial results and warm-start all but each chain's first window."""
+    features = feature_panel(panel)
+    windows = walk_forward_windows(len(features.dates), train_size=100, test_size=25)
+
+    results = run_walk_forward(features, windows, fit_mean_reversion, score, max_workers=2)
+
+    assert [result.window for result in results] == windows
+    assert [result.warm_started for result in results].count(False) == 2
+    cold = run_chain(fit_mean_reversion, score, windows, warm_start=False, features=features)
+    for result, expected in zip(results, cold, strict=True):
+        assert result.model["slope"] == pytest.approx(expected.model["slope"], abs=1e-6)
+        assert result.metrics["n_dates"] == 25
+    warm_steps = sum(result.model["steps"] for result in results if result.warm_started)
+    cold_steps = sum(
+        expected.model["steps"] for expected, result in zip(cold, results, strict=True) if result.warm_started
+    )
+    assert warm_steps < cold_steps
+
+
+def test_independent_windows(panel) -> None:
+    """Test that without warm starts every window is fitted from scratch."""
+    features = feature_panel(panel)
+    windows = walk_forward_windows(len(features.dates), train_size=150, test_size=50)
+    results = run_walk_forward(features, windows, fit_mean_reversion, score, warm_start=False, max_workers=2)
+    assert not any(result.warm_started for result in results)
+    assert run_walk_forward(features, [], fit_mean_reversion, score) == []
@@ -0,0 +1,115 @@
+"""
+Tests for the Parquet price cache.
+"""
+
+import numpy as np
+import pandas as pd
+
+from trading_strategy_development.data.cache import PriceCache, download_universe_cached
+
+
+class RangeProvider:
+    """Provider that serves business-day bars for the requested range and records calls."""
+
+    rate_limiter = None
+
+    def __init__(self, listed=None, failing=()):
+        self.calls = []
+        self.listed = listed
+        self.failing = set(failing)
+
+    def get_constituents(self):
+        raise NotImplementedError
+
+    def download(self, tickers, *, period, start, end, interval):
+        self.calls.append((tuple(tickers), start, end))
+        if self.failing & set(tickers):
+            raise ConnectionError("down")
+        dates = pd.bdate_range(start, end, inclusive="left")
+        served = [ticker for ticker in tickers if self.listed is None or ticker in self.listed]
+        columns = pd.MultiIndex.from_product([["Close", "Volume"], served])
+        values = np.tile(np.arange(len(dates), dtype=float)[:, None], len(columns))
+        return pd.DataFrame(values, index=dates, columns=columns)
+
+
+def test_cache_only_fetches_missing_ranges(tmp_path) -> None:
+    """Test that a second run only downloads the range added since the first."""
+    cache = PriceCache(tmp_path)
+    provider = RangeProvider()
+
+    first = download_universe_cached(
+        ["A", "B"], start="2024-01-01", end="2024-02-01", include_vix=False, cache=cache, provider=provider
+    )
+    assert provider.calls == [(("A", "B"), "2024-01-01", "2024-02-01")]
+    assert len(first) == len(pd.bdate_range("2024-01-01", "2024-01-31"))
+
+    second = download_universe_cached(
+        ["A", "B"], start="2024-01-01", end="2024-03-01", include_vix=False, cache=cache, provider=provider
+    )
+    assert provider.calls[1:] == [(("A", "B"), "2024-02-01", "2024-03-01")]
+    assert second.index.min() == pd.Timestamp("2024-01-01")
+    assert second.index.max() == pd.Timestamp("2024-02-29")
+    assert set(second.columns.get_level_values("Ticker")) == {"A", "B"}
+
+
+def test_cache_serves_fully_covered_request_from_disk(tmp_path) -> None:
+    """Test that a covered range is loaded without any download and survives a new cache instance."""
+    provider = RangeProvider()
+    download_universe_cached(
+        ["A"], start="2023-12-01", end="2024-02-01", include_vix=False, cache=PriceCache(tmp_path), provider=provider
+    )
+
+    data = download_universe_cached(
+        ["A"], start="2023-12-15", end="2024-01-15", include_vix=False, cache=PriceCache(tmp_path), provider=provider
+    )
+
+    assert len(provider.calls) == 1
+    assert data.index.min() >= pd.Timestamp("2023-12-15")
+    assert data.index.max() < pd.Timestamp("2024-01-15")
+
+
+def test_missing_ranges_reports_interior_gaps(tmp_path) -> None:
+    """Test gap detection around stored ranges."""
+    cache = PriceCache(tmp_path)
+    empty = pd.DataFrame(columns=["Close"], index=pd.DatetimeIndex([]))
+    cache.store("A", "1d", empty, (pd.Timestamp("2024-01-10"), pd.Timestamp("2024-01-20")))
+
+    gaps = cache.missing_ranges("A", "1d", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01"))
+
+    assert gaps == [
+        (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-10")),
+        (pd.Timestamp("2024-01-20"), pd.Timestamp("2024-02-01")),
+    ]
+
+
+def test_cache_does_not_refetch_gaps_without_bars(tmp_path) -> None:
+    """Test that a weekend-only gap and a ticker without any bars are recorded as covered."""
+    cache = PriceCache(tmp_path)
+    provider = RangeProvider(listed={"A"})
+    download_universe_cached(
+        ["A", "B"], start="2024-01-01", end="2024-02-03", include_vix=False, cache=cache, provider=provider
+    )
+    assert cache.missing_ranges("B", "1d", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-03")) == []
+
+    # 2024-02-03 and 2024-02-04 are a weekend
+    for _ in range(2):
+        data = download_universe_cached(
+            ["A", "B"], start="2024-01-01", end="2024-02-05", include_vix=False, cache=cache, provider=provider
+        )
+    assert provider.calls[1:] == [(("A", "B"), "2024-02-03", "2024-02-05")]
+    assert set(data.columns.get_level_values("Ticker")) == {"A"}
+
+
+def test_cache_refetches_failed_batches(tmp_path, monkeypatch) -> None:
+    """Test that tickers whose batch failed are not marked as covered."""
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    cache = PriceCache(tmp_path)
+    provider = RangeProvider(failing={"B"})
+    download_universe_cached(
+        ["A", "B"], start="2024-01-01", end="2024-02-01", include_vix=False, cache=cache, provider=provider, batch_size=1
+    )
+
+    assert cache.missing_ranges("A", "1d", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")) == []
+    assert cache.missing_ranges("B", "1d", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")) == [
+        (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01"))
+    ]
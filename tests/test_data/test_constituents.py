@@ -0,0 +1,95 @@
+"""
+Tests for the constituents cache.
+"""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from trading_strategy_development.data.constituents import ConstituentsCache, reconstruct_snapshots
+from trading_strategy_development.data.retrieval import get_sp500_tickers
+
+CHANGES = pd.DataFrame(
+    {
+        "date": pd.to_datetime(["2024-03-18", "2023-06-20", "2023-06-20"]),
+        "added": ["C", "B", pd.NA],
+        "removed": ["X", "Y", "Z"],
+    }
+)
+
+
+def make_fetcher(current=("A", "B", "C")):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return list(current), CHANGES
+
+    fetch.calls = calls
+    return fetch
+
+
+def test_reconstruct_snapshots_undoes_changes() -> None:
+    """Test that historical membership is rebuilt from the change log."""
+    snapshots = reconstruct_snapshots(["A", "B", "C"], CHANGES, date(2024, 6, 1))
+
+    assert snapshots[date(2024, 6, 1)] == ["A", "B", "C"]
+    assert snapshots[date(2024, 3, 18)] == ["A", "B", "C"]
+    assert snapshots[date(2023, 6, 20)] == ["A", "B", "X"]
+
+
+def test_members_as_of_uses_point_in_time_snapshot(tmp_path) -> None:
+    """Test point-in-time lookups between and before snapshots."""
+    cache = ConstituentsCache(make_fetcher(), cache_dir=tmp_path)
+
+    assert cache.members() == ["A", "B", "C"]
+    assert cache.members("2023-12-31") == ["A", "B", "X"]
+    assert cache.members(date(2024, 3, 18)) == ["A", "B", "C"]
+    with pytest.raises(ValueError, match="No constituents snapshot"):
+        cache.members("2020-01-01")
+
+
+def test_cache_is_reused_until_ttl_expires(tmp_path) -> None:
+    """Test that the fetcher is only called once per TTL, across cache instances."""
+    fetch = make_fetcher()
+    ConstituentsCache(fetch, cache_dir=tmp_path).members()
+    ConstituentsCache(fetch, cache_dir=tmp_path).members()
+    assert len(fetch.calls) == 1
+
+    expired = ConstituentsCache(fetch, cache_dir=tmp_path, ttl=timedelta(0))
+    expired.members()
+    assert len(fetch.calls) == 2
+
+
+def test_failed_refresh_falls_back_to_stale_snapshot(tmp_path) -> None:
+    """Test that a stale cache is served when the source is unavailable."""
+    ConstituentsCache(make_fetcher(), cache_dir=tmp_path).members()
+
+    def failing_fetch():
+        raise ConnectionError("offline")
+
+    cache = ConstituentsCache(failing_fetch, cache_dir=tmp_path, ttl=timedelta(0))
+    assert get_sp500_tickers(cache=cache) == ["A", "B", "C"]
+
+    with pytest.raises(ValueError, match="no cached copy"):
+        ConstituentsCache(failing_fetch, cache_dir=tmp_path / "empty").members()
+
+
+def test_failed_refresh_is_not_retried_until_interval_passes(tmp_path) -> None:
+    """Test that a failing source is only tried once per retry interval."""
+    ConstituentsCache(make_fetcher(), cache_dir=tmp_path).members()
+    calls = []
+
+    def failing_fetch():
+        calls.append(1)
+        raise ConnectionError("offline")
+
+    cache = ConstituentsCache(failing_fetch, cache_dir=tmp_path, ttl=timedelta(0))
+    for _ in range(3):
+        assert cache.members() == ["A", "B", "C"]
+    assert len(calls) == 1
+
+    cache.retry_interval = timedelta(0)
+    cache.members()
+    assert len(calls) == 2
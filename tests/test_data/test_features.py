@@ -0,0 +1,74 @@
+"""
+Tests for the vectorised indicator engine.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_strategy_development.data.features import (
+    engineer_features,
+    pct_change,
+    rolling_max,
+    rolling_std,
+    rsi,
+    sma,
+)
+from trading_strategy_development.data.filters import filter_high_volatility_days
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(0)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (4, 300)), axis=1))
+    values[1, :30] = np.nan  # Listed later than the others
+    return values
+
+
+def rolling_reference(values, method, window):
+    frame = pd.DataFrame(values.T)
+    return getattr(frame.rolling(window), method)().to_numpy().T
+
+
+def test_sma_and_std_match_pandas(closes) -> None:
+    """Test the cumulative-sum kernels against pandas rolling windows."""
+    np.testing.assert_allclose(sma(closes, 20), rolling_reference(closes, "mean", 20), rtol=1e-10)
+    np.testing.assert_allclose(rolling_std(closes, 20), rolling_reference(closes, "std", 20), rtol=1e-8)
+    np.testing.assert_allclose(rolling_max(closes, 10), rolling_reference(closes, "max", 10))
+    np.testing.assert_allclose(pct_change(closes), pd.DataFrame(closes.T).pct_change().to_numpy().T)
+
+
+def test_rsi_matches_wilder_smoothing(closes) -> None:
+    """Test RSI against the pandas exponential-weighting formulation."""
+    series = pd.Series(closes[0])
+    delta = series.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    expected = 100 - 100 / (1 + gain / loss)
+
+    result = rsi(closes, 14)
+
+    np.testing.assert_allclose(result[0], expected.to_numpy(), rtol=1e-10)
+    assert np.isnan(result[1, :44]).all()
+    assert not np.isnan(result[1, 44:]).any()
+
+
+def test_engineer_features_layout() -> None:
+    """Test the long float32 output and restriction to high-volatility dates."""
+    panel = generate_market_panel(20, 400, seed=2, dtype=np.float64)
+    high_vol = filter_high_volatility_days(panel, vix_threshold=20)
+
+    features = engineer_features(panel, dates=high_vol.dates)
+
+    assert features.index.names == ["Date", "Ticker"]
+    assert set(features.index.get_level_values("Date")) == set(high_vol.dates)
+    assert (features.dtypes == np.float32).all()
+    assert "^VIX" not in features.index.get_level_values("Ticker")
+    assert (features["vix"] > 20).all()
+    assert {"sma_20", "rsi_14", "volatility_20", "next_day_return"} <= set(features.columns)
+
+    ticker = panel.tickers[3]
+    row = features.xs(ticker, level="Ticker").iloc[-1]
+    close = panel.ticker(ticker)["Close"]
+    assert row["sma_20"] == pytest.approx(close.loc[: row.name].iloc[-20:].mean(), rel=1e-5)
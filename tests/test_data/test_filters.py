@@ -0,0 +1,57 @@
+"""
+Tests for the high-volatility filters.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_strategy_development.data.filters import VixThresholdIndex, filter_high_volatility_days
+from trading_strategy_development.data.synthetic import generate_market, generate_market_panel
+
+
+@pytest.fixture
+def market():
+    return generate_market(10, 500, seed=5)
+
+
+def test_mask_matches_direct_comparison(market) -> None:
+    """Test the binary-search mask against a plain comparison, including missing VIX values."""
+    market.iloc[3, market.columns.get_loc(("Close", "^VIX"))] = np.nan
+    vix = market[("Close", "^VIX")]
+    index = VixThresholdIndex(vix)
+
+    for threshold in (0, 15, 20, 25.5, 1000):
+        expected = (vix > threshold).to_numpy()
+        np.testing.assert_array_equal(index.mask(threshold), expected)
+        assert index.count_above(threshold) == expected.sum()
+
+    np.testing.assert_array_equal(index.masks([15, 20, 25]), np.vstack([vix > t for t in (15, 20, 25)]))
+
+
+def test_filter_frame(market) -> None:
+    """Test filtering the wide DataFrame layout."""
+    filtered = filter_high_volatility_days(market, vix_threshold=20)
+
+    assert (filtered[("Close", "^VIX")] > 20).all()
+    assert len(filtered) == (market[("Close", "^VIX")] > 20).sum()
+    assert filtered.columns.equals(market.columns)
+
+
+def test_filter_panel_matches_frame() -> None:
+    """Test that filtering a PricePanel selects the same days as the DataFrame layout."""
+    panel = generate_market_panel(10, 500, seed=5, dtype=np.float64)
+    index = VixThresholdIndex.from_data(panel)
+
+    filtered = filter_high_volatility_days(panel, vix_threshold=20, vix_index=index)
+    expected = filter_high_volatility_days(panel.to_frame(), vix_threshold=20)
+
+    pd.testing.assert_frame_equal(filtered.to_frame(), expected, check_freq=False)
+
+
+def test_filter_rejects_mismatched_index(market) -> None:
+    """Test that an index built from other data is rejected."""
+    index = VixThresholdIndex.from_data(market.iloc[:100])
+
+    with pytest.raises(ValueError, match="do not match"):
+        filter_high_volatility_days(market, vix_index=index)
@@ -0,0 +1,109 @@
+"""
+Tests for the indicator memoization cache.
+"""
+
+import numpy as np
+
+from trading_strategy_development.data.features import compute_indicators, sma
+from trading_strategy_development.data import indicator_cache
+from trading_strategy_development.data.indicator_cache import IndicatorCache
+from trading_strategy_development.data.synthetic import generate_market_panel
+
+
+def counting(func):
+    calls = []
+
+    def wrapper(values, **params):
+        calls.append(params)
+        return func(values, **params)
+
+    wrapper.calls = calls
+    return wrapper
+
+
+def test_results_are_shared_by_content_and_params() -> None:
+    """Test that equal inputs hit the cache and different parameters do not."""
+    cache = IndicatorCache()
+    kernel = counting(sma)
+    values = np.random.default_rng(0).random((5, 100))
+
+    first = cache.get_or_compute("sma", kernel, values, window=20)
+    again = cache.get_or_compute("sma", kernel, values.copy(), window=20)
+    other = cache.get_or_compute("sma", kernel, values, window=10)
+
+    assert again is first
+    assert not first.flags.writeable
+    assert len(kernel.calls) == 2
+    assert not np.array_equal(first, other, equal_nan=True)
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_lru_eviction_respects_byte_budget_and_spills(tmp_path) -> None:
+    """Test eviction of the least recently used result and reloading it from the spill directory."""
+    values = np.ones((10, 100))
+    cache = IndicatorCache(max_bytes=2 * values.nbytes, spill_dir=tmp_path)
+    kernel = counting(sma)
+
+    for window in (1, 2, 3):
+        cache.get_or_compute("sma", kernel, values, window=window)
+
+    assert len(cache) == 2
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats.evictions == 1
+
+    reloaded = cache.get_or_compute("sma", kernel, values, window=1)
+    assert cache.stats.spill_hits == 1
+    assert len(kernel.calls) == 3
+    np.testing.assert_array_equal(reloaded, sma(values, 1))
+
+
+def test_parameter_sweep_computes_each_indicator_once() -> None:
+    """Test that repeated feature computations on one panel reuse cached indicators."""
+    panel = generate_market_panel(20, 200, seed=1, dtype=np.float64)
+    cache = IndicatorCache()
+
+    first = compute_indicators(panel, sma_windows=(5, 20), cache=cache)
+    misses = cache.stats.misses
+    for windows in ((5,), (20,), (5, 20)):
+        compute_indicators(panel, sma_windows=windows, cache=cache)
+
+    assert cache.stats.misses == misses
+    np.testing.assert_array_equal(first["sma_20"], compute_indicators(panel, sma_windows=(20,))["sma_20"])
+
+
+def test_mutable_inputs_are_rehashed(tmp_path) -> None:
+    """Test that read-only views of writable data and memory maps are not served stale results."""
+    cache = IndicatorCache()
+    kernel = counting(sma)
+
+    base = np.random.default_rng(0).random((2, 50))
+    view = base.view()
+    view.flags.writeable = False
+    first = cache.get_or_compute("sma", kernel, view, window=5)
+    base += 1.0
+    second = cache.get_or_compute("sma", kernel, view, window=5)
+    assert len(kernel.calls) == 2
+    np.testing.assert_allclose(second, first + 1.0, equal_nan=True)
+
+    path = tmp_path / "values.npy"
+    np.save(path, np.zeros((2, 50)))
+    mapped = np.load(path, mmap_mode="r")
+    cache.get_or_compute("sma", kernel, mapped, window=5)
+    writer = np.load(path, mmap_mode="r+")
+    writer[:] = 2.0
+    writer.flush()
+    assert np.nanmax(cache.get_or_compute("sma", kernel, mapped, window=5)) == 2.0
+
+
+def test_frozen_inputs_reuse_their_fingerprint(monkeypatch) -> None:
+    """Test that read-only arrays owning their data are hashed once."""
+    hashed = counting(indicator_cache.fingerprint)
+    monkeypatch.setattr(indicator_cache, "fingerprint", hashed)
+    cache = IndicatorCache()
+    values = np.random.default_rng(0).random((2, 50))
+    values.flags.writeable = False
+
+    cache.get_or_compute("sma", sma, values, window=5)
+    cache.get_or_compute("sma", sma, values, window=10)
+    assert len(hashed.calls) == 1
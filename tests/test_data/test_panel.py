@@ -0,0 +1,96 @@
+"""
+Tests for the dense price panel.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_strategy_development.data import panel as panel_module
+from trading_strategy_development.data.panel import OHLCV_FIELDS, PricePanel
+
+
+@pytest.fixture
+def wide_frame():
+    dates = pd.date_range("2024-01-01", periods=4, freq="B")
+    columns = pd.MultiIndex.from_product([OHLCV_FIELDS, ["MSFT", "AAPL"]], names=["Price", "Ticker"])
+    values = np.arange(len(dates) * len(columns), dtype=float).reshape(len(dates), len(columns))
+    frame = pd.DataFrame(values, index=dates, columns=columns)
+    frame.iloc[0, 0] = np.nan
+    return frame
+
+
+def test_from_frame_round_trips(wide_frame) -> None:
+    """Test conversion to and from the wide DataFrame layout."""
+    panel = PricePanel.from_frame(wide_frame)
+
+    assert panel.shape == (5, 2, 4)
+    assert list(panel.tickers) == ["AAPL", "MSFT"]
+    assert panel.field("Close").flags.c_contiguous
+    np.testing.assert_array_equal(panel.field("Close")[1], wide_frame[("Close", "MSFT")].to_numpy())
+    round_trip = panel.to_frame()
+    expected = wide_frame.reindex(columns=round_trip.columns)
+    pd.testing.assert_frame_equal(round_trip, expected, check_freq=False, check_names=False)
+
+
+def test_float32_panel(wide_frame) -> None:
+    """Test that the dtype of the block can be reduced."""
+    panel = PricePanel.from_frame(wide_frame, dtype=np.float32)
+
+    assert panel.values.dtype == np.float32
+    assert panel.values.nbytes == 5 * 2 * 4 * 4
+
+
+def test_save_and_open_memory_maps(tmp_path, wide_frame) -> None:
+    """Test that a saved panel reopens as a read-only memory map with the same contents."""
+    panel = PricePanel.from_frame(wide_frame)
+    panel.save(tmp_path / "panel")
+
+    opened = PricePanel.open(tmp_path / "panel")
+
+    assert isinstance(opened.values, np.memmap)
+    assert not opened.values.flags.writeable
+    np.testing.assert_array_equal(opened.values, panel.values)
+    assert opened.dates.equals(panel.dates)
+    assert list(opened.tickers) == list(panel.tickers)
+
+
+def test_interrupted_save_is_not_opened(tmp_path, wide_frame, monkeypatch) -> None:
+    """Test that metadata marks a complete save, so a half-written panel is rejected."""
+    panel = PricePanel.from_frame(wide_frame)
+    panel.save(tmp_path / "panel")
+    smaller = panel.select(end=panel.dates[1])
+
+    def fail_on_dates(path, array):
+        if path.name == panel_module.DATES_FILE:
+            raise OSError("disk full")
+        save_array(path, array)
+
+    save_array = panel_module._save_array
+    monkeypatch.setattr(panel_module, "_save_array", fail_on_dates)
+    with pytest.raises(OSError, match="disk full"):
+        smaller.save(tmp_path / "panel")
+    with pytest.raises(FileNotFoundError, match="meta.json"):
+        PricePanel.open(tmp_path / "panel")
+
+
+def test_open_rejects_files_from_different_saves(tmp_path, wide_frame) -> None:
+    """Test that an index file that does not match the value block is detected."""
+    panel = PricePanel.from_frame(wide_frame)
+    path = panel.save(tmp_path / "panel")
+    np.save(path / "dates.npy", panel.dates.asi8[:-1])
+
+    with pytest.raises(ValueError, match="do not match"):
+        PricePanel.open(path)
+
+
+def test_select_subsets_tickers_and_dates(wide_frame) -> None:
+    """Test ticker and date selection."""
+    panel = PricePanel.from_frame(wide_frame)
+
+    subset = panel.select(["MSFT"], start="2024-01-02", end="2024-01-03")
+
+    assert subset.shape == (5, 1, 2)
+    assert subset.ticker("MSFT")["Open"].tolist() == wide_frame[("Open", "MSFT")].iloc[1:3].tolist()
+    with pytest.raises(KeyError):
+        panel.select(["GOOG"])
@@ -0,0 +1,88 @@
+"""
+Tests for the offline replay provider.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_strategy_development.data.panel import OHLCV_FIELDS, PricePanel
+from trading_strategy_development.data.replay import ReplayProvider
+from trading_strategy_development.data.retrieval import VIX_TICKER, download_universe
+from trading_strategy_development.utils.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def recording():
+    tickers = [f"T{i:02d}" for i in range(40)] + [VIX_TICKER]
+    dates = pd.bdate_range("2020-01-01", "2024-12-31")
+    columns = pd.MultiIndex.from_product([OHLCV_FIELDS, tickers], names=["Price", "Ticker"])
+    values = np.random.default_rng(0).random((len(dates), len(columns)))
+    return pd.DataFrame(values, index=dates, columns=columns)
+
+
+def test_replay_serves_requested_range(recording) -> None:
+    """Test slicing by tickers, start/end and period."""
+    provider = ReplayProvider(recording)
+
+    batch = provider.download(["T01", "T02"], period=None, start="2023-01-01", end="2023-02-01", interval="1d")
+    assert set(batch.columns.get_level_values("Ticker")) == {"T01", "T02"}
+    assert batch.index.min() >= pd.Timestamp("2023-01-01")
+    assert batch.index.max() < pd.Timestamp("2023-02-01")
+
+    recent = provider.download(["T01"], period="1y", start=None, end=None, interval="1d")
+    assert recent.index.min() >= pd.Timestamp("2023-12-31")
+    assert provider.get_constituents()[0] == [f"T{i:02d}" for i in range(40)]
+
+
+def test_concurrent_download_overlaps_latency(recording) -> None:
+    """Test that batches are fetched concurrently against simulated latency."""
+    provider = ReplayProvider(recording, latency=0.05)
+
+    started = time.perf_counter()
+    data = download_universe(provider=provider, batch_size=5, max_workers=9)
+    elapsed = time.perf_counter() - started
+
+    assert provider.stats.requests == 9
+    assert elapsed < provider.stats.simulated_latency / 2
+    assert data.shape == recording.shape
+
+
+def test_seeded_failures_are_retried_deterministically(recording) -> None:
+    """Test that simulated failures are reproducible and recovered by retries."""
+    runs = []
+    for _ in range(2):
+        provider = ReplayProvider(recording, failure_rate=0.3, seed=7)
+        data = download_universe(provider=provider, batch_size=5, max_workers=1, retry_delay=0, max_attempts=5)
+        runs.append(provider.stats.failures)
+        assert data.shape == recording.shape
+
+    assert runs[0] == runs[1] > 0
+
+
+def test_from_path_replays_saved_panel(tmp_path, recording) -> None:
+    """Test replaying a PricePanel recorded on disk."""
+    PricePanel.from_frame(recording).save(tmp_path / "panel")
+
+    provider = ReplayProvider.from_path(tmp_path / "panel")
+    data = download_universe(["T00"], provider=provider, include_vix=False)
+
+    np.testing.assert_allclose(data[("Close", "T00")], recording[("Close", "T00")].iloc[-len(data) :])
+
+
+def test_from_path_forwards_provider_options(tmp_path, recording) -> None:
+    """Test that from_path passes the rate limiter and constituents through to the provider."""
+    PricePanel.from_frame(recording).save(tmp_path / "panel")
+    limiter = RateLimiter(rate=100.0)
+    changes = pd.DataFrame({"date": [recording.index[0]], "added": ["T01"], "removed": ["T02"]})
+
+    provider = ReplayProvider.from_path(
+        tmp_path / "panel", rate_limiter=limiter, constituents=["T01"], changes=changes, seed=3
+    )
+
+    assert provider.rate_limiter is limiter
+    tickers, recorded_changes = provider.get_constituents()
+    assert tickers == ["T01"]
+    pd.testing.assert_frame_equal(recorded_changes, changes)
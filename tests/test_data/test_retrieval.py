@@ -0,0 +1,228 @@
+"""
+Tests for the data retrieval module.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_strategy_development.data import retrieval
+from trading_strategy_development.data.retrieval import (
+    VIX_TICKER,
+    CircuitBreaker,
+    CircuitOpenError,
+    YahooFinanceProvider,
+    download_universe,
+    retry,
+)
+from trading_strategy_development.utils.rate_limit import RateLimiter
+
+DATES = pd.date_range("2024-01-01", periods=5, freq="B")
+
+
+class StubProvider:
+    """Provider that records calls and fabricates OHLCV data."""
+
+    rate_limiter = None
+
+    def __init__(self, fail_tickers=(), flaky_tickers=()):
+        self.fail_tickers = set(fail_tickers)
+        self.flaky_tickers = set(flaky_tickers)
+        self.calls = []
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def get_constituents(self):
+        return ["A", "B"], pd.DataFrame(columns=["date", "added", "removed"])
+
+    def download(self, tickers, *, period, start, end, interval):
+        with self.lock:
+            self.calls.append(list(tickers))
+            key = tuple(tickers)
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+        if self.fail_tickers.intersection(tickers):
+            raise ConnectionError("provider unavailable")
+        if self.flaky_tickers.intersection(tickers) and self.attempts[key] == 1:
+            raise ConnectionError("transient failure")
+        columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Volume"], tickers])
+        values = np.arange(len(DATES) * len(columns), dtype=float).reshape(len(DATES), len(columns))
+        return pd.DataFrame(values, index=DATES, columns=columns)
+
+
+def test_download_universe_batches_tickers() -> None:
+    """Test that tickers are fetched in batches and VIX is appended."""
+    tickers = [f"T{i}" for i in range(23)]
+    provider = StubProvider()
+
+    data = download_universe(tickers, batch_size=10, max_workers=4, provider=provider)
+
+    assert len(provider.calls) == 3
+    assert all(len(call) <= 10 for call in provider.calls)
+    assert set(data.columns.get_level_values("Ticker")) == {*tickers, VIX_TICKER}
+    assert data.columns.names == ["Price", "Ticker"]
+    assert data.index.equals(DATES)
+
+
+def test_download_universe_retries_failed_batches() -> None:
+    """Test that a transient batch failure is retried."""
+    provider = StubProvider(flaky_tickers={"B"})
+
+    data = download_universe(["A", "B"], batch_size=1, include_vix=False, retry_delay=0, provider=provider)
+
+    assert provider.calls.count(["B"]) == 2
+    assert set(data.columns.get_level_values("Ticker")) == {"A", "B"}
+
+
+def test_download_universe_skips_batches_that_keep_failing() -> None:
+    """Test that a permanently failing batch is dropped without aborting the download."""
+    provider = StubProvider(fail_tickers={"B"})
+
+    data = download_universe(["A", "B"], batch_size=1, include_vix=False, retry_delay=0, provider=provider)
+
+    assert set(data.columns.get_level_values("Ticker")) == {"A"}
+
+
+class CountingLimiter(RateLimiter):
+    """Limiter that never waits and counts the tokens taken."""
+
+    def __init__(self):
+        super().__init__(rate=1.0)
+        self.reserved = 0
+
+    def reserve(self, tokens=1.0):
+        self.reserved += 1
+        return 0.0
+
+
+def test_download_universe_consults_rate_limiter_on_every_attempt() -> None:
+    """Test that the provider's limiter is taken before each request, retries included."""
+    provider = StubProvider(flaky_tickers={"B"})
+    provider.rate_limiter = CountingLimiter()
+
+    download_universe(["A", "B"], batch_size=1, include_vix=False, retry_delay=0, provider=provider)
+    assert provider.rate_limiter.reserved == len(provider.calls) == 3
+
+    override = CountingLimiter()
+    download_universe(["A"], include_vix=False, rate_limiter=override, provider=provider)
+    assert override.reserved == 1
+    assert provider.rate_limiter.reserved == 3
+
+
+def test_yahoo_provider_downloads_through_shared_limiter(monkeypatch) -> None:
+    """Test that the default Yahoo provider routes every batch through the shared Yahoo limiter."""
+    limiter = CountingLimiter()
+    stub = StubProvider()
+    monkeypatch.setattr(retrieval, "get_yahoo_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(
+        YahooFinanceProvider, "download", lambda self, tickers, **kwargs: stub.download(tickers, **kwargs)
+    )
+
+    data = download_universe([f"T{i}" for i in range(5)], batch_size=2)
+
+    assert YahooFinanceProvider().rate_limiter is limiter
+    assert limiter.reserved == len(stub.calls) == 3
+    assert VIX_TICKER in data.columns.get_level_values("Ticker")
+
+
+def test_download_universe_defaults_to_provider_constituents() -> None:
+    """Test that the provider's constituents are used when no tickers are given."""
+    provider = StubProvider()
+
+    data = download_universe(provider=provider)
+
+    assert set(data.columns.get_level_values("Ticker")) == {"A", "B", VIX_TICKER}
+
+
+def test_download_universe_raises_when_nothing_downloaded() -> None:
+    """Test that an error is raised if every batch fails."""
+    provider = StubProvider(fail_tickers={"A"})
+
+    with pytest.raises(RuntimeError):
+        download_universe(["A"], include_vix=False, max_attempts=1, provider=provider)
+
+
+def test_retry_only_retries_configured_exceptions() -> None:
+    """Test that exceptions outside ``exceptions`` are raised without retrying."""
+    calls = []
+
+    @retry(max_attempts=3, delay=0, exceptions=(ConnectionError,))
+    def fetch():
+        calls.append(1)
+        raise KeyError("bad input")
+
+    with pytest.raises(KeyError):
+        fetch()
+    assert len(calls) == 1
+
+
+def test_retry_supports_coroutines_without_blocking(monkeypatch) -> None:
+    """Test that coroutine functions are retried with asyncio.sleep."""
+    calls = []
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr("time.sleep", lambda _: pytest.fail("time.sleep used in coroutine retry"))
+
+    @retry(max_attempts=3, delay=1.0, backoff=2.0, jitter=0)
+    async def fetch():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("transient")
+        return "ok"
+
+    assert asyncio.run(fetch()) == "ok"
+    assert sleeps == [1.0, 2.0]
+
+
+def test_circuit_breaker_rejects_calls_once_open() -> None:
+    """Test that the shared breaker opens after consecutive failures and recovers after the timeout."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    calls = []
+
+    @retry(max_attempts=5, delay=0, circuit_breaker=breaker)
+    def fetch(fail=True):
+        calls.append(1)
+        if fail:
+            raise ConnectionError("down")
+        return "ok"
+
+    with pytest.raises(ConnectionError):
+        fetch()
+    assert len(calls) == 2
+    assert breaker.is_open
+
+    with pytest.raises(CircuitOpenError):
+        fetch()
+    assert len(calls) == 2
+
+    time.sleep(0.06)
+    assert fetch(fail=False) == "ok"
+    assert not breaker.is_open
+
+
+def test_circuit_breaker_trial_with_non_retryable_error_releases_slot() -> None:
+    """Test that a half-open trial raising a non-retryable error lets the next call through."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+
+    @retry(max_attempts=1, delay=0, exceptions=(ConnectionError,), circuit_breaker=breaker)
+    def fetch(error=None):
+        if error is not None:
+            raise error
+        return "ok"
+
+    with pytest.raises(ConnectionError):
+        fetch(ConnectionError("down"))
+    assert breaker.is_open
+
+    time.sleep(0.06)
+    with pytest.raises(KeyError):
+        fetch(KeyError("bad input"))
+    assert fetch() == "ok"
+    assert not breaker.is_open
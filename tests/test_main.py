@@ -0,0 +1,138 @@
+"""Tests for the command line entry point and the package's import cost."""
+
+import ast
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from trading_strategy_development.utils.custom_logging import get_project_root, shutdown_logging
+
+SRC_DIR = get_project_root() / "src"
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "matplotlib", "seaborn", "statsmodels", "yfinance")
+STARTUP_BUDGET_S = 0.2
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SRC_DIR), "PATH": ""},
+    )
+
+
+def _loaded_heavy_modules(statement: str) -> list[str]:
+    result = _python(f"import sys; {statement}; print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    return ast.literal_eval(result.stdout)
+
+
+def test_package_imports_do_not_load_heavy_dependencies() -> None:
+    """Test that importing the packages defers pandas, numpy and friends until they are used."""
+    assert _loaded_heavy_modules("import trading_strategy_development.data") == []
+    assert _loaded_heavy_modules("import trading_strategy_development.utils") == []
+    assert "pandas" in _loaded_heavy_modules("from trading_strategy_development.data import PricePanel")
+
+
+def test_main_import_is_fast() -> None:
+    """Test that the CLI module imports without heavy dependencies and within the startup budget."""
+    pytest.importorskip("click")
+    assert _loaded_heavy_modules("import trading_strategy_development.main") == []
+
+    code = (
+        "import time; start = time.perf_counter(); import trading_strategy_development.main; "
+        "print(time.perf_counter() - start)"
+    )
+    best = min(float(_python(code).stdout) for _ in range(3))
+    assert best < STARTUP_BUDGET_S
+
+
+def test_main_help() -> None:
+    """Test that --help runs end to end in a fresh interpreter."""
+    pytest.importorskip("click")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "trading_strategy_development.main", "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SRC_DIR), "PATH": ""},
+    )
+    assert time.perf_counter() - start < 5
+    for command in ("download", "run", "synthetic"):
+        assert command in result.stdout
+
+
+def test_synthetic_and_run_commands(tmp_path, monkeypatch) -> None:
+    """Test generating a synthetic market and running the feature pipeline on it."""
+    pytest.importorskip("click")
+    from click.testing import CliRunner
+
+    from trading_strategy_development.main import cli
+    from trading_strategy_development.utils import custom_logging
+
+    # Log files resolve against the project root; keep them out of the repository
+    monkeypatch.setattr(custom_logging, "get_project_root", lambda: tmp_path)
+    runner = CliRunner()
+    panel_dir = tmp_path / "panel"
+    output_dir = tmp_path / "results"
+    try:
+        result = runner.invoke(cli, ["synthetic", str(panel_dir), "--tickers", "5", "--days", "120", "--seed", "7"])
+        assert result.exit_code == 0, result.output
+
+        args = [
+            "--log-dir",
+            "cli-logs",
+            "run",
+            "--data",
+            str(panel_dir),
+            "--vix",
+            "15",
+            "--output-dir",
+            str(output_dir),
+        ]
+        args += ["--cache-dir", str(tmp_path / "cache")]
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0, result.output
+        assert "Reused" not in result.output
+
+        rerun = runner.invoke(cli, [*args, "--strategy", "hold_all"])
+        assert rerun.exit_code == 0, rerun.output
+    finally:
+        shutdown_logging()
+
+    assert (tmp_path / "cli-logs" / "trading_log.log").exists()
+    assert (output_dir / "features.parquet").exists()
+    assert json.loads((output_dir / "backtest.json").read_text())["strategy"] == "hold_all"
+    assert "high-volatility days" in result.output
+    assert "Reused cached stages: features, dates" in rerun.output
+
+
+def test_run_applies_date_range_to_local_data(tmp_path, monkeypatch) -> None:
+    """Test that --start-date and --end-date restrict data loaded with --data, with an exclusive end."""
+    pytest.importorskip("click")
+    import pandas as pd
+    from click.testing import CliRunner
+
+    from trading_strategy_development.main import cli
+    from trading_strategy_development.utils import custom_logging
+
+    monkeypatch.setattr(custom_logging, "get_project_root", lambda: tmp_path)
+    runner = CliRunner()
+    panel_dir = tmp_path / "panel"
+    output_dir = tmp_path / "results"
+    try:
+        result = runner.invoke(cli, ["synthetic", str(panel_dir), "--tickers", "3", "--days", "120", "--seed", "7"])
+        assert result.exit_code == 0, result.output
+        args = ["run", "--data", str(panel_dir), "--vix", "0", "--output-dir", str(output_dir), "--no-cache"]
+        result = runner.invoke(cli, [*args, "--start-date", "2015-03-02", "--end-date", "2015-04-01"])
+        assert result.exit_code == 0, result.output
+    finally:
+        shutdown_logging()
+
+    dates = pd.read_parquet(output_dir / "features.parquet").index.unique("Date")
+    assert dates.min() == pd.Timestamp("2015-03-02")
+    assert dates.max() == pd.Timestamp("2015-03-31")
@@ -0,0 +1,132 @@
+"""Tests for the content-addressed stage pipeline."""
+
+import pytest
+
+from trading_strategy_development.pipeline import Pipeline
+
+
+def _prices(start):
+    return [start, start + 1, start + 2]
+
+
+def _scaled(prices, factor):
+    return [price * factor for price in prices]
+
+
+def _total(scaled):
+    return sum(scaled)
+
+
+def _pipeline(cache_dir, start=1, factor=2, version=None):
+    pipeline = Pipeline(cache_dir)
+    pipeline.add("prices", _prices, version=version, start=start)
+    pipeline.add("scaled", _scaled, inputs=("prices",), factor=factor)
+    pipeline.add("total", _total, inputs=("scaled",))
+    return pipeline
+
+
+def test_pipeline_runs_stages_in_order(tmp_path) -> None:
+    """Test that a stage runs after the stages it reads from."""
+    pipeline = _pipeline(tmp_path)
+    assert pipeline.run("total") == 12
+    assert pipeline.computed == ["prices", "scaled", "total"]
+    assert pipeline.reused == []
+
+
+def test_pipeline_reuses_cached_outputs(tmp_path) -> None:
+    """Test that a second pipeline loads the final output without running its upstream stages."""
+    _pipeline(tmp_path).run("total")
+    pipeline = _pipeline(tmp_path)
+    assert pipeline.run("total") == 12
+    assert pipeline.computed == []
+    assert pipeline.reused == ["total"]
+
+
+def test_pipeline_recomputes_only_downstream_of_a_change(tmp_path) -> None:
+    """Test that changing a parameter reuses the stages upstream of it."""
+    _pipeline(tmp_path).run("total")
+    pipeline = _pipeline(tmp_path, factor=3)
+    assert pipeline.run("total") == 18
+    assert pipeline.reused == ["prices"]
+    assert pipeline.computed == ["scaled", "total"]
+
+
+def test_pipeline_keys_depend_on_params_version_and_upstream(tmp_path) -> None:
+    """Test that keys change with parameters, versions and upstream keys, and only with them."""
+    base = _pipeline(tmp_path)
+    assert base.key("total") == _pipeline(tmp_path).key("total")
+    assert base.key("total") != _pipeline(tmp_path, start=5).key("total")
+    changed = _pipeline(tmp_path, version="v2")
+    assert base.key("prices") != changed.key("prices")
+    assert base.key("total") != changed.key("total")
+
+
+def test_pipeline_recomputes_unreadable_cache(tmp_path) -> None:
+    """Test that a corrupt cache file is recomputed and replaced."""
+    pipeline = _pipeline(tmp_path)
+    pipeline.run("total")
+    (tmp_path / "total" / f"{pipeline.key('total')}.pkl").write_bytes(b"not a pickle")
+
+    pipeline = _pipeline(tmp_path)
+    assert pipeline.run("total") == 12
+    assert "total" in pipeline.computed
+    assert _pipeline(tmp_path).run("total") == 12
+
+
+def test_pipeline_without_cache(tmp_path) -> None:
+    """Test that no files are written without a cache directory or for uncached stages."""
+    pipeline = Pipeline(None)
+    pipeline.add("prices", _prices, start=1)
+    assert pipeline.run("prices") == [1, 2, 3]
+
+    pipeline = Pipeline(tmp_path)
+    pipeline.add("prices", _prices, cache=False, start=1)
+    pipeline.add("scaled", _scaled, inputs=("prices",), factor=2)
+    pipeline.run("scaled")
+    assert not (tmp_path / "prices").exists()
+    assert (tmp_path / "scaled").exists()
+
+
+def test_pipeline_add_validation(tmp_path) -> None:
+    """Test that duplicate names, unknown inputs and shadowed inputs are rejected."""
+    pipeline = _pipeline(tmp_path)
+    with pytest.raises(ValueError, match="already defined"):
+        pipeline.add("prices", _prices, start=1)
+    with pytest.raises(ValueError, match="undefined stages"):
+        pipeline.add("other", _total, inputs=("missing",))
+    with pytest.raises(ValueError, match="names of its inputs"):
+        pipeline.add("other", _scaled, inputs=("prices",), prices=1, factor=2)
+
+
+def test_pipeline_invalidated_by_editing_a_dependency(tmp_path, monkeypatch) -> None:
+    """Test that editing a module a stage depends on causes a cache miss for it and its downstream stages."""
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    module = tmp_path / "src" / "pipeline_dependency.py"
+    module.parent.mkdir()
+    module.write_text("FACTOR = 2\n")
+
+    def build(cache_dir):
+        pipeline = Pipeline(cache_dir)
+        pipeline.add("prices", _prices, start=1)
+        pipeline.add("scaled", _scaled, inputs=("prices",), depends_on=("pipeline_dependency",), factor=2)
+        pipeline.add("total", _total, inputs=("scaled",))
+        return pipeline
+
+    build(tmp_path / "cache").run("total")
+    unchanged = build(tmp_path / "cache")
+    unchanged.run("total")
+    assert unchanged.reused == ["total"]
+
+    module.write_text("FACTOR = 3\n")
+    edited = build(tmp_path / "cache")
+    edited.run("total")
+    assert edited.reused == ["prices"]
+    assert edited.computed == ["scaled", "total"]
+
+
+def test_pipeline_unknown_dependency(tmp_path) -> None:
+    """Test that a dependency on a missing module is reported when the key is computed."""
+    pipeline = Pipeline(tmp_path)
+    pipeline.add("prices", _prices, depends_on=("no_such_module_for_pipeline_tests",), start=1)
+    with pytest.raises(ModuleNotFoundError):
+        pipeline.key("prices")
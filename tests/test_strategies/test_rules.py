@@ -0,0 +1,43 @@
+"""Tests for the rule-based strategies."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_strategy_development.strategies.rules import RULES, hold_all, reversion, rule_returns, trend
+
+
+@pytest.fixture
+def features() -> pd.DataFrame:
+    """Two tickers on two dates."""
+    index = pd.MultiIndex.from_product(
+        [pd.to_datetime(["2024-01-02", "2024-01-03"]), ["AAA", "BBB"]], names=["Date", "Ticker"]
+    )
+    return pd.DataFrame(
+        {
+            "close_to_sma_50": [0.1, -0.1, -0.2, -0.3],
+            "rsi_14": [25.0, 50.0, 60.0, 20.0],
+            "next_day_return": [0.02, -0.04, 0.01, np.nan],
+        },
+        index=index,
+    )
+
+
+def test_rule_returns_average_the_selection(features) -> None:
+    """Test that a rule earns the mean next-day return of the tickers it holds."""
+    np.testing.assert_allclose(rule_returns(features, hold_all).to_numpy(), [-0.01, 0.01])
+    np.testing.assert_allclose(rule_returns(features, reversion).to_numpy(), [0.02, 0.0])
+
+
+def test_rule_returns_zero_without_selection(features) -> None:
+    """Test that dates where nothing is held return zero."""
+    returns = rule_returns(features, trend)
+    assert list(returns.index) == list(features.index.unique(level="Date"))
+    np.testing.assert_allclose(returns.to_numpy(), [0.02, 0.0])
+
+
+def test_cli_strategies_match_rules() -> None:
+    """Test that the command line offers exactly the defined rules."""
+    from trading_strategy_development.main import STRATEGIES
+
+    assert set(STRATEGIES) == set(RULES)
@@ -2,13 +2,34 @@
 Tests for the custom logging utility module.
 """
 
+import json
 import logging
 import os
+import queue
+import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 import pytest
-from trading_strategy_development.utils.custom_logging import setup_logging, get_logger, get_project_root
+from trading_strategy_development.utils.custom_logging import (
+    BoundedQueueHandler,
+    DuplicateFilter,
+    JsonFormatter,
+    get_logger,
+    get_project_root,
+    logging_pool_kwargs,
+    setup_logging,
+    shutdown_logging,
+    span,
+)
+
+
+@pytest.fixture
+def project_root(tmp_path, monkeypatch) -> Path:
+    """Resolve log directories under a temporary project root instead of the repository."""
+    monkeypatch.setattr("trading_strategy_development.utils.custom_logging.get_project_root", lambda: tmp_path)
+    return tmp_path
 
 
 def test_get_project_root() -> None:
@@ -18,7 +39,7 @@ def test_get_project_root() -> None:
     assert (root / "src").exists(), "Project root should contain a 'src' directory"
 
 
-def test_setup_logging() -> None:
+def test_setup_logging(project_root) -> None:
     """Test that the logging setup works properly."""
     # Use a temporary directory for log files
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -45,6 +66,19 @@ def test_setup_logging() -> None:
         assert test_message in log_content
 
 
+def test_setup_logging_resolves_log_dir_under_project_root(project_root) -> None:
+    """Test that a relative log directory is created under the project root."""
+    log_config = setup_logging(
+        log_dir="logs",
+        log_level=logging.DEBUG,
+        console_output=False,
+    )
+
+    log_file = Path(log_config["log_file"])
+    assert log_file.exists()
+    assert log_file.parent == project_root / "logs"
+
+
 def test_setup_logging_with_permission_error() -> None:
     """Test that logging setup handles permission errors gracefully."""
     # Mock mkdir to raise a permission error
@@ -70,4 +104,222 @@ def test_get_logger() -> None:
     logger = get_logger(logger_name)
     
     assert isinstance(logger, logging.Logger)
-    assert logger.name == logger_name
\ No newline at end of file
+    assert logger.name == logger_name
+
+
+def test_setup_logging_with_queue(project_root) -> None:
+    """Test that queued records reach the log file once the listener is flushed."""
+    log_config = setup_logging(
+        log_dir="logs",
+        log_level=logging.DEBUG,
+        console_output=False,
+        queue_logging=True,
+    )
+    assert log_config["queue_logging"]
+    assert Path(log_config["log_file"]) == project_root / "logs" / "trading_log.log"
+
+    root_handlers = logging.getLogger().handlers
+    assert len(root_handlers) == 1
+    assert isinstance(root_handlers[0], BoundedQueueHandler)
+
+    logger = get_logger("test_queue_logger")
+    logger.info("Queued message %d", 42)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Queued failure")
+    shutdown_logging()
+
+    with open(log_config["log_file"], "r") as f:
+        log_content = f.read()
+
+    assert "Queued message 42" in log_content
+    assert "ValueError: boom" in log_content
+
+
+def test_bounded_queue_handler_drops_and_reports_overflow() -> None:
+    """Test that a full queue drops records and reports the count once space frees up."""
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, overflow="drop")
+    logger = logging.getLogger("test_overflow_logger")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("message %d", i)
+        assert handler.dropped == 3
+        assert log_queue.qsize() == 2
+
+        log_queue.get_nowait()
+        log_queue.get_nowait()
+        logger.warning("after drain")
+
+        messages = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+        assert messages == ["after drain", "Dropped 3 log records because the queue was full"]
+    finally:
+        logger.removeHandler(handler)
+
+
+def _log_from_worker(task: int) -> int:
+    get_logger("test_worker_logger").info("Worker task %d in process %d", task, os.getpid())
+    return os.getpid()
+
+
+def test_setup_logging_multiprocess(project_root) -> None:
+    """Test that records logged in pool workers are written by the parent's listener."""
+    log_config = setup_logging(log_dir="logs", console_output=False, multiprocess=True)
+    assert log_config["multiprocess"]
+    assert log_config["queue_logging"]
+    assert Path(log_config["log_file"]) == project_root / "logs" / "trading_log.log"
+
+    with ProcessPoolExecutor(max_workers=2, **logging_pool_kwargs()) as pool:
+        worker_pids = set(pool.map(_log_from_worker, range(6)))
+    shutdown_logging()
+
+    assert os.getpid() not in worker_pids
+    with open(log_config["log_file"], "r") as f:
+        log_content = f.read()
+
+    for task in range(6):
+        assert f"Worker task {task} in process" in log_content
+
+
+def test_logging_pool_kwargs_requires_multiprocess_mode(project_root) -> None:
+    """Test that pool kwargs are only available once multiprocess logging is set up."""
+    log_config = setup_logging(log_dir="logs", console_output=False, queue_logging=True)
+    try:
+        with pytest.raises(RuntimeError, match="multiprocess=True"):
+            logging_pool_kwargs()
+    finally:
+        shutdown_logging()
+    assert Path(log_config["log_file"]) == project_root / "logs" / "trading_log.log"
+    assert Path(log_config["log_file"]).exists()
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    """Test that the JSON formatter emits one object per record with extra fields and tracebacks."""
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        record = logging.getLogger("test_json").makeRecord(
+            "test_json", logging.ERROR, __file__, 1, "Failed %s", ("stage",), sys.exc_info(), extra={"rows": 3}
+        )
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["level"] == "ERROR"
+    assert payload["logger"] == "test_json"
+    assert payload["message"] == "Failed stage"
+    assert payload["rows"] == 3
+    assert "ValueError: bad input" in payload["exception"]
+    assert payload["timestamp"].endswith("+00:00")
+
+
+def test_span_writes_json_timeline(project_root) -> None:
+    """Test that nested spans log start and end events with timings to a JSON log file."""
+    log_config = setup_logging(log_dir="logs", log_level=logging.DEBUG, console_output=False, json_logs=True)
+    handlers = list(logging.getLogger().handlers)
+    assert Path(log_config["log_file"]) == project_root / "logs" / "trading_log.log"
+
+    @span("features", run="nightly")
+    def build_rows() -> list[int]:
+        return [1, 2, 3]
+
+    try:
+        with span("pipeline") as outer:
+            build_rows()
+            outer.rows = 10
+        with pytest.raises(RuntimeError), span("backtest"):
+            raise RuntimeError("boom")
+    finally:
+        # Close only the handlers this test installed, leaving logging usable for other tests
+        for handler in handlers:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+
+    with open(log_config["log_file"], "r") as f:
+        events = [json.loads(line) for line in f]
+
+    spans = [event for event in events if event.get("event") == "span_end"]
+    assert [event["stage"] for event in spans] == ["features", "pipeline", "backtest"]
+
+    features, pipeline, backtest = spans
+    assert features["rows"] == 3
+    assert features["run"] == "nightly"
+    assert features["parent_id"] == pipeline["span_id"]
+    assert pipeline["rows"] == 10
+    assert pipeline["parent_id"] is None
+    assert backtest["status"] == "error"
+    assert all(event["duration_s"] >= 0 for event in spans)
+    if sys.platform != "win32":
+        assert all(event["peak_rss_mb"] > 0 for event in spans)
+
+    starts = [event for event in events if event.get("event") == "span_start"]
+    assert len(starts) == 3
+    assert {event["level"] for event in starts + spans} == {"INFO"}
+
+
+def test_span_skips_disabled_level() -> None:
+    """Test that a span below the logger's level logs nothing but still times the block."""
+    handler = _ListHandler()
+    logger = logging.getLogger("test_quiet_span")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        with span("filtering", logger, logging.DEBUG) as quiet:
+            quiet.rows = 1
+        with span("filtering", logger):
+            pass
+    finally:
+        logger.removeHandler(handler)
+
+    assert [record.event for record in handler.records] == ["span_start", "span_end"]
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def test_duplicate_filter_collapses_similar_messages() -> None:
+    """Test that repeated messages are suppressed and summarised once the interval elapses."""
+    handler = _ListHandler()
+    logger = logging.getLogger("test_dedup_logger")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    duplicate_filter = DuplicateFilter(interval=10.0, burst=2)
+    logger.addFilter(duplicate_filter)
+
+    clock = [100.0]
+    try:
+        with patch("trading_strategy_development.utils.custom_logging.time.monotonic", lambda: clock[0]):
+            for ticker in range(50):
+                logger.warning("Attempt %d/%d failed for %s", 1, 3, f"T{ticker}")
+            logger.error("Different message")
+            assert [r.getMessage() for r in handler.records] == [
+                "Attempt 1/3 failed for T0",
+                "Attempt 1/3 failed for T1",
+                "Different message",
+            ]
+            assert duplicate_filter.suppressed == 48
+
+            clock[0] += 11.0
+            logger.warning("Attempt %d/%d failed for %s", 2, 3, "T0")
+            summary, latest = handler.records[-2:]
+            assert summary.suppressed == 48
+            assert summary.levelno == logging.WARNING
+            assert summary.getMessage().startswith("48 similar messages suppressed in last 11s")
+            assert latest.getMessage() == "Attempt 2/3 failed for T0"
+
+            logger.warning("Attempt %d/%d failed for %s", 2, 3, "T1")
+            logger.warning("Attempt %d/%d failed for %s", 2, 3, "T2")
+            duplicate_filter.flush()
+            assert handler.records[-1].suppressed == 1
+    finally:
+        logger.removeFilter(duplicate_filter)
+        logger.removeHandler(handler)
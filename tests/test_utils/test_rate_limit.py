@@ -0,0 +1,105 @@
+"""
+Tests for the token-bucket rate limiter.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from trading_strategy_development.utils.rate_limit import RateLimiter
+
+
+def test_burst_is_free_then_calls_are_spaced() -> None:
+    """Test that the bucket allows a burst of ``capacity`` then waits ``1/rate`` per token."""
+    limiter = RateLimiter(rate=10.0, capacity=3)
+
+    waits = [limiter.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_threads_share_one_limit() -> None:
+    """Test that concurrent threads are throttled to the configured rate."""
+    limiter = RateLimiter(rate=50.0, capacity=1)
+
+    @limiter
+    def call():
+        return time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        stamps = sorted(executor.map(lambda _: call(), range(11)))
+
+    assert stamps[-1] - stamps[0] >= 0.18
+
+
+def test_async_acquire_does_not_block_event_loop() -> None:
+    """Test that coroutines wait with asyncio and are throttled together."""
+    limiter = RateLimiter(rate=50.0, capacity=1)
+
+    @limiter
+    async def call():
+        return time.monotonic()
+
+    async def main():
+        return await asyncio.gather(*(call() for _ in range(6)))
+
+    stamps = sorted(asyncio.run(main()))
+    assert stamps[-1] - stamps[0] >= 0.08
+
+
+def test_async_acquire_takes_file_lock_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    """Test that the flock-guarded shared bucket is reserved in a worker thread, not on the loop."""
+    limiter = RateLimiter(rate=50.0, capacity=1, state_file=tmp_path / "bucket.bin")
+    threads = []
+    reserve_shared = limiter._reserve_shared
+
+    def recording_reserve_shared(state_file, tokens):
+        threads.append(threading.get_ident())
+        return reserve_shared(state_file, tokens)
+
+    monkeypatch.setattr(limiter, "_reserve_shared", recording_reserve_shared)
+
+    async def main():
+        await limiter.acquire_async()
+        await limiter.acquire_async()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+def test_local_bucket_ignores_wall_clock_jumps(monkeypatch) -> None:
+    """Test that the in-process bucket is timed with the monotonic clock."""
+    limiter = RateLimiter(rate=10.0, capacity=1)
+    limiter.reserve()
+    monkeypatch.setattr(time, "time", lambda: 0.0)
+
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def _reserve_many(state_file, count, queue):
+    limiter = RateLimiter(rate=10.0, capacity=1, state_file=state_file)
+    queue.put([limiter.reserve() for _ in range(count)])
+
+
+def test_state_file_shares_limit_across_processes(tmp_path) -> None:
+    """Test that processes pointing at the same state file draw from one bucket."""
+    state_file = tmp_path / "bucket.bin"
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_reserve_many, args=(state_file, 5, queue)) for _ in range(2)]
+    for process in processes:
+        process.start()
+    waits = sorted(queue.get(timeout=10) + queue.get(timeout=10))
+    for process in processes:
+        process.join()
+
+    # Ten reservations against one shared bucket: one free, then 0.1s apart
+    assert waits[0] == 0.0
+    assert waits[-1] == pytest.approx(0.9, abs=0.05)